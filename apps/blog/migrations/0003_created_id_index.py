@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0002_blog_badge_blog_image"),
+        (
+            "common",
+            "0003_setting_latitude_setting_location_description_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="blog",
+            index=models.Index(
+                fields=["-created_time", "-id"], name="blog_created_id_idx"
+            ),
+        ),
+    ]
@@ -39,6 +39,13 @@ class Blog(BaseModel):
     class Meta:
         verbose_name = "Блог"
         verbose_name_plural = "Блоги"
+        indexes = [
+            # Keyset pagination seeks by (created_time, id)
+            models.Index(
+                fields=["-created_time", "-id"],
+                name="blog_created_id_idx",
+            )
+        ]
 
     def __str__(self):
         return self.title
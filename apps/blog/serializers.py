@@ -1,21 +1,29 @@
-from common.serializers import BadgeSerializer
+from common.serializers import (
+    BadgeSerializer,
+    DynamicFieldsMixin,
+    RenditionField,
+    RenditionListSerializer,
+)
+from common.values_serializers import ValuesSerializer
 from rest_framework import serializers
 
 from .models import Blog, BlogCategory
 
 
-class BlogCategorySerializer(serializers.ModelSerializer):
+class BlogCategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = BlogCategory
         fields = ("id", "name")
 
 
-class BlogListSerializer(serializers.ModelSerializer):
+class BlogListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category = BlogCategorySerializer()
+    image_srcset = RenditionField(source="image")
     badge = BadgeSerializer()
 
     class Meta:
         model = Blog
+        list_serializer_class = RenditionListSerializer
         fields = (
             "id",
             "title",
@@ -23,20 +31,28 @@ class BlogListSerializer(serializers.ModelSerializer):
             "category",
             "badge",
             "image",
+            "image_srcset",
             "created_time",
         )
 
 
-class BlogDetailSerializer(serializers.ModelSerializer):
+class BlogListValuesSerializer(ValuesSerializer):
+    serializer_class = BlogListSerializer
+
+
+class BlogDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category = BlogCategorySerializer()
+    image_srcset = RenditionField(source="image")
 
     class Meta:
         model = Blog
+        list_serializer_class = RenditionListSerializer
         fields = (
             "id",
             "title",
             "content",
             "category",
             "image",
+            "image_srcset",
             "created_time",
         )
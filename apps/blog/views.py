@@ -1,3 +1,9 @@
+from common.mixins import (
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+)
+from common.models import Badge
 from common.pagination import BlogPagination
 from common.utils.custom_response_decorator import custom_response
 from django_filters.rest_framework import DjangoFilterBackend
@@ -8,13 +14,18 @@ from .serializers import (
     BlogCategorySerializer,
     BlogDetailSerializer,
     BlogListSerializer,
+    BlogListValuesSerializer,
 )
 
 
 @custom_response
-class BlogListView(ListAPIView):
+class BlogListView(
+    ConditionalGetMixin, SparseFieldsetMixin, ValuesListMixin, ListAPIView
+):
     queryset = Blog.objects.all().select_related("category")
+    conditional_models = (Blog, BlogCategory, Badge)
     serializer_class = BlogListSerializer
+    values_serializer_class = BlogListValuesSerializer
     pagination_class = BlogPagination
 
     filter_backends = [DjangoFilterBackend]
@@ -22,12 +33,17 @@ class BlogListView(ListAPIView):
 
 
 @custom_response
-class BlogDetailView(RetrieveAPIView):
+class BlogDetailView(
+    ConditionalGetMixin, SparseFieldsetMixin, RetrieveAPIView
+):
     queryset = Blog.objects.all().select_related("category")
+    conditional_models = (Blog, BlogCategory)
     serializer_class = BlogDetailSerializer
     lookup_field = "slug"
 
 
-class BlogCategoryListView(ListAPIView):
+class BlogCategoryListView(
+    ConditionalGetMixin, SparseFieldsetMixin, ListAPIView
+):
     queryset = BlogCategory.objects.all()
     serializer_class = BlogCategorySerializer
@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 16:07
+
+import common.utils.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "careers",
+            "0004_shortrequirement_text_en_shortrequirement_text_ru_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="application",
+            name="cv",
+            field=models.FileField(
+                storage=common.utils.storage.PrivateMediaStorage(),
+                upload_to="vacancy/applications/",
+                verbose_name="Резюме (CV)",
+            ),
+        ),
+    ]
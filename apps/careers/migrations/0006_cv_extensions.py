@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 16:16
+
+import common.utils.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("careers", "0005_private_media"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="application",
+            name="cv",
+            field=models.FileField(
+                storage=common.utils.storage.PrivateMediaStorage(),
+                upload_to="vacancy/applications/",
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=("pdf", "doc", "docx", "rtf"),
+                        code="WRONG_FILE",
+                        message="Wrong format uploaded file. Format must be: pdf, doc, docx or rtf",
+                    )
+                ],
+                verbose_name="Резюме (CV)",
+            ),
+        ),
+    ]
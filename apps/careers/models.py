@@ -1,4 +1,6 @@
 from common.models import BaseModel
+from common.utils.storage import PrivateMediaStorage
+from common.validators import cv_extensions
 from django.db import models
 from tinymce.models import HTMLField
 
@@ -48,7 +50,12 @@ class Application(BaseModel):
     full_name = models.CharField("ФИО", max_length=255)
     phone_number = models.CharField("Номер телефона", max_length=20)
     email = models.EmailField("Эл. почта", blank=True, null=True)
-    cv = models.FileField("Резюме (CV)", upload_to="vacancy/applications/")
+    cv = models.FileField(
+        "Резюме (CV)",
+        upload_to="vacancy/applications/",
+        storage=PrivateMediaStorage(),
+        validators=[cv_extensions],
+    )
     cover_letter = models.TextField(
         "Сопроводительное письмо", blank=True, null=True
     )
@@ -1,15 +1,19 @@
+from common.serializers import DynamicFieldsMixin
+from common.values_serializers import ValuesSerializer
 from rest_framework import serializers
 
 from .models import Application, ShortRequirement, Vacancy
 
 
-class ShortRequirementSerializer(serializers.ModelSerializer):
+class ShortRequirementSerializer(
+    DynamicFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = ShortRequirement
         fields = ("id", "text", "order")
 
 
-class VacancyListSerializer(serializers.ModelSerializer):
+class VacancyListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     short_requirements = ShortRequirementSerializer(
         source="short_requirements_list", many=True, read_only=True
     )
@@ -28,7 +32,11 @@ class VacancyListSerializer(serializers.ModelSerializer):
         )
 
 
-class VacancyDetailSerializer(serializers.ModelSerializer):
+class VacancyListValuesSerializer(ValuesSerializer):
+    serializer_class = VacancyListSerializer
+
+
+class VacancyDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Vacancy
         fields = (
@@ -1,30 +1,48 @@
+from common.mixins import (
+    ConditionalGetMixin,
+    IdempotencyMixin,
+    SparseFieldsetMixin,
+    UploadLimitsMixin,
+    ValuesListMixin,
+)
 from common.pagination import VacancyPagination
 from common.utils.custom_response_decorator import custom_response
+from common.utils.uploads import CV_UPLOAD
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView
 
-from .models import Application, Vacancy
+from .models import Application, ShortRequirement, Vacancy
 from .serializers import (
     ApplicationCreateSerializer,
     VacancyDetailSerializer,
     VacancyListSerializer,
+    VacancyListValuesSerializer,
 )
 
 
 @custom_response
-class VacancyListView(ListAPIView):
+class VacancyListView(
+    ConditionalGetMixin, SparseFieldsetMixin, ValuesListMixin, ListAPIView
+):
     queryset = Vacancy.objects.all()
+    conditional_models = (Vacancy, ShortRequirement)
     serializer_class = VacancyListSerializer
+    values_serializer_class = VacancyListValuesSerializer
     pagination_class = VacancyPagination
 
 
 @custom_response
-class VacancyDetailView(RetrieveAPIView):
+class VacancyDetailView(
+    ConditionalGetMixin, SparseFieldsetMixin, RetrieveAPIView
+):
     queryset = Vacancy.objects.all()
     serializer_class = VacancyDetailSerializer
     lookup_field = "slug"
 
 
 @custom_response
-class ApplicationCreateView(CreateAPIView):
+class ApplicationCreateView(
+    UploadLimitsMixin, IdempotencyMixin, CreateAPIView
+):
     queryset = Application.objects.all()
     serializer_class = ApplicationCreateSerializer
+    upload_rules = {"cv": CV_UPLOAD}
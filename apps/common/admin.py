@@ -1,7 +1,15 @@
 from django.contrib import admin
+from django.utils import timezone
 from modeltranslation.admin import TabbedTranslationAdmin
 
-from .models import Badge, Page, Setting, SocialMedia
+from .models import (
+    Badge,
+    BitrixContact,
+    OutboxMessage,
+    Page,
+    Setting,
+    SocialMedia,
+)
 
 
 class SocialMediaInline(admin.TabularInline):
@@ -32,3 +40,43 @@ class BadgeAdmin(admin.ModelAdmin):
 
     class Media:
         css = {"all": ("admin/css/colorfield.css",)}
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        "topic",
+        "reference",
+        "status",
+        "attempts",
+        "available_at",
+        "created_time",
+    )
+    list_filter = ("status", "topic")
+    search_fields = ("reference",)
+    # Payloads may hold personal data
+    exclude = ("payload",)
+    readonly_fields = (
+        "topic",
+        "reference",
+        "result",
+        "attempts",
+        "last_error",
+    )
+    actions = ["retry"]
+
+    @admin.action(description="Повторить отправку")
+    def retry(self, request, queryset):
+        queryset.update(
+            status=OutboxMessage.PENDING,
+            attempts=0,
+            available_at=timezone.now(),
+        )
+
+
+@admin.register(BitrixContact)
+class BitrixContactAdmin(admin.ModelAdmin):
+    list_display = ("contact_id", "kind", "verified_time", "created_time")
+    list_filter = ("kind",)
+    search_fields = ("contact_id",)
+    readonly_fields = ("kind", "lookup_hash", "verified_time")
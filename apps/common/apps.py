@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "common"
+
+    def ready(self):
+        from common import checks, outbox, signals  # noqa: F401
+        from common.utils.scan_codec import register_heif
+
+        # Uploaded HEIC/HEIF images validate like any other image
+        register_heif()
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core import checks
+
+PROTECTED_MEDIA_SERVERS = ("x-accel-redirect", "x-sendfile")
+
+
+@checks.register(checks.Tags.security)
+def check_protected_media_server(app_configs, **kwargs):
+    """Private files must be sent by the front proxy, not by the workers"""
+    server = settings.PROTECTED_MEDIA_SERVER
+    if server in PROTECTED_MEDIA_SERVERS:
+        return []
+    if server:
+        return [
+            checks.Error(
+                f"Unknown PROTECTED_MEDIA_SERVER {server!r}.",
+                hint="Use one of: " + ", ".join(PROTECTED_MEDIA_SERVERS),
+                id="common.E001",
+            )
+        ]
+    if settings.DEBUG:
+        return []
+    return [
+        checks.Warning(
+            "PROTECTED_MEDIA_SERVER is not set: passport scans and CVs are "
+            "streamed by the application workers.",
+            hint=(
+                "Set PROTECTED_MEDIA_SERVER=x-accel-redirect behind nginx, "
+                "or x-sendfile behind Apache."
+            ),
+            id="common.W001",
+        )
+    ]
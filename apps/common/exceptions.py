@@ -1,7 +1,36 @@
 from django.utils.translation import gettext_lazy as _
-from rest_framework.exceptions import NotFound
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
 
 
 class ObjectNotFound(NotFound):
     default_detail = _("Not found.")
     default_code = "NOT_FOUND"
+
+
+class ServiceUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Service temporarily unavailable, try again later.")
+    default_code = "SERVICE_UNAVAILABLE"
+
+
+class IdempotencyConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _(
+        "A request with this Idempotency-Key is still being processed."
+    )
+    default_code = "IDEMPOTENCY_CONFLICT"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = _(
+        "This Idempotency-Key was already used with a different request."
+    )
+    default_code = "IDEMPOTENCY_KEY_REUSED"
+
+
+class PayloadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = _("Request body is too large.")
+    default_code = "PAYLOAD_TOO_LARGE"
@@ -0,0 +1,90 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common.utils.otp import OTPService
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure OTP issue and verify throughput against the configured "
+        "Redis, next to the former get-then-delete verification"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=2000,
+            help="Number of phone numbers issued and verified",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=1,
+            help="Number of concurrent clients",
+        )
+
+    def measure(self, label, func, phones, threads):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(func, phones))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{label}: {len(phones) / elapsed:.0f} ops/s, "
+            f"{elapsed / len(phones) * 1e6:.0f} us/op"
+        )
+        return results
+
+    def legacy_verify(self, phone_number):
+        key = f"{OTPService.CACHE_PREFIX}{phone_number}"
+        stored = cache.get(key)
+        if stored != "000000":
+            return False
+        cache.delete(key)
+        return True
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        phones = [
+            f"benchmark{index:07d}" for index in range(options["iterations"])
+        ]
+
+        issued = self.measure("issue", OTPService.issue_otp, phones, threads)
+        codes = dict(zip(phones, (otp.code for otp in issued)))
+        wrong = self.measure(
+            "verify (wrong code)",
+            lambda phone: OTPService.verify_otp(phone, "x"),
+            phones,
+            threads,
+        )
+        right = self.measure(
+            "verify (right code)",
+            lambda phone: OTPService.verify_otp(phone, codes[phone]),
+            phones,
+            threads,
+        )
+
+        cache.set_many(
+            {f"{OTPService.CACHE_PREFIX}{phone}": "000000" for phone in phones}
+        )
+        self.measure(
+            "legacy get+delete verify", self.legacy_verify, phones, threads
+        )
+
+        client = get_redis_connection("default")
+        for phone in phones:
+            client.delete(*OTPService.get_keys(phone))
+
+        if (
+            all(otp.code for otp in issued)
+            and not any(result.valid for result in wrong)
+            and all(result.valid for result in right)
+        ):
+            self.stdout.write(self.style.SUCCESS("All verifications correct"))
+        else:
+            self.stdout.write(
+                self.style.ERROR("Unexpected verification results")
+            )
@@ -0,0 +1,187 @@
+import threading
+import time
+import tracemalloc
+
+from common.exceptions import PayloadTooLarge
+from common.utils.uploads import CV_UPLOAD, CappedUploadHandler, UploadRule
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.exceptions import ValidationError
+
+BOUNDARY = "benchmarkboundary"
+
+
+class MultipartStream:
+    """WSGI input of a single file upload, generated as it is read"""
+
+    def __init__(self, head: bytes, size: int):
+        self.prefix = (
+            f"--{BOUNDARY}\r\n"
+            'Content-Disposition: form-data; name="cv"; filename="cv.pdf"\r\n'
+            "Content-Type: application/pdf\r\n\r\n"
+        ).encode()
+        self.suffix = f"\r\n--{BOUNDARY}--\r\n".encode()
+        self.head = head
+        self.size = size
+        self.length = len(self.prefix) + size + len(self.suffix)
+        self.position = 0
+
+    def byte_range(self, start, end):
+        """Bytes of the body between two offsets"""
+        parts = []
+        body_start = len(self.prefix)
+        body_end = body_start + self.size
+        if start < body_start:
+            parts.append(self.prefix[start : min(end, body_start)])
+        if end > body_start and start < body_end:
+            offset, stop = (
+                max(start, body_start) - body_start,
+                min(end, body_end) - body_start,
+            )
+            head = self.head[offset:stop]
+            parts.append(head + b"x" * (stop - offset - len(head)))
+        if end > body_end:
+            parts.append(
+                self.suffix[max(start - body_end, 0) : end - body_end]
+            )
+        return b"".join(parts)
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.length - self.position
+        end = min(self.position + size, self.length)
+        data = self.byte_range(self.position, end)
+        self.position = end
+        return data
+
+    def readline(self, size=-1):
+        if size is None or size < 0:
+            size = self.length - self.position
+        end = min(self.position + size, self.length)
+        data = self.byte_range(self.position, end)
+        newline = data.find(b"\n")
+        if newline != -1:
+            data = data[: newline + 1]
+        self.position += len(data)
+        return data
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse many concurrent CV uploads with Django's default upload "
+        "handlers and with CappedUploadHandler, and report peak Python "
+        "memory, time and the bytes read before oversize or wrong-type "
+        "uploads are refused"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--uploads",
+            type=int,
+            default=20,
+            help="Number of concurrent uploads per scenario",
+        )
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=20,
+            help="Size of every uploaded file, in MB",
+        )
+
+    def build_request(self, head, size, handlers):
+        stream = MultipartStream(head, size)
+        request = WSGIRequest(
+            {
+                "REQUEST_METHOD": "POST",
+                "PATH_INFO": "/",
+                "SERVER_NAME": "benchmark",
+                "SERVER_PORT": "80",
+                "wsgi.url_scheme": "http",
+                "wsgi.input": stream,
+                "CONTENT_TYPE": f"multipart/form-data; boundary={BOUNDARY}",
+                "CONTENT_LENGTH": str(stream.length),
+            }
+        )
+        if handlers is not None:
+            request.upload_handlers = handlers(request)
+        return request, stream
+
+    def upload(self, head, size, handlers):
+        request, stream = self.build_request(head, size, handlers)
+        try:
+            files = request.FILES
+        except PayloadTooLarge:
+            return "413", stream.position
+        except ValidationError:
+            return "400", stream.position
+        for file in files.values():
+            file.close()
+        return "ok", stream.position
+
+    def run_scenario(self, label, head, size, handlers):
+        results = [None] * self.uploads
+        start = threading.Barrier(self.uploads)
+
+        def run(index):
+            start.wait()
+            results[index] = self.upload(head, size, handlers)
+
+        threads = [
+            threading.Thread(target=run, args=(index,))
+            for index in range(self.uploads)
+        ]
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+
+        outcomes = {}
+        for outcome, _ in results:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        read = sum(position for _, position in results) / len(results)
+        self.stdout.write(
+            f"{label:<44} peak {peak / 2**20:7.1f} MB  "
+            f"{elapsed:6.2f}s  read {read / 2**20:6.1f} MB/upload  "
+            + ", ".join(f"{key}: {count}" for key, count in outcomes.items())
+        )
+
+    def handle(self, *args, **options):
+        self.uploads = options["uploads"]
+        size = options["size"] * 2**20
+        pdf, exe = b"%PDF-1.7\n", b"MZ\x90\x00"
+        # A cap fitting the file, so that it is accepted
+        roomy = {"cv": UploadRule(CV_UPLOAD.kinds, "UPLOAD_BENCHMARK_SIZE")}
+
+        def capped(rules):
+            return lambda request: [CappedUploadHandler(request, rules)]
+
+        self.stdout.write(
+            f"{self.uploads} concurrent uploads of {options['size']} MB, "
+            f"CV cap {CV_UPLOAD.max_size / 2**20:.0f} MB"
+        )
+        tracemalloc.start()
+        try:
+            with override_settings(UPLOAD_BENCHMARK_SIZE=size + 2**20):
+                self.run_scenario("PDF, default handlers", pdf, size, None)
+                self.run_scenario(
+                    "PDF, capped handler", pdf, size, capped(roomy)
+                )
+                self.run_scenario(
+                    "PDF over the CV cap, capped handler",
+                    pdf,
+                    size,
+                    capped({"cv": CV_UPLOAD}),
+                )
+                self.run_scenario(
+                    "EXE as CV, default handlers", exe, size, None
+                )
+                self.run_scenario(
+                    "EXE as CV, capped handler", exe, size, capped(roomy)
+                )
+        finally:
+            tracemalloc.stop()
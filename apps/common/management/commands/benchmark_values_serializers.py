@@ -0,0 +1,154 @@
+import time
+
+from blog.models import Blog
+from blog.serializers import BlogListSerializer, BlogListValuesSerializer
+from careers.models import Vacancy
+from careers.serializers import (
+    VacancyListSerializer,
+    VacancyListValuesSerializer,
+)
+from courses.models import Course, Testimonial
+from courses.serializers import (
+    CourseListSerializer,
+    CourseListValuesSerializer,
+    TestimonialSerializer,
+    TestimonialValuesSerializer,
+)
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.utils import translation
+from news.models import News
+from news.serializers import NewsListSerializer, NewsListValuesSerializer
+from rest_framework.renderers import JSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare list serializers with their values() counterparts: "
+        "check the rendered output is identical and report the cost per row"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Number of rows per list",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Number of timed runs per serializer",
+        )
+        parser.add_argument(
+            "--host",
+            default="localhost",
+            help="Host used to build absolute media URLs",
+        )
+
+    def get_targets(self):
+        return [
+            (
+                "courses",
+                Course.objects.select_related("category"),
+                CourseListSerializer,
+                CourseListValuesSerializer,
+            ),
+            (
+                "news",
+                News.objects.select_related("category", "badge"),
+                NewsListSerializer,
+                NewsListValuesSerializer,
+            ),
+            (
+                "blog",
+                Blog.objects.select_related("category", "badge"),
+                BlogListSerializer,
+                BlogListValuesSerializer,
+            ),
+            (
+                "vacancies",
+                Vacancy.objects.prefetch_related("short_requirements_list"),
+                VacancyListSerializer,
+                VacancyListValuesSerializer,
+            ),
+            (
+                "testimonials",
+                Testimonial.objects.select_related("company"),
+                TestimonialSerializer,
+                TestimonialValuesSerializer,
+            ),
+        ]
+
+    def render_model(self, queryset, serializer_class, context):
+        return serializer_class(
+            queryset.all(), many=True, context=context
+        ).data
+
+    def render_values(self, queryset, values_class, context):
+        serializer = values_class(context=context)
+        return serializer.serialize(serializer.get_queryset(queryset.all()))
+
+    def measure(self, render, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = render()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, len(data)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        request = RequestFactory().get("/", HTTP_HOST=options["host"])
+        context = {"request": request}
+
+        targets = self.get_targets()
+        for label, queryset, serializer_class, values_class in targets:
+            queryset = queryset.order_by("-created_time", "-id")[
+                : options["limit"]
+            ]
+
+            mismatched = []
+            for language in settings.MODELTRANSLATION_LANGUAGES:
+                with translation.override(language):
+                    expected = renderer.render(
+                        self.render_model(queryset, serializer_class, context)
+                    )
+                    actual = renderer.render(
+                        self.render_values(queryset, values_class, context)
+                    )
+                if expected != actual:
+                    mismatched.append(language)
+
+            model_time, rows = self.measure(
+                lambda: self.render_model(queryset, serializer_class, context),
+                options["repeat"],
+            )
+            values_time, _ = self.measure(
+                lambda: self.render_values(queryset, values_class, context),
+                options["repeat"],
+            )
+            if not rows:
+                self.stdout.write(f"{label}: no rows, skipped")
+                continue
+
+            model_cost = model_time / rows * 1e6
+            values_cost = values_time / rows * 1e6
+            self.stdout.write(
+                f"{label}: {rows} rows, "
+                f"serializer {model_cost:.1f} us/row, "
+                f"values {values_cost:.1f} us/row, "
+                f"x{model_cost / values_cost:.1f}"
+            )
+            if mismatched:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"{label}: output differs for "
+                        f"{', '.join(mismatched)}"
+                    )
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{label}: identical"))
@@ -0,0 +1,105 @@
+import posixpath
+
+from common.utils.renditions import ImageRenditions
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the resized variants of uploaded images that have none, "
+        "and delete the variants of images no longer used"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild variants that already exist",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete the variants of images no longer used",
+        )
+
+    def get_images(self):
+        """Yield the model label, field name and storage of used images"""
+        for key in ImageRenditions.WIDTHS:
+            label, field_name = key.rsplit(".", 1)
+            model = apps.get_model(label)
+            storage = model._meta.get_field(field_name).storage
+            names = (
+                model.objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .values_list(field_name, flat=True)
+                .distinct()
+            )
+            for name in names:
+                yield label, field_name, name, storage
+
+    def find_manifests(self, storage, directory):
+        """Yield the directories holding a manifest, recursively"""
+        if not storage.exists(directory):
+            return
+        directories, files = storage.listdir(directory)
+        if ImageRenditions.MANIFEST in files:
+            yield directory
+        for child in directories:
+            yield from self.find_manifests(
+                storage, posixpath.join(directory, child)
+            )
+
+    def prune(self, used):
+        """
+        Delete the variants of unused images, and those stored before
+        variants were kept per field
+        """
+        # Fields may share a storage location, so a directory is kept if
+        # any field uses it
+        directories = set()
+        storages = {}
+        for label, field_name, name, storage in used:
+            directories.add(
+                ImageRenditions.get_directory(f"{label}.{field_name}", name)
+            )
+            storages[id(storage)] = storage
+
+        removed = 0
+        for storage in storages.values():
+            for directory in self.find_manifests(
+                storage, ImageRenditions.ROOT
+            ):
+                if directory not in directories:
+                    removed += ImageRenditions.remove(directory, storage)
+        return removed
+
+    def handle(self, *args, **options):
+        used = list(self.get_images())
+
+        built = failed = 0
+        for label, field_name, name, storage in used:
+            if not options["force"] and ImageRenditions.read_manifest(
+                f"{label}.{field_name}", name, storage
+            ):
+                continue
+            try:
+                ImageRenditions.process(label, field_name, name)
+            except Exception as e:
+                self.stderr.write(f"{name}: {e}")
+                failed += 1
+            else:
+                built += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built variants of {built} of {len(used)} images, "
+                f"{failed} failed"
+            )
+        )
+
+        if options["prune"]:
+            removed = self.prune(used)
+            self.stdout.write(
+                self.style.SUCCESS(f"Deleted {removed} unused variant files")
+            )
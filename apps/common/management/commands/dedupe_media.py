@@ -0,0 +1,106 @@
+from common.utils.storage import ContentAddressedStorage
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the files of content-addressed fields uploaded before into "
+        "shared blobs, deleting the duplicates, and report the bytes saved"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the bytes that would be saved",
+        )
+
+    def get_fields(self):
+        """Yield the model and name of content-addressed file fields"""
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(
+                    getattr(field, "storage", None), ContentAddressedStorage
+                ):
+                    yield model, field.name
+
+    def get_files(self):
+        """Files not stored as blobs yet, with the rows using them"""
+        files = {}
+        for model, field_name in self.get_fields():
+            storage = model._meta.get_field(field_name).storage
+            rows = (
+                model.objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .exclude(
+                    **{
+                        f"{field_name}__startswith": (
+                            f"{ContentAddressedStorage.ROOT}/"
+                        )
+                    }
+                )
+                .values_list("pk", field_name)
+            )
+            for pk, name in rows:
+                files.setdefault((storage, name), []).append(
+                    (model, field_name, pk)
+                )
+        return files
+
+    def move(self, storage, name, rows) -> str:
+        """Store a file as a blob and point its rows at it"""
+        with storage.open(name) as file:
+            blob_name = storage.save(name, file)
+        with transaction.atomic():
+            for model, field_name, pk in rows:
+                instance = model.objects.get(pk=pk)
+                setattr(instance, field_name, blob_name)
+                # Caches and renditions follow, and django-cleanup deletes
+                # the old file once its last row moved
+                instance.save(update_fields=[field_name, "updated_time"])
+        if storage.exists(name):
+            storage.delete(name)
+        return blob_name
+
+    def handle(self, *args, **options):
+        files = self.get_files()
+        before = after = moved = missing = 0
+        blobs = set()
+        for (storage, name), rows in files.items():
+            if not storage.exists(name):
+                self.stderr.write(f"{name}: missing")
+                missing += 1
+                continue
+
+            size = storage.size(name)
+            before += size
+            with storage.open(name) as file:
+                digest = storage.get_digest(file)
+            if digest not in blobs and not storage.exists(
+                storage.get_blob_name(digest, name)
+            ):
+                after += size
+            blobs.add(digest)
+            if storage.count_references(name) > len(rows):
+                # Also used by another field, so the file stays
+                after += size
+
+            if not options["dry_run"]:
+                self.move(storage, name, rows)
+                moved += len(rows)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(files) - missing} files in {len(blobs)} blobs, "
+                f"{moved} rows moved, {missing} files missing; "
+                f"{before / 2**20:.2f} MB before, {after / 2**20:.2f} MB "
+                f"after, {(before - after) / 2**20:.2f} MB saved"
+            )
+        )
+        if moved:
+            self.stdout.write(
+                "Run build_renditions --prune to drop the variants of the "
+                "old files"
+            )
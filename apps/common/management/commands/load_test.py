@@ -0,0 +1,279 @@
+import random
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from courses.models import Course
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(values, share):
+    """Nearest-rank percentile of sorted values"""
+    index = max(int(round(share * len(values))) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the course registration and OTP flows of a running site at "
+        "a target rate and report latency percentiles per step. Run it "
+        "against a site using run_fake_integrations, never production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="http://127.0.0.1:8000",
+            help="Site under test",
+        )
+        parser.add_argument(
+            "--fake-url",
+            default=None,
+            help=(
+                "Fake integrations server the site sends SMS to; OTP codes "
+                "are read from it to verify them"
+            ),
+        )
+        parser.add_argument(
+            "--flow",
+            choices=["registration", "otp", "all"],
+            default="all",
+        )
+        parser.add_argument(
+            "--rps",
+            type=float,
+            default=10,
+            help="Flows started per second",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=30,
+            help="Seconds during which flows are started",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=50,
+            help="Maximum number of flows in progress",
+        )
+        parser.add_argument(
+            "--course",
+            type=int,
+            default=None,
+            help="ID of the course registered to; the first one by default",
+        )
+        parser.add_argument(
+            "--otp-wait",
+            type=float,
+            default=10,
+            help="Seconds to wait for an OTP SMS to reach the fake server",
+        )
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def get_session(self):
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def call(self, step, method, path, **kwargs):
+        """Make a request and record its latency and outcome"""
+        started = time.perf_counter()
+        try:
+            response = self.get_session().request(
+                method,
+                self.base_url + path,
+                timeout=self.options["timeout"],
+                **kwargs,
+            )
+            outcome = str(response.status_code)
+        except requests.RequestException as e:
+            response = None
+            outcome = type(e).__name__
+        elapsed = time.perf_counter() - started
+
+        with self.lock:
+            self.latencies[step].append(elapsed)
+            self.outcomes[step][outcome] += 1
+        return response
+
+    def get_phone(self, index):
+        return f"998{(self.phone_base + index) % 10**9:09d}"
+
+    def register(self, index):
+        phone = self.get_phone(index)
+        self.call(
+            "register",
+            "POST",
+            "/api/register/",
+            json={
+                "course": self.course_id,
+                "last_name": "Load",
+                "first_name": "Test",
+                "birth_date": "2000-01-01",
+                "passport_series": "AA",
+                "passport_number": f"{index % 10**7:07d}",
+                "pinfl": f"{(self.phone_base + index) % 10**14:014d}",
+                "phone": phone,
+                "email": f"load-test-{index}@example.com",
+            },
+            headers={"Idempotency-Key": str(uuid.uuid4())},
+        )
+
+    def wait_for_code(self, phone, requested_at):
+        """Read the OTP code of a phone number from the fake SMS gateway"""
+        deadline = time.time() + self.options["otp_wait"]
+        while time.time() < deadline:
+            response = self.get_session().get(
+                f"{self.options['fake_url']}/_sms",
+                params={"phone": phone},
+                timeout=self.options["timeout"],
+            )
+            if response.status_code == 200:
+                message = response.json()
+                match = re.search(r"\b(\d{6})\b", message["text"] or "")
+                if message["time"] >= requested_at and match:
+                    return match.group(1)
+            time.sleep(0.1)
+        return None
+
+    def request_otp(self, index):
+        phone = self.get_phone(index)
+        requested_at = time.time()
+        response = self.call(
+            "request-otp", "POST", "/api/request-otp/", json={"phone": phone}
+        )
+        if (
+            response is None
+            or response.status_code != 200
+            or not self.options["fake_url"]
+        ):
+            return
+
+        started = time.perf_counter()
+        code = self.wait_for_code(phone, requested_at)
+        with self.lock:
+            if code is None:
+                self.outcomes["sms-delivery"]["timeout"] += 1
+                return
+            self.latencies["sms-delivery"].append(
+                time.perf_counter() - started
+            )
+            self.outcomes["sms-delivery"]["delivered"] += 1
+
+        self.call(
+            "verify-otp",
+            "POST",
+            "/api/verify-otp/",
+            json={"phone": phone, "otp_code": code},
+        )
+
+    def run_flow(self, index):
+        flow = self.options["flow"]
+        if flow == "all":
+            flow = "registration" if index % 2 else "otp"
+        if flow == "registration":
+            self.register(index)
+        else:
+            self.request_otp(index)
+
+    def report(self, start_phase, elapsed):
+        self.stdout.write(
+            f"{'step':<14}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'p99 ms':>9}{'max ms':>9}  outcomes"
+        )
+        for step in self.outcomes:
+            values = sorted(self.latencies[step])
+            outcomes = ", ".join(
+                f"{outcome}: {count}"
+                for outcome, count in sorted(self.outcomes[step].items())
+            )
+            if values:
+                p50, p95, p99 = (
+                    percentile(values, share) * 1000
+                    for share in (0.5, 0.95, 0.99)
+                )
+                timings = (
+                    f"{p50:>9.0f}{p95:>9.0f}{p99:>9.0f}"
+                    f"{values[-1] * 1000:>9.0f}"
+                )
+            else:
+                timings = " " * 36
+            self.stdout.write(
+                f"{step:<14}{len(values):>7}{timings}  {outcomes}"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{self.started_flows} flows started in {start_phase:.1f}s "
+                f"and finished in {elapsed:.1f}s "
+                f"({self.started_flows / max(start_phase, 1e-9):.1f}/s "
+                "achieved, "
+                f"{self.options['rps']:.1f}/s targeted, "
+                f"{self.late_starts} started late)"
+            )
+        )
+
+    def handle(self, *args, **options):
+        if options["rps"] <= 0:
+            raise CommandError("--rps must be positive")
+
+        self.options = options
+        self.base_url = options["base_url"].rstrip("/")
+        if options["fake_url"]:
+            options["fake_url"] = options["fake_url"].rstrip("/")
+        self.course_id = options["course"]
+        if self.course_id is None and options["flow"] != "otp":
+            course = Course.objects.order_by("pk").first()
+            if course is None:
+                raise CommandError("No course to register to; pass --course")
+            self.course_id = course.pk
+
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.outcomes = defaultdict(lambda: defaultdict(int))
+        # Fresh phone numbers, clear of the OTP resend limit of past runs
+        self.phone_base = random.randrange(10**9)
+        self.started_flows = self.late_starts = 0
+
+        total = int(options["rps"] * options["duration"])
+        interval = 1 / options["rps"]
+        slots = threading.BoundedSemaphore(options["concurrency"])
+
+        def run(index):
+            try:
+                self.run_flow(index)
+            finally:
+                slots.release()
+
+        self.stdout.write(
+            f"Starting {total} flows at {options['rps']}/s "
+            f"against {self.base_url}"
+        )
+        futures = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            # Open loop: flows start on schedule, not when others finish
+            for index in range(total):
+                delay = started + index * interval - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                if not slots.acquire(blocking=False):
+                    self.late_starts += 1
+                    slots.acquire()
+                futures.append(pool.submit(run, index))
+                self.started_flows += 1
+            start_phase = time.perf_counter() - started
+            wait(futures)
+        elapsed = time.perf_counter() - started
+
+        for future in futures:
+            if future.exception() is not None:
+                self.stderr.write(f"Flow crashed: {future.exception()}")
+                break
+        self.report(start_phase, elapsed)
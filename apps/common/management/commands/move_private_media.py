@@ -0,0 +1,61 @@
+from common.utils.storage import PrivateMediaStorage
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Move passport scans and CVs uploaded before from MEDIA_ROOT to "
+        "PRIVATE_MEDIA_ROOT, out of reach of public media URLs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the files to move",
+        )
+
+    def get_fields(self):
+        """Yield the model and name of private file fields"""
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(
+                    getattr(field, "storage", None), PrivateMediaStorage
+                ):
+                    yield model, field
+
+    def handle(self, *args, **options):
+        moved = missing = 0
+        for model, field in self.get_fields():
+            rows = (
+                model.objects.exclude(**{field.name: ""})
+                .exclude(**{f"{field.name}__isnull": True})
+                .values_list("pk", field.name)
+            )
+            for pk, name in rows.iterator():
+                if field.storage.exists(name):
+                    continue
+                if not default_storage.exists(name):
+                    self.stderr.write(f"{name}: missing")
+                    missing += 1
+                    continue
+                moved += 1
+                if options["dry_run"]:
+                    continue
+
+                with default_storage.open(name) as file:
+                    new_name = field.storage.save(
+                        name, file, max_length=field.max_length
+                    )
+                if new_name != name:
+                    model.objects.filter(pk=pk).update(
+                        **{field.name: new_name}
+                    )
+                default_storage.delete(name)
+
+        action = "To move" if options["dry_run"] else "Moved"
+        self.stdout.write(
+            self.style.SUCCESS(f"{action}: {moved} files, {missing} missing")
+        )
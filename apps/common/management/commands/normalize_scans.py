@@ -0,0 +1,52 @@
+from common.utils.scans import ScanNormalizer
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue the conversion of uploaded scans that are not normalized "
+        "yet; the outbox worker converts them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the scans to convert",
+        )
+
+    def handle(self, *args, **options):
+        queued = found = 0
+        for key in ScanNormalizer.FIELDS:
+            label, field_name = key.rsplit(".", 1)
+            model = apps.get_model(label)
+            instances = (
+                model.objects.exclude(**{field_name: ""})
+                .exclude(**{f"{field_name}__isnull": True})
+                .exclude(
+                    **{
+                        f"{field_name}__contains": (
+                            f"/{ScanNormalizer.DIRECTORY}/"
+                        )
+                    }
+                )
+                .only("pk", field_name)
+            )
+            for instance in instances.iterator():
+                file = getattr(instance, field_name)
+                if ScanNormalizer.is_normalized(file.name):
+                    continue
+                found += 1
+                if not options["dry_run"]:
+                    with transaction.atomic():
+                        queued += ScanNormalizer.schedule(
+                            instance, [field_name]
+                        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Found {found} scans to convert, queued {queued}"
+            )
+        )
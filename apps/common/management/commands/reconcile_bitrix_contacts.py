@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from common.models import BitrixContact
+from common.utils.bitrix24 import Bitrix24Integration
+from common.utils.bitrix_contacts import BitrixContactCache
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that mapped Bitrix24 contacts still exist: refresh the "
+        "mappings of live contacts and drop those of deleted or merged ones"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=30,
+            help="Check mappings not verified for this many days",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=5000,
+            help="Maximum number of contacts checked",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report without changing the mappings",
+        )
+
+    def check_contacts(self, contact_ids):
+        """Split contacts into existing and missing ones, one batch call"""
+        commands = {
+            f"contact_{contact_id}": f"crm.contact.get?id={contact_id}"
+            for contact_id in contact_ids
+        }
+        results, errors = Bitrix24Integration.call_batch(commands)
+
+        existing, missing = [], []
+        for contact_id in contact_ids:
+            name = f"contact_{contact_id}"
+            if name in results:
+                existing.append(contact_id)
+                continue
+            error = errors.get(name) or {}
+            if "not found" in error.get("error_description", "").lower():
+                missing.append(contact_id)
+            else:
+                self.stderr.write(
+                    f"Contact {contact_id}: "
+                    f"{error.get('error_description', 'unknown error')}"
+                )
+        return existing, missing
+
+    def handle(self, *args, **options):
+        if not settings.BATCH_API_URL:
+            raise CommandError("BATCH_API_URL is not configured")
+
+        stale_before = timezone.now() - timedelta(days=options["max_age"])
+        # One row per contact, checking the longest unverified first
+        contact_ids = [
+            row["contact_id"]
+            for row in BitrixContact.objects.filter(
+                verified_time__lt=stale_before
+            )
+            .values("contact_id")
+            .annotate(oldest=Min("verified_time"))
+            .order_by("oldest")[: options["limit"]]
+        ]
+
+        size = Bitrix24Integration.BATCH_MAX_COMMANDS
+        verified = dropped = 0
+        for start in range(0, len(contact_ids), size):
+            existing, missing = self.check_contacts(
+                contact_ids[start : start + size]
+            )
+            verified += len(existing)
+            dropped += len(missing)
+            if options["dry_run"]:
+                continue
+
+            BitrixContact.objects.filter(contact_id__in=existing).update(
+                verified_time=timezone.now()
+            )
+            BitrixContactCache.forget(missing)
+
+        prefix = "Would have " if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}verified {verified} and dropped {dropped} "
+                f"of {len(contact_ids)} contacts"
+            )
+        )
@@ -0,0 +1,57 @@
+from common.utils.fake_integrations import FakeIntegrationServer
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local stand-in for the Bitrix24 REST API and the SMS "
+        "gateway, for development and load tests"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=50,
+            help="Response time of every call, in milliseconds",
+        )
+        parser.add_argument(
+            "--jitter",
+            type=float,
+            default=20,
+            help="Random variation of the response time, in milliseconds",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0,
+            help="Share of calls failing with a 503, from 0 to 1",
+        )
+        parser.add_argument(
+            "--record",
+            default=None,
+            help="Append every request to this file as JSON lines",
+        )
+
+    def handle(self, *args, **options):
+        server = FakeIntegrationServer(
+            (options["host"], options["port"]),
+            latency=options["latency"] / 1000,
+            jitter=options["jitter"] / 1000,
+            error_rate=options["error_rate"],
+            record_file=options["record"],
+        )
+
+        self.stdout.write(f"Fake integrations listening on {server.base_url}")
+        self.stdout.write("Point the project at them with:")
+        for name, value in server.get_settings().items():
+            self.stdout.write(f"  {name}={value}")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
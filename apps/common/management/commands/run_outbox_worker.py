@@ -0,0 +1,96 @@
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common.utils.outbox import Outbox
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver outbox messages: claim due messages and run their "
+        "handlers in a thread pool, retrying failures with backoff, and "
+        "purge old delivered messages"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of messages processed concurrently",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Number of messages claimed at once",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when no message is due",
+        )
+        parser.add_argument(
+            "--topic",
+            action="append",
+            dest="topics",
+            help="Only process this topic; may be repeated",
+        )
+        parser.add_argument(
+            "--purge-interval",
+            type=float,
+            default=3600,
+            help="Seconds between purges of old delivered messages",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the due messages once and exit",
+        )
+
+    def process(self, messages):
+        try:
+            return Outbox.process_many(messages)
+        finally:
+            # Each pool thread has its own connection
+            connection.close()
+
+    def stop(self, signum, frame):
+        self.running = False
+
+    def handle(self, *args, **options):
+        self.running = True
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        next_purge = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            while self.running:
+                close_old_connections()
+                if time.monotonic() >= next_purge:
+                    purged = Outbox.purge()
+                    if purged:
+                        self.stdout.write(f"Purged {purged} messages")
+                    next_purge = time.monotonic() + options["purge_interval"]
+                messages = Outbox.claim(
+                    options["batch_size"], topics=options["topics"]
+                )
+                if messages:
+                    units = Outbox.group(messages)
+                    results = [
+                        delivered
+                        for unit_results in pool.map(self.process, units)
+                        for delivered in unit_results
+                    ]
+                    self.stdout.write(
+                        f"Processed {len(results)} messages, "
+                        f"{results.count(False)} failed, "
+                        f"{len(messages) - len(results)} deferred"
+                    )
+                if options["once"]:
+                    break
+                if len(messages) < options["batch_size"]:
+                    time.sleep(options["poll_interval"])
@@ -0,0 +1,72 @@
+# Generated by Django 5.2 on 2026-10-18 15:40
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0004_outboxmessage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BitrixContact",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "guid",
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        unique=True,
+                    ),
+                ),
+                ("created_time", models.DateTimeField(auto_now_add=True)),
+                ("updated_time", models.DateTimeField(auto_now=True)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("pinfl", "ПИНФЛ"), ("phone", "Телефон")],
+                        max_length=10,
+                        verbose_name="Тип",
+                    ),
+                ),
+                (
+                    "lookup_hash",
+                    models.CharField(
+                        max_length=64, unique=True, verbose_name="Хеш"
+                    ),
+                ),
+                (
+                    "contact_id",
+                    models.PositiveBigIntegerField(
+                        db_index=True, verbose_name="ID контакта в Bitrix24"
+                    ),
+                ),
+                (
+                    "verified_time",
+                    models.DateTimeField(
+                        db_index=True,
+                        default=django.utils.timezone.now,
+                        verbose_name="Проверено",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Контакт Bitrix24",
+                "verbose_name_plural": "Контакты Bitrix24",
+            },
+        ),
+    ]
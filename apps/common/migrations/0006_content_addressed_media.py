@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 16:04
+
+import common.utils.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0005_bitrixcontact"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="socialmedia",
+            name="logo",
+            field=models.ImageField(
+                storage=common.utils.storage.ContentAddressedStorage(),
+                upload_to="social/logos/",
+                verbose_name="Логотип",
+            ),
+        ),
+    ]
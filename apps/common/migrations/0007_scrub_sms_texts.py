@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def scrub_sms_texts(apps, schema_editor):
+    """Drop the texts, OTP codes included, of SMS messages already queued"""
+    OutboxMessage = apps.get_model("common", "OutboxMessage")
+    messages = OutboxMessage.objects.filter(
+        topic="sms.send", payload__has_key="text"
+    )
+    for message in messages.iterator():
+        del message.payload["text"]
+        message.payload["otp"] = True
+        message.save(update_fields=["payload"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0006_content_addressed_media"),
+    ]
+
+    operations = [
+        migrations.RunPython(scrub_sms_texts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,302 @@
+import hashlib
+import json
+import math
+
+from common.exceptions import IdempotencyConflict, IdempotencyKeyReused
+from common.serializers import DynamicFieldsMixin
+from common.utils.content_version import ContentVersion
+from common.utils.uploads import CappedUploadHandler
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+class ConditionalResponse(Exception):
+    """Raised to short-circuit a request with a conditional response"""
+
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Emit ETag and Last-Modified validators on read endpoints and answer
+    conditional requests with 304 before any queryset or serializer runs.
+
+    Validators are derived from the content versions of
+    ``conditional_models`` (the queryset model by default), the request
+    path, host and active language.
+    """
+
+    conditional_models = ()
+    conditional_validators = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        queryset = getattr(cls, "queryset", None)
+        if cls.conditional_models:
+            ContentVersion.register(*cls.conditional_models)
+        elif queryset is not None:
+            ContentVersion.register(queryset.model)
+
+    def get_conditional_models(self):
+        return self.conditional_models or (self.queryset.model,)
+
+    def get_conditional_validators(self, request):
+        versions = ContentVersion.get_many(self.get_conditional_models())
+        variant = "|".join(
+            [
+                request.get_full_path(),
+                request.get_host(),
+                translation.get_language() or "",
+            ]
+            + [
+                f"{model._meta.label_lower}:{version}"
+                for model, version in sorted(
+                    versions.items(), key=lambda item: item[0]._meta.label
+                )
+            ]
+        )
+        etag = f'W/"{hashlib.md5(variant.encode()).hexdigest()}"'
+        return etag, math.ceil(max(versions.values()))
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if request.method not in ("GET", "HEAD"):
+            return
+
+        etag, last_modified = self.get_conditional_validators(request)
+        self.conditional_validators = etag, last_modified
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            raise ConditionalResponse(self.set_validators(response))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ConditionalResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def set_validators(self, response):
+        etag, last_modified = self.conditional_validators
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if (
+            self.conditional_validators
+            and response.status_code == status.HTTP_200_OK
+        ):
+            self.set_validators(response)
+        return response
+
+
+class ValuesListMixin:
+    """
+    Serve the list action through ``values_serializer_class``, a
+    ValuesSerializer producing the same payload as the list serializer
+    from ``values()`` rows.
+    """
+
+    values_serializer_class = None
+
+    def get_values_serializer(self, **kwargs):
+        return self.values_serializer_class(
+            context=self.get_serializer_context(), **kwargs
+        )
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.get_values_serializer()
+        queryset = serializer.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
+
+
+class SparseFieldsetMixin:
+    """
+    Apply ``?fields=``, ``?omit=`` and ``?expand=`` to the serializer of
+    read requests, and defer the columns it does not read so they are
+    never fetched. Must precede ValuesListMixin.
+    """
+
+    sparse_params = ("fields", "omit", "expand")
+
+    def get_sparse_fieldset(self):
+        if self.request.method not in ("GET", "HEAD"):
+            return {}
+
+        fieldset = {}
+        for param in self.sparse_params:
+            value = self.request.query_params.get(param)
+            if value:
+                fieldset[param] = [name for name in value.split(",") if name]
+        return fieldset
+
+    def get_serializer(self, *args, **kwargs):
+        if issubclass(self.get_serializer_class(), DynamicFieldsMixin):
+            for param, names in self.get_sparse_fieldset().items():
+                kwargs.setdefault(param, names)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_values_serializer(self, **kwargs):
+        kwargs.update(self.get_sparse_fieldset())
+        return super().get_values_serializer(**kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        serializer_class = self.get_serializer_class()
+        if self.request.method not in ("GET", "HEAD") or not issubclass(
+            serializer_class, DynamicFieldsMixin
+        ):
+            return queryset
+
+        serializer = serializer_class(
+            context=self.get_serializer_context(),
+            **self.get_sparse_fieldset(),
+        )
+        deferred = serializer.get_deferred_fields()
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        return queryset
+
+
+class IdempotencyMixin:
+    """
+    ``Idempotency-Key`` support for POST endpoints.
+
+    The first request with a key runs normally, and its successful
+    response is kept in the cache for IDEMPOTENCY_KEY_TTL seconds. A retry
+    with the same key and the same payload gets that response back before
+    validation, file storage or any side effect runs. The same key with a
+    different payload is rejected with 422, and a retry that arrives while
+    the first request is still running gets 409. Failed requests are not
+    kept, so they can be retried with the same key.
+    """
+
+    idempotency_header = "Idempotency-Key"
+    idempotency_cache_prefix = "idempotency_"
+    # Cache key and fingerprint of the request being run
+    idempotency_record = None
+
+    def get_idempotency_cache_key(self, request, key):
+        digest = hashlib.sha256(f"{request.path}|{key}".encode()).hexdigest()
+        return f"{self.idempotency_cache_prefix}{digest}"
+
+    def get_request_fingerprint(self, request):
+        """Hash of the parsed payload, including uploaded file contents"""
+        digest = hashlib.sha256()
+        data = request.data
+        if hasattr(data, "lists"):
+            data = dict(data.lists())
+
+        def encode(value):
+            if hasattr(value, "chunks"):
+                file_digest = hashlib.sha256()
+                for chunk in value.chunks():
+                    file_digest.update(chunk)
+                value.seek(0)
+                return f"file:{value.name}:{file_digest.hexdigest()}"
+            return str(value)
+
+        digest.update(
+            json.dumps(data, sort_keys=True, default=encode).encode()
+        )
+        return digest.hexdigest()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        key = request.headers.get(self.idempotency_header)
+        if request.method != "POST" or not key:
+            return
+        if len(key) > 255:
+            raise ValidationError(
+                {self.idempotency_header: "Must be at most 255 characters."}
+            )
+
+        cache_key = self.get_idempotency_cache_key(request, key)
+        fingerprint = self.get_request_fingerprint(request)
+        # The marker expires if the process dies mid-request
+        in_progress = {"fingerprint": fingerprint, "response": None}
+        if cache.add(
+            cache_key, in_progress, settings.IDEMPOTENCY_LOCK_TIMEOUT
+        ):
+            self.idempotency_record = cache_key, fingerprint
+            return
+
+        stored = cache.get(cache_key)
+        if stored is None:
+            raise IdempotencyConflict()
+        if stored["fingerprint"] != fingerprint:
+            raise IdempotencyKeyReused()
+        if stored["response"] is None:
+            raise IdempotencyConflict()
+
+        data, status_code = stored["response"]
+        response = Response(data, status=status_code)
+        response["Idempotent-Replayed"] = "true"
+        raise ConditionalResponse(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ConditionalResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if self.idempotency_record is None:
+            return response
+
+        cache_key, fingerprint = self.idempotency_record
+        self.idempotency_record = None
+        if status.is_success(response.status_code):
+            cache.set(
+                cache_key,
+                {
+                    "fingerprint": fingerprint,
+                    "response": (response.data, response.status_code),
+                },
+                settings.IDEMPOTENCY_KEY_TTL,
+            )
+        else:
+            cache.delete(cache_key)
+        return response
+
+
+class UploadLimitsMixin:
+    """
+    Stream multipart uploads to disk with per-field type and size limits.
+
+    ``upload_rules`` maps the accepted file fields to their UploadRule;
+    see CappedUploadHandler.
+    """
+
+    upload_rules = {}
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [
+            CappedUploadHandler(request, self.upload_rules)
+        ]
+        return super().initialize_request(request, *args, **kwargs)
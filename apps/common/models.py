@@ -1,7 +1,10 @@
 import uuid
 
 from colorfield.fields import ColorField
+from common.utils.storage import ContentAddressedStorage
 from django.db import models
+from django.utils import timezone
+from django_cleanup import cleanup
 
 
 class BaseModel(models.Model):
@@ -53,9 +56,12 @@ class Setting(BaseModel):
         return f"{self.location_name} ({self.phone_number})"
 
 
+@cleanup.select
 class SocialMedia(BaseModel):
     url = models.URLField("Ссылка")
-    logo = models.ImageField("Логотип", upload_to="social/logos/")
+    logo = models.ImageField(
+        "Логотип", upload_to="social/logos/", storage=ContentAddressedStorage()
+    )
     setting = models.ForeignKey(
         Setting,
         on_delete=models.CASCADE,
@@ -96,3 +102,79 @@ class Badge(BaseModel):
 
     def __str__(self):
         return f"{self.title} ({self.color})"
+
+
+class OutboxMessage(BaseModel):
+    """
+    Side effect recorded in the same transaction as the data it belongs
+    to, and delivered later by the outbox worker
+    """
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "В очереди"),
+        (PROCESSING, "Обрабатывается"),
+        (DONE, "Выполнено"),
+        (FAILED, "Ошибка"),
+    )
+
+    topic = models.CharField("Тема", max_length=100)
+    reference = models.CharField(
+        "Ссылка на объект", max_length=100, blank=True, db_index=True
+    )
+    payload = models.JSONField("Данные", default=dict)
+    result = models.JSONField("Результат", default=dict, blank=True)
+    status = models.CharField(
+        "Статус", max_length=20, choices=STATUS_CHOICES, default=PENDING
+    )
+    attempts = models.PositiveIntegerField("Попытки", default=0)
+    available_at = models.DateTimeField(
+        "Доступно с",
+        default=timezone.now,
+        help_text="Время следующей попытки или окончания аренды",
+    )
+    last_error = models.TextField("Последняя ошибка", blank=True)
+
+    class Meta:
+        verbose_name = "Сообщение outbox"
+        verbose_name_plural = "Сообщения outbox"
+        indexes = [
+            # The worker claims due messages by status and time
+            models.Index(
+                fields=["status", "available_at"],
+                name="outbox_status_available_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.topic} {self.reference} ({self.status})"
+
+
+class BitrixContact(BaseModel):
+    """
+    Bitrix24 contact of a person, found by a keyed hash of their PINFL or
+    phone number so that repeat registrants reuse their contact
+    """
+
+    PINFL = "pinfl"
+    PHONE = "phone"
+    KIND_CHOICES = ((PINFL, "ПИНФЛ"), (PHONE, "Телефон"))
+
+    kind = models.CharField("Тип", max_length=10, choices=KIND_CHOICES)
+    lookup_hash = models.CharField("Хеш", max_length=64, unique=True)
+    contact_id = models.PositiveBigIntegerField(
+        "ID контакта в Bitrix24", db_index=True
+    )
+    verified_time = models.DateTimeField(
+        "Проверено", default=timezone.now, db_index=True
+    )
+
+    class Meta:
+        verbose_name = "Контакт Bitrix24"
+        verbose_name_plural = "Контакты Bitrix24"
+
+    def __str__(self):
+        return f"{self.get_kind_display()} → {self.contact_id}"
@@ -0,0 +1,69 @@
+from common.utils.http import sms_client
+from common.utils.otp import OTPService
+from common.utils.outbox import Outbox
+from common.utils.rate_limit import RateLimiter
+from common.utils.renditions import ImageRenditions
+from common.utils.scans import ScanNormalizer
+from common.utils.sms import SMSService
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+class SMSDeliveryError(Exception):
+    pass
+
+
+@Outbox.handler(
+    SMSService.TOPIC,
+    circuit=sms_client.circuit,
+    rate_limiter=RateLimiter("sms", "SMS_RATE_LIMIT"),
+)
+def send_sms(message):
+    """Send a queued SMS, unless it is no longer useful"""
+    expires_at = message.payload.get("expires_at")
+    if expires_at and parse_datetime(expires_at) <= timezone.now():
+        message.result["status"] = "expired"
+        return
+
+    phone = message.payload["phone"]
+    if message.payload.get("otp"):
+        text = OTPService.get_message(phone)
+        if text is None:
+            message.result["status"] = "expired"
+            return
+    else:
+        text = message.payload["text"]
+
+    if not SMSService.send_sms(phone, text):
+        raise SMSDeliveryError("SMS gateway did not accept the message")
+
+    message.result["status"] = "sent"
+    message.result["sent_at"] = timezone.now().isoformat()
+
+
+@Outbox.handler(ImageRenditions.TOPIC)
+def build_renditions(message):
+    """Build the resized variants of an uploaded image"""
+    manifest = ImageRenditions.process(
+        message.payload["model"],
+        message.payload["field"],
+        message.payload["name"],
+    )
+    message.result["formats"] = list(manifest["variants"])
+
+
+@Outbox.handler(ScanNormalizer.TOPIC, batch_size=settings.SCAN_WORKERS)
+def normalize_scans(messages):
+    """Convert uploaded scans, one per process of the pool"""
+    outcomes = ScanNormalizer.process(
+        [message.payload for message in messages]
+    )
+    errors = []
+    for message, outcome in zip(messages, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append(outcome)
+            continue
+        message.result.update(outcome or {"status": "skipped"})
+        errors.append(None)
+    return errors
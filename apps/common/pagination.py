@@ -1,11 +1,136 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class CustomPagination(PageNumberPagination):
+    """
+    Page number pagination with an opt-in keyset mode.
+
+    Keyset mode seeks by ``(created_time, id)`` with opaque cursors instead
+    of counting rows and scanning an OFFSET. It is used when the request
+    carries the ``cursor`` query param, or by default when
+    ``keyset_default`` is set, unless a ``page`` number is requested.
+    """
+
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
 
+    keyset_default = False
+    cursor_query_param = "cursor"
+    invalid_cursor_message = _("Invalid cursor")
+
+    def use_keyset(self, request):
+        if self.page_query_param in request.query_params:
+            return False
+        return (
+            self.keyset_default
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.use_keyset(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.display_page_controls = False
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        position, reverse = self.decode_cursor(encoded)
+
+        if position is not None:
+            created_time, pk = position
+            lookup = "gt" if reverse else "lt"
+            queryset = queryset.filter(
+                Q(**{f"created_time__{lookup}": created_time})
+                | Q(created_time=created_time, **{f"id__{lookup}": pk})
+            )
+        if reverse:
+            queryset = queryset.order_by("created_time", "id")
+        else:
+            queryset = queryset.order_by("-created_time", "-id")
+
+        results = list(queryset[: page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        # Moving backwards always leaves a following page behind
+        self.has_next = has_more if not reverse else True
+        self.has_previous = (
+            has_more if reverse else position is not None
+        ) and bool(results)
+        self.page = results
+        return results
+
+    def decode_cursor(self, encoded):
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded))
+            created_time = datetime.fromisoformat(cursor["t"])
+            return (created_time, int(cursor["i"])), bool(cursor["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, item, reverse):
+        if isinstance(item, dict):
+            created_time, pk = item["created_time"], item["id"]
+        else:
+            created_time, pk = item.created_time, item.pk
+        cursor = {"t": created_time.isoformat(), "i": pk, "r": reverse}
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(cursor, separators=(",", ":")).encode()
+        )
+        return encoded.decode().rstrip("=")
+
+    def get_cursor_link(self, item, reverse):
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(item, reverse)
+        )
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.get_cursor_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous:
+            return None
+        return self.get_cursor_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
 
 class CompanyPagination(CustomPagination):
     pass
@@ -28,11 +153,11 @@ class TestimonialsPagination(CustomPagination):
 
 
 class NewsPagination(CustomPagination):
-    pass
+    keyset_default = True
 
 
 class BlogPagination(CustomPagination):
-    pass
+    keyset_default = True
 
 
 class VacancyPagination(CustomPagination):
@@ -1,11 +1,153 @@
 from common.models import Badge, Page, Setting, SocialMedia
+from common.utils.renditions import ImageRenditions
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
 from rest_framework import serializers
 
 
+class DynamicFieldsMixin:
+    """
+    Serializer mixin taking ``fields``, ``omit`` and ``expand`` arguments.
+
+    ``fields`` restricts the output to the given names and ``omit`` drops
+    names from it. ``expand`` replaces a field with the serializer declared
+    for it in ``Meta.expandable_fields``.
+
+    ``Meta.source_fields`` maps method fields to the model fields they
+    read, e.g. ``{"full_name": ["first_name", "last_name"]}``, so that the
+    other columns can still be deferred.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        omit = kwargs.pop("omit", None)
+        expand = kwargs.pop("expand", None)
+        super().__init__(*args, **kwargs)
+
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        for name in expand or ():
+            if name in expandable and name in self.fields:
+                self.fields[name] = expandable[name](read_only=True)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+    def get_deferred_fields(self):
+        """
+        Local columns the serializer never reads, to pass to
+        ``QuerySet.defer()``. Empty when a field may read any attribute.
+        """
+        model = self.Meta.model
+        source_fields = getattr(self.Meta, "source_fields", {})
+        read = set()
+        for field in self.fields.values():
+            if isinstance(field, serializers.SerializerMethodField):
+                if field.field_name not in source_fields:
+                    return []
+                read.update(source_fields[field.field_name])
+                continue
+            if field.source == "*":
+                return []
+            try:
+                model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                return []
+            read.add(field.source_attrs[0])
+
+        deferred = []
+        for model_field in model._meta.concrete_fields:
+            if model_field.primary_key or model_field.is_relation:
+                continue
+            # Translation columns are read through their original field
+            translated = getattr(model_field, "translated_field", model_field)
+            if translated.name not in read:
+                deferred.append(model_field.name)
+        return deferred
+
+
+class RenditionField(serializers.Field):
+    """
+    Read-only ``srcset`` of the resized variants of an image field, by
+    format, e.g. ``{"webp": "<url> 64w, <url> 128w"}``. None until the
+    variants are built; clients then use the original image.
+
+    Serializers with this field use RenditionListSerializer, which fetches
+    the manifests of a whole list at once.
+    """
+
+    # Context key of the manifests fetched by RenditionListSerializer
+    MANIFESTS = "rendition_manifests"
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        image = (ImageRenditions.get_key(value.field), value.name)
+        manifests = self.context.get(self.MANIFESTS, {})
+        if image in manifests:
+            manifest = manifests[image]
+        else:
+            manifest = ImageRenditions.get_manifest(*image, value.storage)
+        return ImageRenditions.build_srcset(
+            manifest, value.storage, self.context.get("request")
+        )
+
+
+class RenditionListSerializer(serializers.ListSerializer):
+    """
+    List serializer fetching the rendition manifests of every
+    RenditionField of its items, nested ones included, in one cache
+    lookup rather than one per field and item
+    """
+
+    @classmethod
+    def get_images(cls, serializer, instance):
+        """Yield the ``(key, name, storage)`` of the images of an item"""
+        for field in serializer._readable_fields:
+            if not isinstance(field, (RenditionField, serializers.Serializer)):
+                continue
+            try:
+                value = field.get_attribute(instance)
+            except Exception:
+                # The field reports the error when it is serialized
+                continue
+            if not value:
+                continue
+            if isinstance(field, RenditionField):
+                key = ImageRenditions.get_key(value.field)
+                yield key, value.name, value.storage
+            else:
+                yield from cls.get_images(field, value)
+
+    def to_representation(self, data):
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        data = list(data)
+        images = [
+            image
+            for instance in data
+            for image in self.get_images(self.child, instance)
+        ]
+        if images:
+            self.context.setdefault(RenditionField.MANIFESTS, {}).update(
+                ImageRenditions.get_manifests(images)
+            )
+        return super().to_representation(data)
+
+
 class SocialMediaSerializer(serializers.ModelSerializer):
+    logo_srcset = RenditionField(source="logo")
+
     class Meta:
         model = SocialMedia
-        fields = ["id", "url", "logo"]
+        fields = ["id", "url", "logo", "logo_srcset"]
+        list_serializer_class = RenditionListSerializer
 
 
 class SettingSerializer(serializers.ModelSerializer):
@@ -0,0 +1,35 @@
+from common.utils.content_version import ContentVersion
+from common.utils.renditions import ImageRenditions
+from common.utils.scans import ScanNormalizer
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def touch_content_version(sender, **kwargs):
+    """Bump the content version of models behind conditional views"""
+    if not ContentVersion.is_registered(sender):
+        return
+    transaction.on_commit(lambda: ContentVersion.touch(sender))
+
+
+@receiver(post_save)
+def schedule_renditions(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    """Queue resized variants of newly uploaded images"""
+    if raw or not ImageRenditions.get_fields(sender):
+        return
+    ImageRenditions.schedule(instance, update_fields)
+
+
+@receiver(post_save)
+def schedule_scan_normalization(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    """Queue the conversion of newly uploaded scans"""
+    if raw or not ScanNormalizer.get_fields(sender):
+        return
+    ScanNormalizer.schedule(instance, update_fields)
@@ -1 +1,455 @@
-# Create your tests here.
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from unittest import mock
+from urllib.parse import parse_qs
+
+from common.checks import check_protected_media_server
+from common.models import Badge, BitrixContact, OutboxMessage
+from common.utils.bitrix24 import Bitrix24Integration
+from common.utils.bitrix_contacts import BitrixContactCache
+from common.utils.content_version import ContentVersion
+from common.utils.fake_integrations import FakeIntegrationServer
+from common.utils.http import HttpClient
+from common.utils.outbox import Outbox
+from common.utils.renditions import ImageRenditions
+from common.utils.storage import ContentAddressedStorage
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from requests import RequestException
+
+
+class Bitrix24BatchTests(TestCase):
+    """Batched registrations against the local Bitrix24 stand-in"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeIntegrationServer(("127.0.0.1", 0))
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.server.requests.clear()
+        self.server.failing_commands.clear()
+        settings = override_settings(**self.server.get_settings())
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def get_registration(self, pk):
+        return SimpleNamespace(
+            pk=pk,
+            first_name="Ali",
+            last_name="Valiyev",
+            middle_name="",
+            birth_date=None,
+            phone=f"+99890000{pk:04d}",
+            email=f"user{pk}@example.com",
+            passport_series="AA",
+            passport_number=f"{pk:07d}",
+            pinfl=f"{pk:014d}",
+            telegram_username="",
+            course=SimpleNamespace(title="Python", bitrix_category_id=1),
+        )
+
+    def get_commands(self, method):
+        """Sent batch commands of a method, by name"""
+        return {
+            name: parse_qs(command.partition("?")[2])
+            for request in self.server.get_requests()
+            for name, command in request["payload"].get("cmd", {}).items()
+            if command.startswith(f"{method}?")
+        }
+
+    def test_failed_contact_creates_no_deal(self):
+        registrations = [self.get_registration(pk) for pk in (1, 2)]
+        self.server.failing_commands.add("contact_1")
+
+        results = Bitrix24Integration.process_registrations(registrations)
+
+        self.assertFalse(results[1]["success"])
+        self.assertEqual(
+            results[1]["errors"][0]["code"], "BITRIX24_CONTACT_ERROR"
+        )
+        self.assertEqual(results[1]["data"], {})
+        self.assertTrue(results[2]["success"])
+        self.assertEqual(list(self.get_commands("crm.deal.add")), ["deal_2"])
+        deal = self.get_commands("crm.deal.add")["deal_2"]
+        self.assertEqual(
+            deal["fields[CONTACT_ID]"], [str(results[2]["data"]["contact_id"])]
+        )
+
+        # The retry creates the missing contact and a single deal
+        self.server.failing_commands.clear()
+        results = Bitrix24Integration.process_registrations(registrations[:1])
+
+        self.assertTrue(results[1]["success"])
+        deals = [
+            name
+            for request in self.server.get_requests()
+            for name, command in request["payload"].get("cmd", {}).items()
+            if command.startswith("crm.deal.add?")
+        ]
+        self.assertEqual(sorted(deals), ["deal_1", "deal_2"])
+
+    def test_failed_deal_keeps_contact(self):
+        registration = self.get_registration(3)
+        self.server.failing_commands.add("deal_3")
+
+        result = Bitrix24Integration.process_registration(registration)
+
+        self.assertFalse(result["success"])
+        self.assertTrue(result["data"]["partial_success"])
+        contact_id = result["data"]["contact_id"]
+
+        self.server.failing_commands.clear()
+        self.server.requests.clear()
+        result = Bitrix24Integration.process_registration(
+            registration, contact_id
+        )
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["data"]["contact_id"], contact_id)
+        self.assertEqual(list(self.get_commands("crm.contact.add")), [])
+        self.assertEqual(list(self.get_commands("crm.deal.add")), ["deal_3"])
+
+
+class BitrixContactCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        BitrixContactCache.remember(
+            SimpleNamespace(pinfl="12345678901234", phone="+998 90 111"), 7
+        )
+
+    def test_lookup_by_pinfl(self):
+        registration = SimpleNamespace(pinfl="12345678901234", phone="")
+        self.assertEqual(BitrixContactCache.lookup(registration), 7)
+
+    def test_unmatched_pinfl_ignores_phone(self):
+        registration = SimpleNamespace(
+            pinfl="43210987654321", phone="+998 90 111"
+        )
+        self.assertIsNone(BitrixContactCache.lookup(registration))
+
+    def test_lookup_by_phone_without_pinfl(self):
+        registration = SimpleNamespace(pinfl="", phone="99890111")
+        self.assertEqual(BitrixContactCache.lookup(registration), 7)
+        cache.clear()
+        self.assertEqual(BitrixContactCache.lookup(registration), 7)
+
+    @override_settings(BATCH_API_URL="http://bitrix.test/rest/batch")
+    @mock.patch(
+        "common.management.commands.reconcile_bitrix_contacts"
+        ".Command.check_contacts",
+        return_value=([7], []),
+    )
+    def test_reconcile_checks_each_contact_once(self, check_contacts):
+        # Both mappings of the contact, verified at different times
+        for days, mapping in enumerate(BitrixContact.objects.all(), 60):
+            mapping.verified_time = timezone.now() - timedelta(days=days)
+            mapping.save(update_fields=["verified_time"])
+        call_command("reconcile_bitrix_contacts", stdout=StringIO())
+
+        check_contacts.assert_called_once_with([7])
+
+
+@override_settings(IMAGE_RENDITION_FORMATS=["webp"])
+class ImageRenditionsTests(TestCase):
+    key = "courses.company.logo"
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = FileSystemStorage(location=directory.name)
+        buffer = BytesIO()
+        Image.new("RGB", (400, 200)).save(buffer, "PNG")
+        self.name = self.storage.save(
+            "logo.png", ContentFile(buffer.getvalue())
+        )
+
+    def get_manifest(self, key=None):
+        return ImageRenditions.get_manifest(
+            key or self.key, self.name, self.storage
+        )
+
+    def test_built_manifest_replaces_cached_miss(self):
+        self.assertIsNone(self.get_manifest())
+        manifest = ImageRenditions.build(self.key, self.name, self.storage)
+
+        self.assertEqual(self.get_manifest(), manifest)
+
+    def test_late_miss_keeps_built_manifest(self):
+        # A process that read storage before the manifest was written
+        manifest = ImageRenditions.build(self.key, self.name, self.storage)
+        cache.set(
+            ImageRenditions.cache_key(
+                ImageRenditions.get_directory(self.key, self.name),
+                missing=True,
+            ),
+            True,
+            ImageRenditions.MISSING_TIMEOUT,
+        )
+
+        self.assertEqual(self.get_manifest(), manifest)
+
+    def test_manifests_are_fetched_in_one_lookup(self):
+        ImageRenditions.build(self.key, self.name, self.storage)
+        images = [
+            (self.key, self.name, self.storage),
+            (self.key, "missing.png", self.storage),
+        ]
+
+        with mock.patch.object(
+            cache, "get_many", wraps=cache.get_many
+        ) as get_many:
+            manifests = ImageRenditions.get_manifests(images)
+            ImageRenditions.get_manifests(images)
+
+        self.assertEqual(get_many.call_count, 2)
+        self.assertIsNotNone(manifests[self.key, self.name])
+        self.assertIsNone(manifests[self.key, "missing.png"])
+
+    def test_removed_renditions_are_forgotten(self):
+        ImageRenditions.build(self.key, self.name, self.storage)
+        ImageRenditions.remove(
+            ImageRenditions.get_directory(self.key, self.name), self.storage
+        )
+
+        self.assertIsNone(self.get_manifest())
+
+    def test_fields_sharing_an_image_have_their_own_widths(self):
+        other = "courses.mentor.photo"
+        ImageRenditions.build(self.key, self.name, self.storage)
+        ImageRenditions.build(other, self.name, self.storage)
+
+        self.assertEqual(
+            list(self.get_manifest()["variants"]["webp"]), ["120", "240"]
+        )
+        self.assertEqual(
+            list(self.get_manifest(other)["variants"]["webp"]),
+            ["160", "320", "400"],
+        )
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = ContentAddressedStorage(location=directory.name)
+        self.name = self.storage.save("logo.png", ContentFile(b"logo"))
+
+    def test_leased_blob_is_kept(self):
+        self.storage.delete(self.name)
+
+        self.assertTrue(self.storage.exists(self.name))
+
+    def test_unreferenced_blob_is_deleted_after_its_lease(self):
+        cache.delete(ContentAddressedStorage.get_lease_key(self.name))
+        self.storage.delete(self.name)
+
+        self.assertFalse(self.storage.exists(self.name))
+
+    def test_upload_writes_blob_deleted_meanwhile(self):
+        lock_key = ContentAddressedStorage.get_lock_key(self.name)
+        cache.set(lock_key, 1)
+        saved = []
+        upload = threading.Thread(
+            target=lambda: saved.append(
+                self.storage.save("copy.png", ContentFile(b"logo"))
+            )
+        )
+        upload.start()
+        time.sleep(0.2)
+        os.remove(self.storage.path(self.name))
+        cache.delete(lock_key)
+        upload.join()
+
+        self.assertEqual(saved, [self.name])
+        self.assertTrue(self.storage.exists(self.name))
+
+    def test_derived_files_are_deleted_without_counting(self):
+        name = self.storage.save_as("renditions/logo.webp", ContentFile(b"x"))
+
+        with mock.patch.object(
+            ContentAddressedStorage, "count_references"
+        ) as count_references:
+            self.storage.delete(name)
+
+        count_references.assert_not_called()
+        self.assertFalse(self.storage.exists(name))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers ``/ok``, ``/busy`` with a 503, and ``/slow`` after a delay"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits.append((self.command, self.path))
+            server.connections.add(self.client_address)
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path == "/slow":
+            time.sleep(0.5)
+        body = json.dumps({"result": 1}).encode()
+        self.send_response(503 if self.path == "/busy" else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except OSError:
+            # The client timed out already
+            pass
+
+    do_POST = do_GET
+
+
+@override_settings(
+    HTTP_MAX_RETRIES=2, HTTP_RETRY_BACKOFF=0, HTTP_READ_TIMEOUT=0.2
+)
+class HttpClientTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.daemon_threads = True
+        cls.server.lock = threading.Lock()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        host, port = cls.server.server_address[:2]
+        cls.base_url = f"http://{host}:{port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.server.hits = []
+        self.server.connections = set()
+        self.client = HttpClient(self._testMethodName)
+        self.addCleanup(self.client.close)
+
+    def test_get_is_retried(self):
+        response = self.client.get(self.base_url + "/busy")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(len(self.server.hits), 3)
+
+    def test_post_is_not_retried(self):
+        response = self.client.post(self.base_url + "/busy", json={})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.server.hits, [("POST", "/busy")])
+
+    def test_timeouts(self):
+        started = time.perf_counter()
+        with self.assertRaises(RequestException):
+            self.client.post(self.base_url + "/slow", json={})
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(len(self.server.hits), 1)
+
+        with self.assertRaises(RequestException):
+            self.client.get(self.base_url + "/slow")
+        self.assertEqual(len(self.server.hits), 4)
+        self.assertEqual(self.client.get_stats()["errors"], 2)
+
+    def test_connections_are_reused(self):
+        session = self.client.get_session()
+        for _ in range(5):
+            self.client.post(self.base_url + "/ok", json={})
+
+        self.assertIs(self.client.get_session(), session)
+        self.assertEqual(len(self.server.hits), 5)
+        self.assertEqual(len(self.server.connections), 1)
+
+
+@override_settings(OUTBOX_RETENTION_DAYS=7)
+class ContentVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_models_of_conditional_views_are_touched(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Badge.objects.create(title="New")
+
+        self.assertIsNotNone(cache.get(ContentVersion.cache_key(Badge)))
+
+    def test_write_only_models_are_not_touched(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Outbox.enqueue("test", {})
+
+        self.assertEqual(callbacks, [])
+        self.assertIsNone(cache.get(ContentVersion.cache_key(OutboxMessage)))
+
+
+class OutboxPurgeTests(TestCase):
+    def test_purge_deletes_old_delivered_messages(self):
+        old = timezone.now() - timedelta(days=8)
+        recent = timezone.now() - timedelta(days=1)
+        messages = {
+            (status, when): Outbox.enqueue("test", {})
+            for status in (OutboxMessage.DONE, OutboxMessage.FAILED)
+            for when in (old, recent)
+        }
+        for (status, when), message in messages.items():
+            OutboxMessage.objects.filter(pk=message.pk).update(
+                status=status, available_at=when
+            )
+
+        self.assertEqual(Outbox.purge(chunk_size=1), 1)
+        self.assertFalse(
+            OutboxMessage.objects.filter(
+                pk=messages[OutboxMessage.DONE, old].pk
+            ).exists()
+        )
+        self.assertEqual(OutboxMessage.objects.count(), 3)
+
+    @override_settings(OUTBOX_RETENTION_DAYS=0)
+    def test_purge_disabled(self):
+        message = Outbox.enqueue("test", {})
+        OutboxMessage.objects.filter(pk=message.pk).update(
+            status=OutboxMessage.DONE,
+            available_at=timezone.now() - timedelta(days=365),
+        )
+
+        self.assertEqual(Outbox.purge(), 0)
+        self.assertTrue(OutboxMessage.objects.exists())
+
+
+class ProtectedMediaServerCheckTests(SimpleTestCase):
+    @override_settings(DEBUG=False, PROTECTED_MEDIA_SERVER="")
+    def test_streaming_fallback_warns_in_production(self):
+        self.assertEqual(
+            [m.id for m in check_protected_media_server(None)],
+            ["common.W001"],
+        )
+
+    @override_settings(DEBUG=False, PROTECTED_MEDIA_SERVER="x-accel-redirect")
+    def test_proxy_server_passes(self):
+        self.assertEqual(check_protected_media_server(None), [])
@@ -1,4 +1,5 @@
 from common.views import (
+    HealthAPIView,
     PageDetailAPIView,
     PageListAPIView,
     SettingRetrieveAPIView,
@@ -6,6 +7,7 @@ from common.views import (
 from django.urls import path
 
 urlpatterns = [
+    path("health/", HealthAPIView.as_view(), name="health"),
     path("settings/", SettingRetrieveAPIView.as_view(), name="setting-get"),
     path("pages/", PageListAPIView.as_view(), name="page-list"),
     path(
@@ -1,7 +1,10 @@
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
 
-import requests
+from common.utils.bitrix_contacts import BitrixContactCache
+from common.utils.circuit_breaker import CircuitOpenError
+from common.utils.http import bitrix24_client
 from django.conf import settings
 
 
@@ -10,8 +13,15 @@ class Bitrix24Integration:
     Class for handling Bitrix24 CRM integration.
     Provides methods to create contacts and deals in Bitrix24 CRM.
     Returns data in a format compatible with custom_response decorator.
+
+    When BATCH_API_URL is set, registrations share ``batch`` calls: the
+    contacts of all registrations are created first, then the deals of
+    those whose contact exists, so a failed contact never yields a deal.
     """
 
+    # Bitrix24 runs at most 50 commands per batch call
+    BATCH_MAX_COMMANDS = 50
+
     @classmethod
     def format_error(
         cls, field: str, message: str, code: str = "ERROR"
@@ -29,6 +39,62 @@ class Bitrix24Integration:
         """
         return {"field": field, "message": message, "code": code}
 
+    @classmethod
+    def get_unavailable_result(cls, error: CircuitOpenError) -> Dict[str, Any]:
+        """Result of a call skipped because the Bitrix24 circuit is open"""
+        logging.warning(f"Bitrix24 call skipped: {str(error)}")
+        return {
+            "success": False,
+            "data": {},
+            "errors": [
+                cls.format_error(
+                    "bitrix24", str(error), "BITRIX24_UNAVAILABLE"
+                )
+            ],
+        }
+
+    @classmethod
+    def get_contact_fields(cls, registration) -> Dict[str, Any]:
+        """Bitrix24 contact fields of a course registration"""
+        return {
+            "NAME": registration.first_name,
+            "LAST_NAME": registration.last_name,
+            "SECOND_NAME": registration.middle_name,
+            "BIRTHDATE": (
+                registration.birth_date.strftime("%Y-%m-%d")
+                if registration.birth_date
+                else ""
+            ),
+            "PHONE": [{"VALUE": registration.phone, "VALUE_TYPE": "WORK"}],
+            "EMAIL": [{"VALUE": registration.email, "VALUE_TYPE": "WORK"}],
+            "UF_CRM_616F7E3810AFB": registration.passport_series,  # Серия паспорта
+            "UF_CRM_1640158035566": registration.passport_number,  # Номер паспорта
+            "UF_CRM_1664772076922": registration.pinfl,  # ПИНФЛ
+            "UF_CRM_6488092EEC562": registration.telegram_username,  # Никнейм в телеграм
+        }
+
+    @classmethod
+    def get_deal_fields(cls, registration, contact_id) -> Dict[str, Any]:
+        """Bitrix24 deal fields of a course registration"""
+        course = registration.course
+        return {
+            "TITLE": f"{registration.last_name} {registration.first_name} - {course.title}",
+            "CONTACT_ID": contact_id,
+            "CATEGORY_ID": course.bitrix_category_id,  # Using the course's Bitrix category ID
+            "COMMENTS": f"Registration from website. Course: {course.title}",
+            "UF_CRM_620E99B9D06E4": course.title,  # Направление обучения
+            "UF_CRM_676E46AB7683D": [course.title],  # Заинтересован курсу(ам)
+            "UF_CRM_616FE09315135": registration.last_name,  # Фамилия
+            "UF_CRM_61B88631159A8": registration.middle_name,  # Отчество
+            "UF_CRM_616FE09331687": [registration.phone],  # Телефон
+            "UF_CRM_616FE0933D8EF": [registration.email],  # E-mail
+            "UF_CRM_616E92488947B": registration.passport_series,  # Серия паспорта
+            "UF_CRM_620E99B9E49E0": [
+                registration.passport_number
+            ],  # Номер паспорта
+            "UF_CRM_64D9B9125F4BB": registration.telegram_username,  # Никнейм в телеграм
+        }
+
     @classmethod
     def create_contact(cls, registration) -> Dict[str, Any]:
         """
@@ -41,30 +107,9 @@ class Bitrix24Integration:
             dict: Response with success flag, data and errors
         """
         try:
-            contact_data = {
-                "fields": {
-                    "NAME": registration.first_name,
-                    "LAST_NAME": registration.last_name,
-                    "SECOND_NAME": registration.middle_name,
-                    "BIRTHDATE": (
-                        registration.birth_date.strftime("%Y-%m-%d")
-                        if registration.birth_date
-                        else ""
-                    ),
-                    "PHONE": [
-                        {"VALUE": registration.phone, "VALUE_TYPE": "WORK"}
-                    ],
-                    "EMAIL": [
-                        {"VALUE": registration.email, "VALUE_TYPE": "WORK"}
-                    ],
-                    "UF_CRM_616F7E3810AFB": registration.passport_series,  # Серия паспорта
-                    "UF_CRM_1640158035566": registration.passport_number,  # Номер паспорта
-                    "UF_CRM_1664772076922": registration.pinfl,  # ПИНФЛ
-                    "UF_CRM_6488092EEC562": registration.telegram_username,  # Никнейм в телеграм
-                }
-            }
+            contact_data = {"fields": cls.get_contact_fields(registration)}
 
-            response = requests.post(
+            response = bitrix24_client.post(
                 settings.CONTACT_API_URL, json=contact_data
             )
             response_data = response.json()
@@ -95,6 +140,9 @@ class Bitrix24Integration:
                     ],
                 }
 
+        except CircuitOpenError as e:
+            return cls.get_unavailable_result(e)
+
         except Exception as e:
             logging.exception(f"Exception creating Bitrix24 contact: {str(e)}")
             return {
@@ -122,31 +170,13 @@ class Bitrix24Integration:
             dict: Response with success flag, data and errors
         """
         try:
-            course = registration.course
-
             deal_data = {
-                "fields": {
-                    "TITLE": f"{registration.last_name} {registration.first_name} - {course.title}",
-                    "CONTACT_ID": contact_id,
-                    "CATEGORY_ID": course.bitrix_category_id,  # Using the course's Bitrix category ID
-                    "COMMENTS": f"Registration from website. Course: {course.title}",
-                    "UF_CRM_620E99B9D06E4": course.title,  # Направление обучения
-                    "UF_CRM_676E46AB7683D": [
-                        course.title
-                    ],  # Заинтересован курсу(ам)
-                    "UF_CRM_616FE09315135": registration.last_name,  # Фамилия
-                    "UF_CRM_61B88631159A8": registration.middle_name,  # Отчество
-                    "UF_CRM_616FE09331687": [registration.phone],  # Телефон
-                    "UF_CRM_616FE0933D8EF": [registration.email],  # E-mail
-                    "UF_CRM_616E92488947B": registration.passport_series,  # Серия паспорта
-                    "UF_CRM_620E99B9E49E0": [
-                        registration.passport_number
-                    ],  # Номер паспорта
-                    "UF_CRM_64D9B9125F4BB": registration.telegram_username,  # Никнейм в телеграм
-                }
+                "fields": cls.get_deal_fields(registration, contact_id)
             }
 
-            response = requests.post(settings.DEAL_API_URL, json=deal_data)
+            response = bitrix24_client.post(
+                settings.DEAL_API_URL, json=deal_data
+            )
             response_data = response.json()
 
             if "result" in response_data and response_data["result"] > 0:
@@ -175,6 +205,9 @@ class Bitrix24Integration:
                     ],
                 }
 
+        except CircuitOpenError as e:
+            return cls.get_unavailable_result(e)
+
         except Exception as e:
             logging.exception(f"Exception creating Bitrix24 deal: {str(e)}")
             return {
@@ -190,22 +223,38 @@ class Bitrix24Integration:
             }
 
     @classmethod
-    def process_registration(cls, registration) -> Dict[str, Any]:
+    def process_registration(
+        cls, registration, contact_id: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
-        Process a course registration by creating a contact and deal in Bitrix24
+        Process a course registration by creating a contact and deal in Bitrix24.
+        The contact of a repeat registrant is reused.
 
         Args:
             registration: CourseRegistration instance
+            contact_id: ID of a contact created by an earlier, partially
+                successful attempt; the contact is not created again
 
         Returns:
             dict: Result with success flag, data and errors
         """
-        contact_result = cls.create_contact(registration)
+        if settings.BATCH_API_URL:
+            results = cls.process_registrations(
+                [registration], {registration.pk: contact_id}
+            )
+            return results[registration.pk]
+
+        if contact_id is None:
+            contact_id = BitrixContactCache.lookup(registration)
 
-        if not contact_result["success"]:
-            return contact_result
+        if contact_id is None:
+            contact_result = cls.create_contact(registration)
 
-        contact_id = contact_result["data"]["contact_id"]
+            if not contact_result["success"]:
+                return contact_result
+
+            contact_id = contact_result["data"]["contact_id"]
+            BitrixContactCache.remember(registration, contact_id)
 
         deal_result = cls.create_deal(registration, contact_id)
 
@@ -224,3 +273,223 @@ class Bitrix24Integration:
             },
             "errors": [],
         }
+
+    @classmethod
+    def build_query(cls, params, prefix: str = "") -> List[Tuple[str, Any]]:
+        """Flatten nested params into ``key[sub][0]`` query pairs"""
+        pairs = []
+        if isinstance(params, dict):
+            items = params.items()
+        else:
+            items = enumerate(params)
+        for key, value in items:
+            name = f"{prefix}[{key}]" if prefix else str(key)
+            if isinstance(value, (dict, list, tuple)):
+                pairs.extend(cls.build_query(value, name))
+            else:
+                pairs.append((name, "" if value is None else value))
+        return pairs
+
+    @classmethod
+    def build_command(cls, method: str, fields: Dict[str, Any]) -> str:
+        """
+        Build a batch command
+
+        Args:
+            method: Bitrix24 REST method
+            fields: Fields of the created entity
+
+        Returns:
+            str: Command in the ``method?query`` form
+        """
+        return f"{method}?{urlencode(cls.build_query({'fields': fields}))}"
+
+    @classmethod
+    def call_batch(cls, commands: Dict[str, str]) -> Tuple[dict, dict]:
+        """
+        Run commands in one batch call
+
+        Args:
+            commands: Commands by name
+
+        Returns:
+            tuple: Results and errors of the commands, by name
+        """
+        response = bitrix24_client.post(
+            settings.BATCH_API_URL, json={"halt": 0, "cmd": commands}
+        )
+        response_data = response.json()
+        if "result" not in response_data:
+            raise ValueError(
+                response_data.get(
+                    "error_description", "Unknown error running batch"
+                )
+            )
+
+        batch = response_data["result"]
+        # Empty results come back as lists
+        return batch.get("result") or {}, batch.get("result_error") or {}
+
+    @classmethod
+    def run_commands(
+        cls, commands: Dict[int, str], entity: str
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Run the commands creating one kind of entity, in as few batch
+        calls as fit
+
+        Args:
+            commands: Commands by registration ID
+            entity: Kind of the created entities, e.g. "contact"
+
+        Returns:
+            dict: Result of each registration ID, the created entity ID
+                under ``data["id"]``
+        """
+        pks = list(commands)
+        outcomes = {}
+        for start in range(0, len(pks), cls.BATCH_MAX_COMMANDS):
+            batch = {
+                f"{entity}_{pk}": commands[pk]
+                for pk in pks[start : start + cls.BATCH_MAX_COMMANDS]
+            }
+            try:
+                results, errors = cls.call_batch(batch)
+            except CircuitOpenError as e:
+                for name in batch:
+                    outcomes[name] = cls.get_unavailable_result(e)
+                continue
+            except Exception as e:
+                logging.exception(
+                    f"Exception running Bitrix24 batch: {str(e)}"
+                )
+                for name in batch:
+                    outcomes[name] = {
+                        "success": False,
+                        "data": {},
+                        "errors": [
+                            cls.format_error(
+                                "bitrix24",
+                                f"Exception: {str(e)}",
+                                "BITRIX24_EXCEPTION",
+                            )
+                        ],
+                    }
+                continue
+
+            for name in batch:
+                if name in results:
+                    outcomes[name] = {
+                        "success": True,
+                        "data": {"id": results[name]},
+                        "errors": [],
+                    }
+                    continue
+                error = errors.get(name) or {}
+                error_msg = error.get(
+                    "error_description", f"Unknown error creating {entity}"
+                )
+                logging.error(
+                    f"Bitrix24 {entity} creation failed: {error_msg}"
+                )
+                outcomes[name] = {
+                    "success": False,
+                    "data": {},
+                    "errors": [
+                        cls.format_error(
+                            "bitrix24",
+                            error_msg,
+                            f"BITRIX24_{entity.upper()}_ERROR",
+                        )
+                    ],
+                }
+        return {
+            int(name.rsplit("_", 1)[1]): outcome
+            for name, outcome in outcomes.items()
+        }
+
+    @classmethod
+    def process_registrations(
+        cls, registrations, contact_ids: Optional[Dict[int, int]] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Process many course registrations with as few Bitrix24 calls as
+        possible. Without BATCH_API_URL, registrations are processed one by
+        one.
+
+        Args:
+            registrations: CourseRegistration instances, with their course
+            contact_ids: Contacts created by earlier, partially successful
+                attempts, by registration ID
+
+        Returns:
+            dict: Result of each registration ID, as in process_registration
+        """
+        contact_ids = contact_ids or {}
+        if not settings.BATCH_API_URL:
+            return {
+                registration.pk: cls.process_registration(
+                    registration, contact_ids.get(registration.pk)
+                )
+                for registration in registrations
+            }
+
+        registrations = {
+            registration.pk: registration for registration in registrations
+        }
+        contact_ids = {
+            pk: contact_ids.get(pk) or BitrixContactCache.lookup(registration)
+            for pk, registration in registrations.items()
+        }
+
+        processed = {}
+        contact_results = cls.run_commands(
+            {
+                pk: cls.build_command(
+                    "crm.contact.add", cls.get_contact_fields(registration)
+                )
+                for pk, registration in registrations.items()
+                if contact_ids[pk] is None
+            },
+            "contact",
+        )
+        for pk, result in contact_results.items():
+            if result["success"]:
+                contact_ids[pk] = result["data"]["id"]
+                BitrixContactCache.remember(registrations[pk], contact_ids[pk])
+            else:
+                processed[pk] = result
+
+        # Deals are only sent once their contact exists: with halt=0 a
+        # deal referencing a failed contact would still be created
+        deal_results = cls.run_commands(
+            {
+                pk: cls.build_command(
+                    "crm.deal.add",
+                    cls.get_deal_fields(registration, contact_ids[pk]),
+                )
+                for pk, registration in registrations.items()
+                if pk not in processed
+            },
+            "deal",
+        )
+        for pk, result in deal_results.items():
+            if result["success"]:
+                processed[pk] = {
+                    "success": True,
+                    "data": {
+                        "contact_id": contact_ids[pk],
+                        "deal_id": result["data"]["id"],
+                    },
+                    "errors": [],
+                }
+            else:
+                processed[pk] = {
+                    "success": False,
+                    "data": {
+                        "contact_id": contact_ids[pk],
+                        "partial_success": True,
+                    },
+                    "errors": result["errors"],
+                }
+        return processed
@@ -0,0 +1,104 @@
+import re
+from typing import Dict, Iterable, Optional
+
+from common.models import BitrixContact
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+
+class BitrixContactCache:
+    """
+    Mapping of people to their Bitrix24 contact.
+
+    People are identified by their PINFL, or by their phone number when
+    they gave none.
+    Only keyed hashes of these are stored, in the BitrixContact table,
+    with Redis in front of it.
+    """
+
+    CACHE_PREFIX = "bitrix_contact_"
+
+    @classmethod
+    def get_hashes(cls, registration) -> Dict[str, str]:
+        """Lookup hashes of a registration, by kind, PINFL first"""
+        values = {
+            BitrixContact.PINFL: (registration.pinfl or "").strip(),
+            BitrixContact.PHONE: re.sub(r"\D", "", registration.phone or ""),
+        }
+        return {
+            kind: salted_hmac(
+                "bitrix_contact", f"{kind}:{value}", algorithm="sha256"
+            ).hexdigest()
+            for kind, value in values.items()
+            if value
+        }
+
+    @classmethod
+    def cache_key(cls, lookup_hash: str) -> str:
+        return f"{cls.CACHE_PREFIX}{lookup_hash}"
+
+    @classmethod
+    def get_lookup_hash(cls, registration) -> Optional[str]:
+        """
+        Hash identifying the registrant: their PINFL, or their phone number
+        when they gave no PINFL. A phone number can change hands, so it is
+        not trusted over a PINFL that matched no contact.
+        """
+        hashes = cls.get_hashes(registration)
+        return hashes.get(BitrixContact.PINFL) or hashes.get(
+            BitrixContact.PHONE
+        )
+
+    @classmethod
+    def lookup(cls, registration) -> Optional[int]:
+        """Return the known contact of the registrant, if any"""
+        lookup_hash = cls.get_lookup_hash(registration)
+        if lookup_hash is None:
+            return None
+
+        key = cls.cache_key(lookup_hash)
+        contact_id = cache.get(key)
+        if contact_id is not None:
+            return contact_id
+
+        contact_id = (
+            BitrixContact.objects.filter(lookup_hash=lookup_hash)
+            .values_list("contact_id", flat=True)
+            .first()
+        )
+        if contact_id is not None:
+            cache.set(key, contact_id, settings.BITRIX_CONTACT_CACHE_TIMEOUT)
+        return contact_id
+
+    @classmethod
+    def remember(cls, registration, contact_id: int) -> None:
+        """Record the contact of the registrant"""
+        hashes = cls.get_hashes(registration)
+        now = timezone.now()
+        for kind, lookup_hash in hashes.items():
+            BitrixContact.objects.update_or_create(
+                lookup_hash=lookup_hash,
+                defaults={
+                    "kind": kind,
+                    "contact_id": contact_id,
+                    "verified_time": now,
+                },
+            )
+        cache.set_many(
+            {
+                cls.cache_key(lookup_hash): contact_id
+                for lookup_hash in hashes.values()
+            },
+            settings.BITRIX_CONTACT_CACHE_TIMEOUT,
+        )
+
+    @classmethod
+    def forget(cls, contact_ids: Iterable[int]) -> int:
+        """Drop the mappings of contacts that no longer exist in Bitrix24"""
+        mappings = BitrixContact.objects.filter(contact_id__in=contact_ids)
+        hashes = list(mappings.values_list("lookup_hash", flat=True))
+        cache.delete_many([cls.cache_key(h) for h in hashes])
+        deleted, _ = mappings.delete()
+        return deleted
@@ -0,0 +1,172 @@
+import logging
+import time
+from typing import Any, Dict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one upstream, shared by all processes via the cache.
+
+    Calls are counted in two consecutive windows of CIRCUIT_WINDOW
+    seconds. Once there are CIRCUIT_MIN_CALLS calls, the circuit opens
+    when the share of failed calls or of calls slower than
+    CIRCUIT_SLOW_CALL reaches its threshold. An open circuit rejects calls
+    for CIRCUIT_OPEN_SECONDS, then lets a single probe through
+    (half-open): its success closes the circuit, its failure opens it
+    again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    CACHE_PREFIX = "circuit_"
+    COUNTERS = ("calls", "failures", "slow")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def cache_key(self, suffix: str) -> str:
+        return f"{self.CACHE_PREFIX}{self.name}_{suffix}"
+
+    def counter_keys(self, now: float) -> Dict[str, list]:
+        """Counter keys of the current and the previous window"""
+        window = int(now // settings.CIRCUIT_WINDOW)
+        return {
+            counter: [
+                self.cache_key(f"{bucket}_{counter}")
+                for bucket in (window, window - 1)
+            ]
+            for counter in self.COUNTERS
+        }
+
+    def get_counts(self, now: float) -> Dict[str, int]:
+        keys = self.counter_keys(now)
+        values = cache.get_many(
+            [key for pair in keys.values() for key in pair]
+        )
+        return {
+            counter: sum(values.get(key, 0) for key in pair)
+            for counter, pair in keys.items()
+        }
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through"""
+        opened_until = cache.get(self.cache_key("opened_until"))
+        if opened_until is None:
+            return 0
+        return max(opened_until - time.time(), 0)
+
+    def is_open(self) -> bool:
+        """Whether calls are rejected now; a due probe does not count"""
+        return self.retry_after() > 0
+
+    def allow(self) -> bool:
+        """Whether a call may go out; in half-open state, only one does"""
+        opened_until = cache.get(self.cache_key("opened_until"))
+        if opened_until is None:
+            return True
+        if time.time() < opened_until:
+            return False
+        return cache.add(
+            self.cache_key("probe"), 1, settings.CIRCUIT_OPEN_SECONDS
+        )
+
+    def record(self, elapsed: float, failed: bool) -> None:
+        """Count the outcome of a call and open or close the circuit"""
+        now = time.time()
+        if cache.get(self.cache_key("opened_until")) is not None:
+            # The call was the half-open probe
+            if failed:
+                self.trip(now)
+            else:
+                self.reset(now)
+            return
+
+        keys = self.counter_keys(now)
+        outcomes = {
+            "calls": True,
+            "failures": failed,
+            "slow": elapsed >= settings.CIRCUIT_SLOW_CALL,
+        }
+        for counter, happened in outcomes.items():
+            if happened:
+                key = keys[counter][0]
+                # Counters outlive both windows they are read in
+                if not cache.add(key, 1, settings.CIRCUIT_WINDOW * 2):
+                    cache.incr(key)
+
+        if not failed and elapsed < settings.CIRCUIT_SLOW_CALL:
+            return
+        counts = self.get_counts(now)
+        if counts["calls"] < settings.CIRCUIT_MIN_CALLS:
+            return
+        if (
+            counts["failures"] / counts["calls"]
+            >= settings.CIRCUIT_FAILURE_RATE
+            or counts["slow"] / counts["calls"]
+            >= settings.CIRCUIT_SLOW_CALL_RATE
+        ):
+            self.trip(now)
+
+    def trip(self, now: float) -> None:
+        logger.warning(
+            f"Circuit {self.name} opened for "
+            f"{settings.CIRCUIT_OPEN_SECONDS}s"
+        )
+        cache.set(
+            self.cache_key("opened_until"),
+            now + settings.CIRCUIT_OPEN_SECONDS,
+            None,
+        )
+        cache.delete(self.cache_key("probe"))
+
+    def reset(self, now: float) -> None:
+        logger.info(f"Circuit {self.name} closed")
+        keys = self.counter_keys(now)
+        cache.delete_many(
+            [
+                self.cache_key("opened_until"),
+                self.cache_key("probe"),
+                *(key for pair in keys.values() for key in pair),
+            ]
+        )
+
+    def get_state(self) -> Dict[str, Any]:
+        """State and recent counts, as shown by the health endpoint"""
+        now = time.time()
+        opened_until = cache.get(self.cache_key("opened_until"))
+        if opened_until is None:
+            state = self.CLOSED
+        elif now < opened_until:
+            state = self.OPEN
+        else:
+            state = self.HALF_OPEN
+
+        counts = self.get_counts(now)
+        calls = counts["calls"]
+        return {
+            "state": state,
+            "retry_after": (
+                round(opened_until - now) if state == self.OPEN else 0
+            ),
+            "calls": calls,
+            "failure_rate": (
+                round(counts["failures"] / calls, 2) if calls else 0
+            ),
+            "slow_call_rate": round(counts["slow"] / calls, 2) if calls else 0,
+        }
@@ -0,0 +1,58 @@
+import time
+from importlib import import_module
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class ContentVersion:
+    """
+    Per-model content versions used as cheap HTTP validators.
+
+    A version is the timestamp of the last committed write to a model,
+    so it doubles as the Last-Modified value of any response built
+    from that model. Only models registered by the conditional views
+    serving them are versioned, not write-only ones such as the outbox.
+    """
+
+    CACHE_PREFIX = "content_version_"
+    registered = set()
+
+    @classmethod
+    def cache_key(cls, model) -> str:
+        return f"{cls.CACHE_PREFIX}{model._meta.label_lower}"
+
+    @classmethod
+    def register(cls, *models) -> None:
+        cls.registered.update(models)
+
+    @classmethod
+    def is_registered(cls, model) -> bool:
+        """Whether a conditional view is built from the model"""
+        # Views register their models when the URLconf imports them
+        import_module(settings.ROOT_URLCONF)
+        return model in cls.registered
+
+    @classmethod
+    def touch(cls, *models) -> None:
+        """Mark the given models as changed now"""
+        now = time.time()
+        cache.set_many({cls.cache_key(model): now for model in models}, None)
+
+    @classmethod
+    def get_many(cls, models: Iterable) -> dict:
+        """Return the version of every model, in a single round trip"""
+        keys = {cls.cache_key(model): model for model in models}
+        versions = cache.get_many(keys)
+
+        missing = [key for key in keys if key not in versions]
+        if missing:
+            # Unknown versions start now: clients revalidate once
+            now = time.time()
+            for key in missing:
+                version = now
+                if not cache.add(key, version, None):
+                    version = cache.get(key, version)
+                versions[key] = version
+        return {keys[key]: version for key, version in versions.items()}
@@ -1,3 +1,4 @@
+from rest_framework.response import Response
 from rest_framework.views import APIView
 
 """
@@ -13,6 +14,9 @@ Response structure:
 def custom_response(view):
     def inner(self, request, *args, **kwargs):
         response = super(view, self).dispatch(request, args, **kwargs)
+        if not isinstance(response, Response):
+            # Conditional responses (304, 412) carry no body to wrap
+            return response
         response_data = response.data
         data = {
             "success": True,
@@ -0,0 +1,198 @@
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+CONTACT_PATH = "/rest/crm.contact.add.json"
+DEAL_PATH = "/rest/crm.deal.add.json"
+BATCH_PATH = "/rest/batch.json"
+SMS_PATH = "/sms/send"
+# Recorded requests, and the last SMS sent to a phone number
+REQUESTS_PATH = "/_requests"
+SMS_INBOX_PATH = "/_sms"
+
+
+class FakeIntegrationHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == REQUESTS_PATH:
+            self.send_json(self.server.get_requests())
+        elif url.path == SMS_INBOX_PATH and "phone" in query:
+            message = self.server.sms_inbox.get(query["phone"][0])
+            if message is None:
+                self.send_json({"error": "No SMS"}, status=404)
+            else:
+                self.send_json(message)
+        else:
+            self.send_json({"error": "Not found"}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_json({"error": "Invalid JSON"}, status=400)
+            return
+
+        server = self.server
+        server.simulate_latency()
+        failed = random.random() < server.error_rate
+        server.record(self.path, payload, 503 if failed else 200)
+        if failed:
+            self.send_json({"error": "Service unavailable"}, status=503)
+            return
+
+        if self.path == CONTACT_PATH or self.path == DEAL_PATH:
+            self.send_json(server.bitrix_result(server.next_id()))
+        elif self.path == BATCH_PATH:
+            self.send_json(server.run_batch(payload.get("cmd") or {}))
+        elif self.path == SMS_PATH:
+            body = payload.get("body") or {}
+            server.sms_inbox[str(body.get("CdPN"))] = {
+                "text": body.get("text"),
+                "time": time.time(),
+            }
+            self.send_json({"status": "ok"})
+        else:
+            self.send_json({"error": "Not found"}, status=404)
+
+
+class FakeIntegrationServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the Bitrix24 REST API and the SMS gateway.
+
+    Implements the contracts of CONTACT_API_URL, DEAL_API_URL,
+    BATCH_API_URL and SMS_API_URL. Every call waits ``latency`` seconds,
+    give or take ``jitter``, and fails with a 503 with probability
+    ``error_rate``; batch commands named in ``failing_commands`` fail on
+    their own, as Bitrix24 reports per-command errors. The last
+    ``history`` requests are recorded and served at ``/_requests``, and
+    the last SMS of a phone number at ``/_sms?phone=...``.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        history: int = 10000,
+        record_file: Optional[str] = None,
+        failing_commands: Iterable[str] = (),
+    ):
+        super().__init__(address, FakeIntegrationHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.failing_commands = set(failing_commands)
+        self.requests = deque(maxlen=history)
+        self.sms_inbox = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.record_file = open(record_file, "a") if record_file else None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_settings(self) -> dict:
+        """Settings pointing the project at this server"""
+        return {
+            "CONTACT_API_URL": self.base_url + CONTACT_PATH,
+            "DEAL_API_URL": self.base_url + DEAL_PATH,
+            "BATCH_API_URL": self.base_url + BATCH_PATH,
+            "SMS_API_URL": self.base_url + SMS_PATH,
+        }
+
+    def simulate_latency(self):
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def next_id(self) -> int:
+        with self.lock:
+            return next(self.ids)
+
+    def bitrix_result(self, result) -> dict:
+        now = time.time()
+        return {"result": result, "time": {"start": now, "finish": now}}
+
+    def record(self, path: str, payload, status: int):
+        entry = {
+            "time": time.time(),
+            "path": path,
+            "status": status,
+            "payload": payload,
+        }
+        with self.lock:
+            self.requests.append(entry)
+            if self.record_file:
+                self.record_file.write(json.dumps(entry) + "\n")
+                self.record_file.flush()
+
+    def get_requests(self) -> list:
+        with self.lock:
+            return list(self.requests)
+
+    def run_batch(self, commands: dict) -> dict:
+        """Run batch commands, substituting ``$result[name]`` references"""
+        results, errors = {}, {}
+        for name, command in commands.items():
+            method, _, query = command.partition("?")
+            missing = [
+                ref
+                for ref in re.findall(r"\$result\[(\w+)\]", query)
+                if ref not in results
+            ]
+            if name in self.failing_commands:
+                errors[name] = {
+                    "error": "",
+                    "error_description": f"{name} failed",
+                }
+            elif missing:
+                errors[name] = {
+                    "error": "",
+                    "error_description": f"Result of {missing[0]} missing",
+                }
+            elif method in ("crm.contact.add", "crm.deal.add"):
+                results[name] = self.next_id()
+            elif method == "crm.contact.get":
+                contact_id = parse_qs(query).get("id", [""])[0]
+                results[name] = {"ID": contact_id}
+            else:
+                errors[name] = {
+                    "error": "ERROR_METHOD_NOT_FOUND",
+                    "error_description": "Method not found!",
+                }
+        # Bitrix24 returns empty results as lists
+        return self.bitrix_result(
+            {"result": results or [], "result_error": errors or []}
+        )
+
+    def server_close(self):
+        super().server_close()
+        if self.record_file:
+            self.record_file.close()
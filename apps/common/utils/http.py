@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from typing import Dict
+
+import requests
+from common.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """
+    Outbound HTTP client shared by the integrations.
+
+    Each client keeps one keep-alive ``Session`` per process, with a
+    connection pool per upstream host, so calls skip the DNS, TCP and TLS
+    setup after the first one. Every call has connect and read timeouts.
+    Connection failures are retried for all methods, since the request
+    never reached the upstream; read failures and 502/503/504 responses
+    are retried for idempotent methods only, so a POST is never sent
+    twice. Latency and error counts are kept per client, and feed the
+    client's circuit breaker: while it is open, calls raise
+    CircuitOpenError without reaching the upstream.
+    """
+
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(self, name: str):
+        self.name = name
+        self._session = None
+        self._lock = threading.Lock()
+        self.circuit = CircuitBreaker(name)
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "total_time": 0.0,
+            "max_time": 0.0,
+        }
+
+    @property
+    def timeout(self):
+        return settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT
+
+    def get_retry(self) -> Retry:
+        return Retry(
+            total=settings.HTTP_MAX_RETRIES,
+            connect=settings.HTTP_MAX_RETRIES,
+            read=settings.HTTP_MAX_RETRIES,
+            status=settings.HTTP_MAX_RETRIES,
+            backoff_factor=settings.HTTP_RETRY_BACKOFF,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            # Hand the last response to the caller instead of raising
+            raise_on_status=False,
+        )
+
+    def get_session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+                        max_retries=self.get_retry(),
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def record(self, elapsed: float, failed: bool):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["errors"] += failed
+            self.stats["total_time"] += elapsed
+            self.stats["max_time"] = max(self.stats["max_time"], elapsed)
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self.stats)
+        stats["avg_time"] = (
+            stats["total_time"] / stats["requests"] if stats["requests"] else 0
+        )
+        return stats
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        if not self.circuit.allow():
+            raise CircuitOpenError(self.name, self.circuit.retry_after())
+
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = self.get_session().request(method, url, **kwargs)
+            failed = response.status_code >= 500
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            self.record(elapsed, failed)
+            self.circuit.record(elapsed, failed)
+            log = logger.warning if failed else logger.debug
+            log(
+                f"{self.name} {method} {url} "
+                f"{'failed' if failed else 'ok'} in {elapsed * 1000:.0f} ms"
+            )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+bitrix24_client = HttpClient("bitrix24")
+sms_client = HttpClient("sms")
@@ -1,38 +1,157 @@
 import logging
-import random
+import secrets
 import string
+import time
+from typing import NamedTuple, Optional
 
-from django.core.cache import cache
+from django.conf import settings
+from django_redis import get_redis_connection
+
+# KEYS: code hash, failure counter
+# ARGV: code, code TTL, resend interval, max failures, now
+# Returns {code issued (1/0), seconds to wait}
+ISSUE_SCRIPT = """
+local failures = tonumber(redis.call('GET', KEYS[2]) or '0')
+if failures >= tonumber(ARGV[4]) then
+    return {0, redis.call('TTL', KEYS[2])}
+end
+local issued_at = redis.call('HGET', KEYS[1], 'issued_at')
+if issued_at then
+    local wait = tonumber(issued_at) + tonumber(ARGV[3]) - tonumber(ARGV[5])
+    if wait > 0 then
+        return {0, wait}
+    end
+end
+redis.call('HSET', KEYS[1], 'code', ARGV[1], 'issued_at', ARGV[5])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return {1, 0}
+"""
+
+# KEYS: code hash, failure counter
+# ARGV: code, max failures, lockout
+# Returns {code valid (1/0), failed attempts left, seconds locked}
+VERIFY_SCRIPT = """
+local max_failures = tonumber(ARGV[2])
+local failures = tonumber(redis.call('GET', KEYS[2]) or '0')
+if failures >= max_failures then
+    return {0, 0, redis.call('TTL', KEYS[2])}
+end
+local code = redis.call('HGET', KEYS[1], 'code')
+if code and code == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return {1, max_failures, 0}
+end
+failures = redis.call('INCR', KEYS[2])
+if failures == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+if failures >= max_failures then
+    redis.call('DEL', KEYS[1])
+    return {0, 0, redis.call('TTL', KEYS[2])}
+end
+return {0, max_failures - failures, 0}
+"""
+
+
+class OTPIssue(NamedTuple):
+    code: Optional[str]
+    # Seconds until a code can be issued again, when none was issued
+    retry_after: int
+
+
+class OTPVerification(NamedTuple):
+    valid: bool
+    attempts_left: int
+    locked_for: int
 
 
 class OTPService:
-    """Service for OTP generation and verification"""
+    """
+    Service for OTP generation and verification.
+
+    Codes live in Redis, and every issue and verify is a single atomic
+    Lua script call. A new code is issued at most once per
+    OTP_RESEND_INTERVAL. After OTP_MAX_ATTEMPTS wrong codes within
+    OTP_LOCKOUT seconds, the phone number is locked out: its code is
+    dropped and no code is issued or accepted until the lockout ends.
+    """
 
     OTP_CACHE_TIMEOUT = 4 * 60
+    MESSAGE = "Your verification code is {code}. Valid for 4 minutes."
     OTP_LENGTH = 6
     CACHE_PREFIX = "phone_verification_otp_"
 
+    _scripts = None
+
     @classmethod
-    def generate_otp(cls, phone_number: str) -> str:
-        """Generate a random OTP code and store in cache"""
-        otp_code = "".join(random.choices(string.digits, k=cls.OTP_LENGTH))
-        cache_key = f"{cls.CACHE_PREFIX}{phone_number}"
-        cache.set(cache_key, otp_code, cls.OTP_CACHE_TIMEOUT)
-        logging.info(f"Generated OTP code for {phone_number}")
-        return otp_code
+    def get_scripts(cls):
+        if cls._scripts is None:
+            client = get_redis_connection("default")
+            cls._scripts = (
+                client.register_script(ISSUE_SCRIPT),
+                client.register_script(VERIFY_SCRIPT),
+            )
+        return cls._scripts
 
     @classmethod
-    def verify_otp(cls, phone_number: str, otp_code: str) -> bool:
-        """Verify the OTP code for the given phone number"""
-        cache_key = f"{cls.CACHE_PREFIX}{phone_number}"
-        stored_otp = cache.get(cache_key)
+    def get_keys(cls, phone_number: str):
+        # The hash tag keeps both keys in one Redis Cluster slot
+        tag = f"{{{phone_number}}}"
+        return [
+            f"{cls.CACHE_PREFIX}{tag}",
+            f"{cls.CACHE_PREFIX}failures_{tag}",
+        ]
+
+    @classmethod
+    def generate_code(cls) -> str:
+        return "".join(
+            secrets.choice(string.digits) for _ in range(cls.OTP_LENGTH)
+        )
 
-        if not stored_otp:
-            return False
+    @classmethod
+    def issue_otp(cls, phone_number: str) -> OTPIssue:
+        """Generate and store a new OTP code, unless too soon or locked"""
+        code = cls.generate_code()
+        issue, _ = cls.get_scripts()
+        issued, retry_after = issue(
+            keys=cls.get_keys(phone_number),
+            args=[
+                code,
+                cls.OTP_CACHE_TIMEOUT,
+                settings.OTP_RESEND_INTERVAL,
+                settings.OTP_MAX_ATTEMPTS,
+                int(time.time()),
+            ],
+        )
+        if not issued:
+            return OTPIssue(None, max(int(retry_after), 1))
 
-        is_valid = stored_otp == otp_code
+        logging.info(f"Generated OTP code for {phone_number}")
+        return OTPIssue(code, 0)
 
-        if is_valid:
-            cache.delete(cache_key)
+    @classmethod
+    def get_message(cls, phone_number: str) -> Optional[str]:
+        """
+        Text of the SMS carrying the current code of a phone number, None
+        once the code expired or was used; the code never leaves Redis
+        until it is sent
+        """
+        client = get_redis_connection("default")
+        code = client.hget(cls.get_keys(phone_number)[0], "code")
+        if code is None:
+            return None
+        return cls.MESSAGE.format(code=code.decode())
 
-        return is_valid
+    @classmethod
+    def verify_otp(cls, phone_number: str, otp_code: str) -> OTPVerification:
+        """Verify the OTP code for the given phone number"""
+        _, verify = cls.get_scripts()
+        valid, attempts_left, locked_for = verify(
+            keys=cls.get_keys(phone_number),
+            args=[otp_code, settings.OTP_MAX_ATTEMPTS, settings.OTP_LOCKOUT],
+        )
+        if locked_for:
+            logging.warning(f"OTP verification locked for {phone_number}")
+        return OTPVerification(
+            bool(valid), int(attempts_left), max(int(locked_for), 0)
+        )
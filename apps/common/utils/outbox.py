@@ -0,0 +1,261 @@
+import logging
+import random
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from common.models import OutboxMessage
+from common.utils.circuit_breaker import CircuitBreaker
+from common.utils.rate_limit import RateLimiter
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    """
+    Transactional outbox.
+
+    Messages are enqueued inside the transaction that writes the data they
+    refer to, so they exist if and only if that data was committed. The
+    worker claims due messages with ``SKIP LOCKED``, runs the handler
+    registered for their topic and retries failures with exponential
+    backoff. A claimed message is leased; if its worker dies, it becomes
+    due again once the lease expires. Delivered messages are kept for
+    OUTBOX_RETENTION_DAYS, then purged by the worker.
+    """
+
+    handlers: Dict[str, Callable] = {}
+    batch_sizes: Dict[str, int] = {}
+    circuits: Dict[str, CircuitBreaker] = {}
+    rate_limiters: Dict[str, RateLimiter] = {}
+
+    @classmethod
+    def handler(
+        cls,
+        topic: str,
+        batch_size: Optional[int] = None,
+        circuit: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Register the handler of a topic.
+
+        A handler gets one message. With ``batch_size``, it gets a list of
+        up to ``batch_size`` messages and returns the error of each one,
+        or None for the messages it delivered. Messages of a topic with a
+        ``circuit`` are deferred, without using up an attempt, while the
+        circuit of their upstream is open, and so are messages beyond the
+        ``rate_limiter`` of their topic.
+        """
+
+        def register(func):
+            cls.handlers[topic] = func
+            if batch_size:
+                cls.batch_sizes[topic] = batch_size
+            if circuit is not None:
+                cls.circuits[topic] = circuit
+            if rate_limiter is not None:
+                cls.rate_limiters[topic] = rate_limiter
+            return func
+
+        return register
+
+    @classmethod
+    def enqueue(
+        cls, topic: str, payload: dict, reference: str = ""
+    ) -> OutboxMessage:
+        """Record a message; call it inside the caller's transaction"""
+        return OutboxMessage.objects.create(
+            topic=topic, payload=payload, reference=reference
+        )
+
+    @classmethod
+    def get_status(cls, topic: str, reference: str) -> Optional[OutboxMessage]:
+        """Return the latest message of a topic for a reference"""
+        return (
+            OutboxMessage.objects.filter(topic=topic, reference=reference)
+            .order_by("-created_time")
+            .first()
+        )
+
+    @classmethod
+    def claim(
+        cls, batch_size: int, topics: Optional[Iterable[str]] = None
+    ) -> List[OutboxMessage]:
+        """Lease a batch of due messages to the calling worker"""
+        now = timezone.now()
+        lease_until = now + timedelta(seconds=settings.OUTBOX_LEASE)
+
+        with transaction.atomic():
+            due = OutboxMessage.objects.filter(
+                status__in=(OutboxMessage.PENDING, OutboxMessage.PROCESSING),
+                available_at__lte=now,
+            )
+            if topics:
+                due = due.filter(topic__in=topics)
+            ids = list(
+                due.select_for_update(skip_locked=True)
+                .order_by("available_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            OutboxMessage.objects.filter(id__in=ids).update(
+                status=OutboxMessage.PROCESSING,
+                attempts=F("attempts") + 1,
+                available_at=lease_until,
+            )
+        return list(OutboxMessage.objects.filter(id__in=ids))
+
+    @classmethod
+    def defer(cls, messages: List[OutboxMessage], delay: float) -> None:
+        """Release claimed messages untried, giving back their attempt"""
+        logger.info(
+            f"Outbox deferred {len(messages)} messages by {delay:.0f}s"
+        )
+        OutboxMessage.objects.filter(
+            id__in=[message.id for message in messages]
+        ).update(
+            status=OutboxMessage.PENDING,
+            attempts=F("attempts") - 1,
+            available_at=timezone.now() + timedelta(seconds=delay),
+        )
+
+    @classmethod
+    def retry_delay(cls, attempts: int) -> float:
+        """Exponential backoff with jitter, capped"""
+        delay = min(
+            settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+            settings.OUTBOX_RETRY_MAX_DELAY,
+        )
+        return delay * random.uniform(0.5, 1.0)
+
+    @classmethod
+    def group(cls, messages: List[OutboxMessage]) -> List[List[OutboxMessage]]:
+        """Split claimed messages into the units of work of the handlers"""
+        units = []
+        by_topic = {}
+        for message in messages:
+            if message.topic in cls.batch_sizes:
+                by_topic.setdefault(message.topic, []).append(message)
+            else:
+                units.append([message])
+        for topic, topic_messages in by_topic.items():
+            size = cls.batch_sizes[topic]
+            units.extend(
+                topic_messages[start : start + size]
+                for start in range(0, len(topic_messages), size)
+            )
+        return units
+
+    @classmethod
+    def process_many(cls, messages: List[OutboxMessage]) -> List[bool]:
+        """Run the handler of a unit of work and record the outcomes"""
+        topic = messages[0].topic
+        circuit = cls.circuits.get(topic)
+        if circuit is not None and circuit.is_open():
+            cls.defer(messages, circuit.retry_after())
+            return []
+
+        rate_limiter = cls.rate_limiters.get(topic)
+        if rate_limiter is not None:
+            for position in range(len(messages)):
+                wait = rate_limiter.acquire()
+                if wait:
+                    cls.defer(messages[position:], wait)
+                    messages = messages[:position]
+                    break
+            if not messages:
+                return []
+
+        if topic not in cls.batch_sizes:
+            return [cls.process(message) for message in messages]
+
+        try:
+            errors = cls.handlers[topic](messages)
+        except Exception as e:
+            logger.exception(
+                f"Outbox batch of {len(messages)} ({topic}) failed"
+            )
+            errors = [e] * len(messages)
+
+        for message, error in zip(messages, errors):
+            if error is not None:
+                logger.error(
+                    f"Outbox message {message.id} ({topic}) failed: {error}"
+                )
+        return [
+            cls.finish(message, error)
+            for message, error in zip(messages, errors)
+        ]
+
+    @classmethod
+    def process(cls, message: OutboxMessage) -> bool:
+        """Run the handler of a claimed message and record the outcome"""
+        handler = cls.handlers.get(message.topic)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for topic {message.topic}")
+            handler(message)
+        except Exception as e:
+            logger.exception(
+                f"Outbox message {message.id} ({message.topic}) failed"
+            )
+            return cls.finish(message, e)
+        return cls.finish(message)
+
+    @classmethod
+    def finish(
+        cls, message: OutboxMessage, error: Optional[Exception] = None
+    ) -> bool:
+        """Mark a message done, or schedule its retry after an error"""
+        if error is not None:
+            message.last_error = str(error)
+            if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                message.status = OutboxMessage.FAILED
+            else:
+                message.status = OutboxMessage.PENDING
+                message.available_at = timezone.now() + timedelta(
+                    seconds=cls.retry_delay(message.attempts)
+                )
+            message.save(
+                update_fields=[
+                    "status",
+                    "available_at",
+                    "last_error",
+                    "result",
+                    "updated_time",
+                ]
+            )
+            return False
+
+        message.status = OutboxMessage.DONE
+        message.last_error = ""
+        message.save(
+            update_fields=["status", "last_error", "result", "updated_time"]
+        )
+        return True
+
+    @classmethod
+    def purge(cls, chunk_size: int = 1000) -> int:
+        """
+        Delete the messages delivered more than OUTBOX_RETENTION_DAYS ago,
+        in chunks so that no long delete blocks the worker
+        """
+        if not settings.OUTBOX_RETENTION_DAYS:
+            return 0
+        cutoff = timezone.now() - timedelta(
+            days=settings.OUTBOX_RETENTION_DAYS
+        )
+        # A delivered message keeps the end of its last lease, which the
+        # claim index covers
+        done = OutboxMessage.objects.filter(
+            status=OutboxMessage.DONE, available_at__lt=cutoff
+        )
+        deleted = 0
+        while True:
+            ids = list(done.values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                return deleted
+            deleted += OutboxMessage.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class RateLimiter:
+    """
+    Fixed-window rate limit shared by all processes via the cache.
+
+    ``limit_setting`` names the setting holding the number of calls
+    allowed per ``period`` seconds.
+    """
+
+    CACHE_PREFIX = "rate_limit_"
+
+    def __init__(self, name: str, limit_setting: str, period: int = 1):
+        self.name = name
+        self.limit_setting = limit_setting
+        self.period = period
+
+    def acquire(self) -> float:
+        """Take a slot; return 0, or the seconds until a slot frees up"""
+        now = time.time()
+        window = int(now // self.period)
+        key = f"{self.CACHE_PREFIX}{self.name}_{window}"
+        if cache.add(key, 1, self.period * 2):
+            used = 1
+        else:
+            used = cache.incr(key)
+        if used <= getattr(settings, self.limit_setting):
+            return 0
+        return (window + 1) * self.period - now
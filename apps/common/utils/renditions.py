@@ -0,0 +1,330 @@
+import hashlib
+import json
+import logging
+import os
+import posixpath
+from io import BytesIO
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from common.models import OutboxMessage
+from common.utils.outbox import Outbox
+from common.utils.storage import ContentAddressedStorage
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+logger = logging.getLogger(__name__)
+
+
+class ImageRenditions:
+    """
+    Resized WebP/AVIF variants of uploaded images.
+
+    Variants of the image fields listed in WIDTHS are built by the outbox
+    worker after upload and stored under ``renditions/<field>/<original
+    name>/`` in the storage of the original, next to a manifest of the
+    variants actually built. They are kept per field, since fields sharing
+    a blob need their own widths. Serializers read the manifest to expose
+    a srcset per format, and None until it exists, so clients fall back
+    to the original. Images are never upscaled.
+
+    Manifests are cached in the shared cache, so that every process sees
+    a manifest as soon as the worker wrote it; building or removing
+    renditions replaces the cached entry. Misses are cached under their
+    own keys, so a late miss never hides a manifest built meanwhile. Lists
+    fetch the manifests of all their images at once with get_manifests.
+    """
+
+    TOPIC = "media.renditions"
+    ROOT = "renditions"
+    MANIFEST = "manifest.json"
+    # Widths by image field, in pixels, covering 1x and 2x screens
+    WIDTHS = {
+        "courses.course.icon": (64, 128, 256),
+        "courses.mentor.photo": (160, 320, 640),
+        "courses.company.logo": (120, 240),
+        "courses.companystudent.logo": (120, 240),
+        "courses.testimonial.avatar": (64, 128),
+        "news.news.image": (480, 960, 1440),
+        "blog.blog.image": (480, 960, 1440),
+        "common.socialmedia.logo": (32, 64),
+    }
+    PILLOW_FORMATS = {"avif": "AVIF", "webp": "WEBP"}
+    CACHE_PREFIX = "image_renditions_"
+    MISSING_PREFIX = "image_renditions_missing_"
+    # Seconds a missing manifest is remembered before it is looked up again
+    MISSING_TIMEOUT = 30
+    MANIFEST_TIMEOUT = 60 * 60 * 24
+
+    @classmethod
+    def get_fields(cls, model) -> List[str]:
+        """Names of the image fields of a model that have renditions"""
+        prefix = f"{model._meta.label_lower}."
+        return [
+            key[len(prefix) :] for key in cls.WIDTHS if key.startswith(prefix)
+        ]
+
+    @classmethod
+    def get_formats(cls) -> List[str]:
+        """Configured formats that this Pillow build can encode"""
+        return [
+            fmt
+            for fmt in settings.IMAGE_RENDITION_FORMATS
+            if fmt in cls.PILLOW_FORMATS and features.check(fmt)
+        ]
+
+    @classmethod
+    def get_key(cls, model_field) -> str:
+        """Key of an image field in WIDTHS"""
+        return f"{model_field.model._meta.label_lower}.{model_field.name}"
+
+    @classmethod
+    def get_directory(cls, key: str, name: str) -> str:
+        return posixpath.join(cls.ROOT, key, name)
+
+    @classmethod
+    def cache_key(cls, directory: str, missing: bool = False) -> str:
+        digest = hashlib.sha256(directory.encode()).hexdigest()
+        prefix = cls.MISSING_PREFIX if missing else cls.CACHE_PREFIX
+        return prefix + digest
+
+    @classmethod
+    def read_manifest(cls, key: str, name: str, storage) -> Optional[dict]:
+        """Manifest of the renditions of an image in storage, if built"""
+        path = posixpath.join(cls.get_directory(key, name), cls.MANIFEST)
+        if not storage.exists(path):
+            return None
+        with storage.open(path) as file:
+            return json.load(file)
+
+    @classmethod
+    def get_manifests(
+        cls, images: Iterable[Tuple[str, str, Any]]
+    ) -> Dict[Tuple[str, str], Optional[dict]]:
+        """
+        Manifests of many images, given as ``(key, name, storage)``, by
+        ``(key, name)``: one cache lookup for all of them, and one write
+        per kind of outcome for those read from storage
+        """
+        directories = {
+            (key, name): (cls.get_directory(key, name), storage)
+            for key, name, storage in images
+        }
+        cache_keys = {}
+        for image, (directory, _) in directories.items():
+            cache_keys[cls.cache_key(directory)] = image
+            cache_keys[cls.cache_key(directory, missing=True)] = image
+
+        manifests = {}
+        for cache_key, value in cache.get_many(list(cache_keys)).items():
+            image = cache_keys[cache_key]
+            if cache_key.startswith(cls.MISSING_PREFIX):
+                # A manifest built since the miss was cached wins
+                manifests.setdefault(image, None)
+            else:
+                manifests[image] = value
+
+        found, missing = {}, {}
+        for image, (directory, storage) in directories.items():
+            if image in manifests:
+                continue
+            manifest = cls.read_manifest(*image, storage)
+            manifests[image] = manifest
+            if manifest is None:
+                missing[cls.cache_key(directory, missing=True)] = True
+            else:
+                found[cls.cache_key(directory)] = manifest
+        if found:
+            cache.set_many(found, cls.MANIFEST_TIMEOUT)
+        if missing:
+            cache.set_many(missing, cls.MISSING_TIMEOUT)
+        return manifests
+
+    @classmethod
+    def get_manifest(cls, key: str, name: str, storage) -> Optional[dict]:
+        """Manifest of the renditions of an image, None until built"""
+        return cls.get_manifests([(key, name, storage)])[key, name]
+
+    @classmethod
+    def get_srcset(
+        cls, key: str, name: str, storage, request=None
+    ) -> Optional[Dict[str, str]]:
+        """``srcset`` attribute of every format of an image, by format"""
+        return cls.build_srcset(
+            cls.get_manifest(key, name, storage), storage, request
+        )
+
+    @classmethod
+    def build_srcset(
+        cls, manifest: Optional[dict], storage, request=None
+    ) -> Optional[Dict[str, str]]:
+        """``srcset`` of every format of a manifest, None without one"""
+        if manifest is None:
+            return None
+
+        srcset = {}
+        for fmt, variants in manifest["variants"].items():
+            candidates = []
+            for width, path in variants.items():
+                url = storage.url(path)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                candidates.append(f"{url} {width}w")
+            srcset[fmt] = ", ".join(candidates)
+        return srcset
+
+    @classmethod
+    def build_absolute_srcset(cls, request, srcset: Dict[str, str]):
+        """Make the URLs of a srcset built without a request absolute"""
+        absolute = {}
+        for fmt, candidates in srcset.items():
+            absolute[fmt] = ", ".join(
+                f"{request.build_absolute_uri(url)} {descriptor}"
+                for url, descriptor in (
+                    candidate.rsplit(" ", 1)
+                    for candidate in candidates.split(", ")
+                )
+            )
+        return absolute
+
+    @classmethod
+    def open_image(cls, name: str, storage) -> Image.Image:
+        with storage.open(name) as file:
+            image = Image.open(file)
+            image.load()
+        # Phone photos are stored sideways with an EXIF orientation
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or (
+                image.mode == "P" and "transparency" in image.info
+            )
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        return image
+
+    @classmethod
+    def build(cls, key: str, name: str, storage) -> dict:
+        """Build the renditions of an image and write their manifest"""
+        image = cls.open_image(name, storage)
+        directory = cls.get_directory(key, name)
+
+        # Widths past the original collapse into a single original-size one
+        targets = sorted(
+            {min(width, image.width) for width in cls.WIDTHS[key]}
+        )
+        variants = {}
+        for fmt in cls.get_formats():
+            variants[fmt] = {}
+            for width in targets:
+                height = max(round(image.height * width / image.width), 1)
+                resized = image
+                if width != image.width:
+                    resized = image.resize(
+                        (width, height), Image.Resampling.LANCZOS
+                    )
+                buffer = BytesIO()
+                resized.save(
+                    buffer,
+                    cls.PILLOW_FORMATS[fmt],
+                    quality=settings.IMAGE_RENDITION_QUALITY,
+                )
+                path = posixpath.join(directory, f"{width}w.{fmt}")
+                cls.write(storage, path, buffer.getvalue())
+                variants[fmt][str(width)] = path
+
+        manifest = {
+            "width": image.width,
+            "height": image.height,
+            "variants": variants,
+        }
+        cls.write(
+            storage,
+            posixpath.join(directory, cls.MANIFEST),
+            json.dumps(manifest).encode(),
+        )
+        cache.set(cls.cache_key(directory), manifest, cls.MANIFEST_TIMEOUT)
+        cache.delete(cls.cache_key(directory, missing=True))
+        return manifest
+
+    @classmethod
+    def write(cls, storage, path: str, content: bytes) -> None:
+        # Overwrite rather than let the storage pick another name
+        if storage.exists(path):
+            storage.delete(path)
+        if isinstance(storage, ContentAddressedStorage):
+            # Variants are found by name, next to their original
+            storage.save_as(path, ContentFile(content))
+        else:
+            storage.save(path, ContentFile(content))
+
+    @classmethod
+    def remove(cls, directory: str, storage) -> int:
+        """Delete the renditions in a directory"""
+        if not storage.exists(directory):
+            return 0
+        _, files = storage.listdir(directory)
+        for file in files:
+            storage.delete(posixpath.join(directory, file))
+        try:
+            os.rmdir(storage.path(directory))
+        except (NotImplementedError, OSError):
+            # Remote storages have no directories
+            pass
+        cache.delete_many(
+            [
+                cls.cache_key(directory),
+                cls.cache_key(directory, missing=True),
+            ]
+        )
+        return len(files)
+
+    @classmethod
+    def schedule(cls, instance, update_fields=None) -> int:
+        """
+        Queue the renditions of the images of a saved instance that have
+        none yet; call it inside the transaction that saved the instance
+        """
+        model = type(instance)
+        queued = 0
+        for field_name in cls.get_fields(model):
+            if update_fields is not None and field_name not in update_fields:
+                continue
+            key = f"{model._meta.label_lower}.{field_name}"
+            file = getattr(instance, field_name)
+            # Read past the cache, whose misses this would only prolong
+            if not file or cls.read_manifest(key, file.name, file.storage):
+                continue
+            if OutboxMessage.objects.filter(
+                topic=cls.TOPIC,
+                reference=file.name,
+                payload__model=model._meta.label_lower,
+                payload__field=field_name,
+                status__in=[OutboxMessage.PENDING, OutboxMessage.PROCESSING],
+            ).exists():
+                continue
+            Outbox.enqueue(
+                cls.TOPIC,
+                {
+                    "model": model._meta.label_lower,
+                    "field": field_name,
+                    "name": file.name,
+                },
+                reference=file.name,
+            )
+            queued += 1
+        return queued
+
+    @classmethod
+    def process(cls, label: str, field_name: str, name: str) -> dict:
+        """
+        Build the renditions of an image, then save the rows showing it
+        again, so that the caches and documents embedding them refresh
+        """
+        model = apps.get_model(label)
+        storage = model._meta.get_field(field_name).storage
+        manifest = cls.build(f"{label}.{field_name}", name, storage)
+        for instance in model.objects.filter(**{field_name: name}):
+            instance.save(update_fields=["updated_time"])
+        logger.info(f"Built renditions of {name}")
+        return manifest
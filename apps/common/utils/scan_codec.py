@@ -0,0 +1,39 @@
+"""
+Image decoding run in the scan normalization process pool. Kept free of
+Django imports, so that pool processes start without setting Django up.
+"""
+
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+PILLOW_FORMATS = {"jpeg": "JPEG", "webp": "WEBP"}
+
+
+def register_heif() -> bool:
+    """Let Pillow open HEIC/HEIF images, when pillow-heif is installed"""
+    try:
+        from pillow_heif import register_heif_opener
+    except ImportError:
+        return False
+    register_heif_opener()
+    return True
+
+
+def normalize_image(
+    content: bytes, max_side: int, fmt: str, quality: int
+) -> bytes:
+    """
+    Decode an image, apply its EXIF orientation, fit it within
+    ``max_side`` pixels and encode it again
+    """
+    with Image.open(BytesIO(content)) as image:
+        # Decode at a reduced scale when the format allows it (JPEG)
+        image.draft("RGB", (max_side, max_side))
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        image.save(buffer, PILLOW_FORMATS[fmt], quality=quality)
+    return buffer.getvalue()
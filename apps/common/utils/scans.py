@@ -0,0 +1,178 @@
+import logging
+import multiprocessing
+import posixpath
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from common.models import OutboxMessage
+from common.utils.outbox import Outbox
+from common.utils.scan_codec import normalize_image, register_heif
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class ScanNormalizer:
+    """
+    Normalization of uploaded document scans.
+
+    Scans of the fields in FIELDS arrive as large phone photos, often
+    HEIC/HEIF that browsers cannot display. After upload, the outbox
+    worker decodes them in a process pool, rotates them upright, fits
+    them within SCAN_MAX_SIDE pixels and stores them as JPEG or WebP
+    under ``normalized/`` next to the original. The row is pointed at
+    the normalized file and the original deleted only once that
+    succeeded; a failed conversion keeps the original and is retried.
+    """
+
+    TOPIC = "media.scans"
+    DIRECTORY = "normalized"
+    FIELDS = ("courses.courseregistration.passport_image",)
+    EXTENSIONS = {"jpeg": "jpg", "webp": "webp"}
+
+    _pool: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_fields(cls, model) -> List[str]:
+        """Names of the scan fields of a model"""
+        prefix = f"{model._meta.label_lower}."
+        return [
+            key[len(prefix) :] for key in cls.FIELDS if key.startswith(prefix)
+        ]
+
+    @classmethod
+    def is_normalized(cls, name: str) -> bool:
+        return posixpath.basename(posixpath.dirname(name)) == cls.DIRECTORY
+
+    @classmethod
+    def get_normalized_name(cls, name: str) -> str:
+        directory, filename = posixpath.split(name)
+        stem = posixpath.splitext(filename)[0]
+        extension = cls.EXTENSIONS[settings.SCAN_FORMAT]
+        return posixpath.join(directory, cls.DIRECTORY, f"{stem}.{extension}")
+
+    @classmethod
+    def get_pool(cls) -> ProcessPoolExecutor:
+        """Process pool of the calling worker, started on first use"""
+        with cls._lock:
+            if cls._pool is None:
+                cls._pool = ProcessPoolExecutor(
+                    max_workers=settings.SCAN_WORKERS,
+                    # Forking the threaded worker could copy held locks
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=register_heif,
+                )
+            return cls._pool
+
+    @classmethod
+    def reset_pool(cls) -> None:
+        """Drop a pool whose process died, e.g. killed on a huge image"""
+        with cls._lock:
+            if cls._pool is not None:
+                cls._pool.shutdown(wait=False, cancel_futures=True)
+                cls._pool = None
+
+    @classmethod
+    def schedule(cls, instance, update_fields=None) -> int:
+        """
+        Queue the normalization of the scans of a saved instance; call it
+        inside the transaction that saved the instance
+        """
+        model = type(instance)
+        queued = 0
+        for field_name in cls.get_fields(model):
+            if update_fields is not None and field_name not in update_fields:
+                continue
+            file = getattr(instance, field_name)
+            if not file or cls.is_normalized(file.name):
+                continue
+            if OutboxMessage.objects.filter(
+                topic=cls.TOPIC,
+                reference=file.name,
+                status__in=[OutboxMessage.PENDING, OutboxMessage.PROCESSING],
+            ).exists():
+                continue
+            Outbox.enqueue(
+                cls.TOPIC,
+                {
+                    "model": model._meta.label_lower,
+                    "field": field_name,
+                    "pk": instance.pk,
+                    "name": file.name,
+                },
+                reference=file.name,
+            )
+            queued += 1
+        return queued
+
+    @classmethod
+    def process(cls, payloads: List[dict]) -> list:
+        """
+        Normalize a batch of scans in parallel. Returns the outcome of
+        each one: a result, None when the scan is gone or was replaced
+        since it was queued, or the exception it failed with.
+        """
+        pool = cls.get_pool()
+        futures = []
+        for payload in payloads:
+            model = apps.get_model(payload["model"])
+            storage = model._meta.get_field(payload["field"]).storage
+            try:
+                if not storage.exists(payload["name"]):
+                    futures.append(None)
+                    continue
+                with storage.open(payload["name"]) as file:
+                    content = file.read()
+                futures.append(
+                    pool.submit(
+                        normalize_image,
+                        content,
+                        settings.SCAN_MAX_SIDE,
+                        settings.SCAN_FORMAT,
+                        settings.SCAN_QUALITY,
+                    )
+                )
+            except Exception as e:
+                futures.append(e)
+
+        outcomes = []
+        for payload, future in zip(payloads, futures):
+            if future is None or isinstance(future, Exception):
+                outcomes.append(future)
+                continue
+            try:
+                outcomes.append(cls.replace(payload, future.result()))
+            except BrokenProcessPool as e:
+                cls.reset_pool()
+                outcomes.append(e)
+            except Exception as e:
+                outcomes.append(e)
+        return outcomes
+
+    @classmethod
+    def replace(cls, payload: dict, content: bytes) -> Optional[dict]:
+        """Store a normalized scan in place of its original"""
+        model = apps.get_model(payload["model"])
+        field_name, original = payload["field"], payload["name"]
+        storage = model._meta.get_field(field_name).storage
+        name = storage.save(
+            cls.get_normalized_name(original), ContentFile(content)
+        )
+        # Saving the row again would queue its scan anew
+        updated = model.objects.filter(
+            pk=payload["pk"], **{field_name: original}
+        ).update(**{field_name: name, "updated_time": timezone.now()})
+        if not updated:
+            storage.delete(name)
+            return None
+
+        size = storage.size(original)
+        storage.delete(original)
+        logger.info(f"Normalized {original} into {name}")
+        return {"name": name, "size": size, "normalized_size": len(content)}
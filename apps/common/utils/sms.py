@@ -1,11 +1,77 @@
 import logging
+from datetime import timedelta
+from typing import Optional
 
-import requests
+from common.models import OutboxMessage
+from common.utils.circuit_breaker import CircuitOpenError
+from common.utils.http import sms_client
+from common.utils.outbox import Outbox
 from django.conf import settings
+from django.utils import timezone
 
 
 class SMSService:
-    """Service for sending SMS messages"""
+    """
+    Service for sending SMS messages.
+
+    Messages are queued in the outbox and sent by its worker, within the
+    global SMS_RATE_LIMIT.
+    """
+
+    TOPIC = "sms.send"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether the SMS gateway is accepting calls"""
+        return not sms_client.circuit.is_open()
+
+    @classmethod
+    def enqueue_sms(
+        cls, phone_number: str, message: str, expires_in: Optional[int] = None
+    ) -> OutboxMessage:
+        """
+        Queue an SMS; an identical SMS still waiting to be sent is returned
+        instead of queueing a second one. An SMS not sent within
+        ``expires_in`` seconds is dropped.
+        """
+        pending = OutboxMessage.objects.filter(
+            topic=cls.TOPIC,
+            reference=phone_number,
+            status=OutboxMessage.PENDING,
+            payload__text=message,
+        ).first()
+        if pending is not None:
+            return pending
+
+        payload = {"phone": phone_number, "text": message}
+        if expires_in:
+            expires_at = timezone.now() + timedelta(seconds=expires_in)
+            payload["expires_at"] = expires_at.isoformat()
+        return Outbox.enqueue(cls.TOPIC, payload, reference=phone_number)
+
+    @classmethod
+    def enqueue_otp(
+        cls, phone_number: str, expires_in: Optional[int] = None
+    ) -> OutboxMessage:
+        """
+        Queue the SMS of the OTP code of a phone number. The payload holds
+        no code: the text is read from Redis when the SMS is sent, so a
+        code issued again before then goes out in the same SMS.
+        """
+        pending = OutboxMessage.objects.filter(
+            topic=cls.TOPIC,
+            reference=phone_number,
+            status=OutboxMessage.PENDING,
+            payload__otp=True,
+        ).first()
+        if pending is not None:
+            return pending
+
+        payload = {"phone": phone_number, "otp": True}
+        if expires_in:
+            expires_at = timezone.now() + timedelta(seconds=expires_in)
+            payload["expires_at"] = expires_at.isoformat()
+        return Outbox.enqueue(cls.TOPIC, payload, reference=phone_number)
 
     @classmethod
     def send_sms(cls, phone_number: str, message: str) -> bool:
@@ -24,7 +90,7 @@ class SMSService:
                 },
             }
 
-            response = requests.post(settings.SMS_API_URL, json=payload)
+            response = sms_client.post(settings.SMS_API_URL, json=payload)
 
             if response.status_code == 200:
                 logging.info(f"SMS sent successfully to {phone_number}")
@@ -33,6 +99,10 @@ class SMSService:
                 logging.exception(f"Failed to send SMS: {response.text}")
                 return False
 
+        except CircuitOpenError as e:
+            logging.warning(f"SMS not sent: {str(e)}")
+            return False
+
         except Exception as e:
             logging.exception(f"Exception sending SMS: {str(e)}")
             return False
@@ -0,0 +1,174 @@
+import hashlib
+import logging
+import posixpath
+import time
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+
+@deconstructible(path="common.utils.storage.ContentAddressedStorage")
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Media storage naming files after the SHA-256 of their bytes.
+
+    An upload is stored as ``blobs/<2 hex>/<sha256><ext>`` whatever its
+    name, or points at the blob already holding the same bytes, so
+    identical files uploaded to any field using this storage share one
+    blob. The rows pointing at a blob are its references: a
+    file is only deleted once no file field of any model references it
+    anymore, which lets django-cleanup delete replaced and orphaned files
+    of shared blobs safely.
+
+    Rows only reference a blob once their transaction commits, so an
+    upload handed an existing blob leases it for BLOB_LEASE_TIMEOUT
+    seconds, during which it is never deleted. Deletion takes a lock on
+    the blob that uploads wait for, so that they write the blob again if
+    it was deleted meanwhile. Derived files outside ``blobs/``, such as
+    renditions, belong to no row and are deleted right away.
+    """
+
+    ROOT = "blobs"
+    LEASE_PREFIX = "content_addressed_lease_"
+    LOCK_PREFIX = "content_addressed_lock_"
+    # Seconds between two checks of the lock of a blob being deleted
+    LOCK_POLL_INTERVAL = 0.05
+
+    @classmethod
+    def get_digest(cls, content) -> str:
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def get_blob_name(self, digest: str, name: str) -> str:
+        """Name of the blob of a digest, reusing one of any extension"""
+        directory = posixpath.join(self.ROOT, digest[:2])
+        if self.exists(directory):
+            for filename in self.listdir(directory)[1]:
+                if filename.startswith(digest):
+                    return posixpath.join(directory, filename)
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(directory, f"{digest}{extension}")
+
+    @classmethod
+    def get_lease_key(cls, name: str) -> str:
+        return f"{cls.LEASE_PREFIX}{hashlib.sha256(name.encode()).hexdigest()}"
+
+    @classmethod
+    def get_lock_key(cls, name: str) -> str:
+        return f"{cls.LOCK_PREFIX}{hashlib.sha256(name.encode()).hexdigest()}"
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        blob_name = self.get_blob_name(self.get_digest(content), name)
+        cache.set(
+            self.get_lease_key(blob_name), 1, settings.BLOB_LEASE_TIMEOUT
+        )
+        # A deletion that started before the lease may still remove it
+        while cache.get(self.get_lock_key(blob_name)):
+            time.sleep(self.LOCK_POLL_INTERVAL)
+        if self.exists(blob_name):
+            return blob_name
+        return super().save(blob_name, content, max_length)
+
+    def save_as(self, name, content, max_length=None):
+        """Store a file under its own name, e.g. a derived file"""
+        return super().save(name, content, max_length)
+
+    @classmethod
+    def count_references(cls, name: str) -> int:
+        """Number of rows pointing at a file, in every blob file field"""
+        count = 0
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, models.FileField) and isinstance(
+                    field.storage, cls
+                ):
+                    count += model._base_manager.filter(
+                        **{field.name: name}
+                    ).count()
+        return count
+
+    def delete(self, name):
+        if not name.startswith(f"{self.ROOT}/"):
+            super().delete(name)
+            return
+        lock_key = self.get_lock_key(name)
+        if not cache.add(lock_key, 1, settings.BLOB_DELETE_LOCK_TIMEOUT):
+            logger.info(f"Kept {name}, already being deleted")
+            return
+        try:
+            if cache.get(self.get_lease_key(name)):
+                logger.info(f"Kept {name}, leased to an upload")
+                return
+            references = self.count_references(name)
+            if references:
+                logger.info(f"Kept {name}, still used by {references} rows")
+                return
+            super().delete(name)
+        finally:
+            cache.delete(lock_key)
+
+
+@deconstructible(path="common.utils.storage.PrivateMediaStorage")
+class PrivateMediaStorage(FileSystemStorage):
+    """
+    Storage of personal documents (passport scans, CVs), kept under
+    PRIVATE_MEDIA_ROOT, out of reach of the public media location.
+
+    Their URLs point at the protected media view and carry an HMAC
+    signature expiring after PROTECTED_MEDIA_URL_TTL seconds; the view
+    checks it and leaves the transfer of the file to the front proxy.
+    """
+
+    SALT = "common.utils.storage.PrivateMediaStorage"
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(
+            self._location, settings.PRIVATE_MEDIA_ROOT
+        )
+
+    @cached_property
+    def base_url(self):
+        return self._value_or_setting(
+            self._base_url, settings.PROTECTED_MEDIA_URL
+        )
+
+    @classmethod
+    def sign(cls, name: str, expires: int) -> str:
+        return salted_hmac(
+            cls.SALT, f"{name}:{expires}", algorithm="sha256"
+        ).hexdigest()
+
+    @classmethod
+    def verify(cls, name: str, expires: str, signature: str) -> bool:
+        """Whether a signed URL of a file is genuine and still valid"""
+        try:
+            expires = int(expires)
+        except (TypeError, ValueError):
+            return False
+        return expires >= time.time() and constant_time_compare(
+            signature, cls.sign(name, expires)
+        )
+
+    def url(self, name):
+        expires = int(time.time()) + settings.PROTECTED_MEDIA_URL_TTL
+        query = urlencode(
+            {"expires": expires, "signature": self.sign(name, expires)}
+        )
+        return f"{super().url(name)}?{query}"
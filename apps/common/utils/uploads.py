@@ -0,0 +1,178 @@
+import os
+import zipfile
+from typing import NamedTuple, Optional, Tuple
+
+from common.exceptions import PayloadTooLarge
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from rest_framework.exceptions import ValidationError
+
+# Leading bytes of accepted file types, as (offset, bytes) alternatives.
+# DOCX files are ZIP archives and are recognized as such.
+FILE_SIGNATURES = {
+    "pdf": ((0, b"%PDF-"),),
+    "doc": ((0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"),),
+    "docx": ((0, b"PK\x03\x04"),),
+    "rtf": ((0, b"{\\rtf"),),
+    "jpeg": ((0, b"\xff\xd8\xff"),),
+    "png": ((0, b"\x89PNG\r\n\x1a\n"),),
+    "webp": ((8, b"WEBP"),),
+    "heic": tuple(
+        (4, b"ftyp" + brand)
+        for brand in (b"heic", b"heix", b"hevc", b"heif", b"mif1", b"msf1")
+    ),
+}
+SIGNATURE_LENGTH = 12
+# File name extensions each type may be uploaded with
+EXTENSIONS = {
+    "pdf": ("pdf",),
+    "doc": ("doc",),
+    "docx": ("docx",),
+    "rtf": ("rtf",),
+    "jpeg": ("jpg", "jpeg"),
+    "png": ("png",),
+    "heic": ("heic", "heif"),
+    "webp": ("webp",),
+}
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "doc": "application/msword",
+    "docx": (
+        "application/vnd.openxmlformats-officedocument"
+        ".wordprocessingml.document"
+    ),
+    "rtf": "application/rtf",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "heic": "image/heic",
+    "webp": "image/webp",
+}
+
+
+class UploadRule(NamedTuple):
+    """File types accepted in an upload field, and the setting of its cap"""
+
+    kinds: Tuple[str, ...]
+    max_size_setting: str
+
+    @property
+    def max_size(self) -> int:
+        return getattr(settings, self.max_size_setting)
+
+
+CV_UPLOAD = UploadRule(("pdf", "doc", "docx", "rtf"), "UPLOAD_MAX_CV_SIZE")
+IMAGE_UPLOAD = UploadRule(("jpeg", "png", "heic"), "UPLOAD_MAX_IMAGE_SIZE")
+# Normalized passport scans (see common.utils.scans)
+SCAN_KINDS = ("jpeg", "webp")
+
+
+def is_docx(file) -> bool:
+    """Whether a ZIP archive is a Word document, not any other archive"""
+    try:
+        with zipfile.ZipFile(file) as archive:
+            return "word/document.xml" in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+def detect_file_kind(head: bytes) -> Optional[str]:
+    """Type of a file from its first bytes"""
+    for kind, signatures in FILE_SIGNATURES.items():
+        for offset, signature in signatures:
+            if head[offset : offset + len(signature)] == signature:
+                return kind
+    return None
+
+
+class CappedUploadHandler(FileUploadHandler):
+    """
+    Upload handler streaming files straight to temporary files in
+    UPLOAD_CHUNK_SIZE chunks, whatever their size.
+
+    Only the file fields of ``rules`` are accepted; other files are
+    skipped unread. A body larger than all accepted files together is
+    refused before it is read, the type of a file is checked against its
+    first chunk, and a file is dropped as soon as it outgrows its cap, so
+    an unwanted upload never reaches the disk in full.
+    """
+
+    def __init__(self, request=None, rules=None):
+        super().__init__(request)
+        self.rules = rules or {}
+        self.chunk_size = settings.UPLOAD_CHUNK_SIZE
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        # Room for every accepted file, plus the form fields
+        limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE + sum(
+            rule.max_size for rule in self.rules.values()
+        )
+        if content_length > limit:
+            raise PayloadTooLarge()
+
+    def new_file(self, field_name, file_name, content_type, *args, **kwargs):
+        super().new_file(field_name, file_name, content_type, *args, **kwargs)
+        self.rule = self.rules.get(field_name)
+        if self.rule is None:
+            raise SkipFile()
+        self.kind = None
+        self.file = TemporaryUploadedFile(
+            self.file_name, self.content_type, 0, self.charset
+        )
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0:
+            self.kind = detect_file_kind(raw_data[:SIGNATURE_LENGTH])
+            extension = os.path.splitext(self.file_name)[1][1:].lower()
+            if self.kind not in self.rule.kinds or extension not in (
+                EXTENSIONS[self.kind]
+            ):
+                self.reject()
+
+        if start + len(raw_data) > self.rule.max_size:
+            self.upload_interrupted()
+            raise PayloadTooLarge(
+                {
+                    self.field_name: (
+                        "File is too large. Maximum size is "
+                        f"{self.rule.max_size / 2**20:g} MB"
+                    )
+                }
+            )
+
+        self.file.write(raw_data)
+
+    def reject(self):
+        self.upload_interrupted()
+        raise ValidationError(
+            {
+                self.field_name: (
+                    "Unsupported file type. Allowed types: "
+                    f"{', '.join(self.rule.kinds)}"
+                )
+            }
+        )
+
+    def file_complete(self, file_size):
+        # Any ZIP archive starts like a DOCX file
+        if self.kind == "docx" and not is_docx(self.file):
+            self.reject()
+        # The parser closes the file of any handler still holding one
+        file = self.file
+        del self.file
+        file.seek(0)
+        file.size = file_size
+        return file
+
+    def upload_interrupted(self):
+        if not hasattr(self, "file"):
+            return
+        path = self.file.temporary_file_path()
+        self.file.close()
+        del self.file
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -30,6 +30,14 @@ image_common_extensions = FileExtensionValidator(
     code="WRONG_IMAGE",
 )
 
+cv_extensions = FileExtensionValidator(
+    allowed_extensions=("pdf", "doc", "docx", "rtf"),
+    message=(
+        "Wrong format uploaded file. Format must be: pdf, doc, docx or rtf"
+    ),
+    code="WRONG_FILE",
+)
+
 validate_phone = RegexValidator(
     regex=r"^998\d{9}$",
     message="Phone number must begin with 998 and contain only 12 numbers",
@@ -0,0 +1,356 @@
+from collections import defaultdict
+from operator import itemgetter
+
+from common.serializers import RenditionField
+from common.utils.renditions import ImageRenditions
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import get_language
+from modeltranslation.fields import NONE, TranslationFieldDescriptor
+from modeltranslation.utils import (
+    build_localized_fieldname,
+    fallbacks_enabled,
+    resolution_order,
+)
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+
+# Fields whose representation of a database value is the value itself
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.ReadOnlyField,
+    PrimaryKeyRelatedField,
+)
+
+
+class ValuesNode:
+    """
+    Compiled field mappings of one ModelSerializer over ``values()`` rows.
+
+    Every output field compiles to a binder that, given the per-call state
+    (language, request), returns a ``row -> value`` getter. Lookups of
+    nested nodes are prefixed with the path of their foreign key. The
+    rendition manifests of all rows are fetched at once, into the state.
+    """
+
+    def __init__(self, serializer, model, prefix=""):
+        self.model = model
+        self.prefix = prefix
+        self.columns = []
+        self.binders = []
+        self.children = []
+        self.renditions = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            self.binders.append((name, self.compile_field(field)))
+
+    def add_column(self, lookup):
+        column = self.prefix + lookup
+        if column not in self.columns:
+            self.columns.append(column)
+        return column
+
+    def resolve_source(self, field):
+        """Walk the dotted source across foreign keys to the model field"""
+        model, path = self.model, []
+        for position, attr in enumerate(field.source_attrs):
+            model_field = model._meta.get_field(attr)
+            path.append(attr)
+            if position == len(field.source_attrs) - 1:
+                return model, model_field, "__".join(path)
+            if not model_field.many_to_one or model_field.null:
+                raise ImproperlyConfigured(
+                    f"{field.field_name}: only sources across required "
+                    "foreign keys are supported"
+                )
+            model = model_field.related_model
+
+    def compile_field(self, field):
+        model, model_field, lookup = self.resolve_source(field)
+
+        if isinstance(field, serializers.ListSerializer):
+            return self.compile_many(field, model_field, lookup)
+        if isinstance(field, serializers.ModelSerializer):
+            return self.compile_nested(field, model_field, lookup)
+        if isinstance(field, serializers.FileField):
+            return self.compile_file(field, model, model_field, lookup)
+        if isinstance(field, RenditionField):
+            return self.compile_renditions(model, model_field, lookup)
+        if isinstance(field, IDENTITY_FIELDS):
+            return self.compile_value(model, model_field, lookup)
+        if isinstance(field, serializers.SerializerMethodField):
+            raise ImproperlyConfigured(
+                f"{field.field_name}: method fields are not supported"
+            )
+
+        bind = self.compile_value(model, model_field, lookup)
+        to_representation = field.to_representation
+
+        def bind_converted(state):
+            get = bind(state)
+
+            def converted(row):
+                value = get(row)
+                return None if value is None else to_representation(value)
+
+            return converted
+
+        return bind_converted
+
+    def compile_value(self, model, model_field, lookup):
+        descriptor = getattr(model, model_field.name, None)
+        if not isinstance(descriptor, TranslationFieldDescriptor):
+            column = self.add_column(lookup)
+            return lambda state: itemgetter(column)
+
+        # Mirror TranslationFieldDescriptor.__get__ over localized columns
+        columns = {
+            language: self.add_column(
+                build_localized_fieldname(lookup, language)
+            )
+            for language in settings.MODELTRANSLATION_LANGUAGES
+        }
+        default = model_field.get_default()
+        undefined = descriptor.fallback_undefined
+        if undefined is NONE:
+            undefined = default
+
+        def bind_translated(state):
+            fallback = default
+            if fallbacks_enabled() and descriptor.fallback_value is not NONE:
+                fallback = descriptor.fallback_value
+            ordered = [
+                columns[language]
+                for language in resolution_order(
+                    state["language"], descriptor.fallback_languages
+                )
+                if language in columns
+            ]
+
+            def translated(row):
+                for column in ordered:
+                    value = row[column]
+                    if value is not None and value != undefined:
+                        return value
+                return fallback
+
+            return translated
+
+        return bind_translated
+
+    def compile_file(self, field, model, model_field, lookup):
+        bind = self.compile_value(model, model_field, lookup)
+        storage = model_field.storage
+        use_url = getattr(
+            field, "use_url", api_settings.UPLOADED_FILES_USE_URL
+        )
+
+        def bind_file(state):
+            get = bind(state)
+            request = state["request"]
+
+            def file_url(row):
+                name = get(row)
+                if not name:
+                    return None
+                if not use_url:
+                    return name
+                url = storage.url(name)
+                if request is not None:
+                    return request.build_absolute_uri(url)
+                return url
+
+            return file_url
+
+        return bind_file
+
+    def compile_renditions(self, model, model_field, lookup):
+        bind = self.compile_value(model, model_field, lookup)
+        storage = model_field.storage
+        key = ImageRenditions.get_key(model_field)
+        self.renditions.append((key, storage, bind))
+
+        def bind_renditions(state):
+            get = bind(state)
+            request = state["request"]
+            manifests = state["manifests"]
+
+            def srcset(row):
+                name = get(row)
+                if not name:
+                    return None
+                if (key, name) in manifests:
+                    manifest = manifests[key, name]
+                else:
+                    manifest = ImageRenditions.get_manifest(key, name, storage)
+                return ImageRenditions.build_srcset(manifest, storage, request)
+
+            return srcset
+
+        return bind_renditions
+
+    def compile_nested(self, field, model_field, lookup):
+        if not model_field.many_to_one:
+            raise ImproperlyConfigured(
+                f"{field.field_name}: nested serializers must follow a "
+                "foreign key"
+            )
+        key = self.add_column(lookup)
+        child = ValuesNode(
+            field, model_field.related_model, f"{self.prefix}{lookup}__"
+        )
+        self.columns.extend(
+            column for column in child.columns if column not in self.columns
+        )
+        self.renditions.extend(child.renditions)
+
+        def bind_nested(state):
+            build = child.bind(state)
+
+            def nested(row):
+                if row[key] is None:
+                    return None
+                return build(row)
+
+            return nested
+
+        return bind_nested
+
+    def compile_many(self, field, model_field, lookup):
+        if self.prefix or not model_field.one_to_many:
+            raise ImproperlyConfigured(
+                f"{field.field_name}: many=True is only supported over "
+                "reverse foreign keys of the serialized model"
+            )
+        child = ValuesNode(field.child, model_field.related_model)
+        self.children.append((lookup, model_field, child))
+        pk = self.add_column("pk")
+
+        def bind_many(state):
+            related = state["related"][lookup]
+
+            def many(row):
+                return related.get(row[pk], [])
+
+            return many
+
+        return bind_many
+
+    def bind(self, state):
+        """Return a ``row -> dict`` function for the given state"""
+        getters = [(name, bind(state)) for name, bind in self.binders]
+
+        def build(row):
+            return {name: get(row) for name, get in getters}
+
+        return build
+
+    def fetch_manifests(self, rows, state):
+        """Fetch the rendition manifests of the rows in one cache lookup"""
+        images = []
+        for key, storage, bind in self.renditions:
+            get = bind(state)
+            images.extend(
+                (key, name, storage) for name in map(get, rows) if name
+            )
+        if images:
+            state["manifests"].update(ImageRenditions.get_manifests(images))
+
+    def fetch_related(self, rows, state):
+        """Load reverse foreign key children of the rows, one query each"""
+        related = {}
+        if not self.children:
+            return related
+
+        ids = [row["pk"] for row in rows]
+        for lookup, model_field, child in self.children:
+            fk = model_field.field
+            child_rows = list(
+                model_field.related_model._default_manager.filter(
+                    **{f"{fk.name}__in": ids}
+                ).values(fk.attname, *child.columns)
+            )
+            child.fetch_manifests(child_rows, state)
+            build = child.bind(state)
+            grouped = defaultdict(list)
+            for child_row in child_rows:
+                grouped[child_row[fk.attname]].append(build(child_row))
+            related[lookup] = grouped
+        return related
+
+
+class ValuesSerializer:
+    """
+    Fast read-only list path for a ModelSerializer.
+
+    Rows are fetched with ``queryset.values()`` and turned into dicts with
+    field mappings compiled once from ``serializer_class``, so the output
+    is identical to the serializer while skipping model instantiation and
+    the per-row DRF field machinery. The ``fields``, ``omit`` and
+    ``expand`` arguments of DynamicFieldsMixin are passed on to
+    ``serializer_class``.
+    """
+
+    serializer_class = None
+    # Always selected so paginators can build cursors from rows
+    key_columns = ("id", "created_time")
+    # Compiled nodes kept per fieldset
+    max_nodes = 64
+
+    _nodes = None
+
+    def __init__(self, context=None, **fieldset):
+        self.context = context or {}
+        self.fieldset = fieldset
+
+    @classmethod
+    def get_node(cls, **fieldset):
+        """
+        Compile the serializer once per fieldset, given as the
+        ``fields``, ``omit`` and ``expand`` arguments of DynamicFieldsMixin
+        """
+        if cls.__dict__.get("_nodes") is None:
+            cls._nodes = {}
+
+        key = tuple(
+            (param, tuple(names)) for param, names in sorted(fieldset.items())
+        )
+        node = cls._nodes.get(key)
+        if node is None:
+            serializer = cls.serializer_class(context={}, **fieldset)
+            node = ValuesNode(serializer, serializer.Meta.model)
+            if len(cls._nodes) >= cls.max_nodes:
+                cls._nodes.clear()
+            cls._nodes[key] = node
+        return node
+
+    def get_queryset(self, queryset):
+        """Turn a model queryset into the values queryset to serialize"""
+        node = self.get_node(**self.fieldset)
+        model_fields = {field.name for field in node.model._meta.fields}
+        columns = [
+            column for column in self.key_columns if column in model_fields
+        ]
+        return queryset.values(
+            *columns,
+            *(column for column in node.columns if column not in columns),
+        )
+
+    def serialize(self, rows):
+        rows = list(rows)
+        node = self.get_node(**self.fieldset)
+        state = {
+            "language": get_language(),
+            "request": self.context.get("request"),
+            "manifests": {},
+        }
+        node.fetch_manifests(rows, state)
+        state["related"] = node.fetch_related(rows, state)
+        build = node.bind(state)
+        return [build(row) for row in rows]
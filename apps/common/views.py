@@ -1,29 +1,167 @@
-from common.models import Page, Setting
+import logging
+import posixpath
+
+from common.mixins import ConditionalGetMixin
+from common.models import OutboxMessage, Page, Setting, SocialMedia
 from common.serializers import (
     PageDetailSerializer,
     PageListSerializer,
     SettingSerializer,
 )
+from common.utils.circuit_breaker import CircuitBreaker
 from common.utils.custom_response_decorator import custom_response
+from common.utils.http import bitrix24_client, sms_client
+from common.utils.storage import PrivateMediaStorage
+from common.utils.uploads import (
+    CONTENT_TYPES,
+    CV_UPLOAD,
+    IMAGE_UPLOAD,
+    SCAN_KINDS,
+    SIGNATURE_LENGTH,
+    detect_file_kind,
+)
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db.models import Count
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.encoding import iri_to_uri
+from django.utils.http import content_disposition_header
+from django.views import View
 from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
 
 
 @custom_response
-class SettingRetrieveAPIView(RetrieveAPIView):
+class SettingRetrieveAPIView(ConditionalGetMixin, RetrieveAPIView):
     serializer_class = SettingSerializer
+    conditional_models = (Setting, SocialMedia)
 
     def get_object(self):
         return Setting.objects.first()
 
 
 @custom_response
-class PageListAPIView(ListAPIView):
+class PageListAPIView(ConditionalGetMixin, ListAPIView):
     queryset = Page.objects.all()
     serializer_class = PageListSerializer
 
 
 @custom_response
-class PageDetailAPIView(RetrieveAPIView):
+class PageDetailAPIView(ConditionalGetMixin, RetrieveAPIView):
     queryset = Page.objects.all()
     serializer_class = PageDetailSerializer
     lookup_field = "slug"
+
+
+@custom_response
+class HealthAPIView(APIView):
+    """Circuit breaker state of the integrations and outbox backlog"""
+
+    permission_classes = [AllowAny]
+    clients = (bitrix24_client, sms_client)
+
+    def get(self, request, *args, **kwargs):
+        integrations = {
+            client.name: client.circuit.get_state() for client in self.clients
+        }
+        outbox = dict.fromkeys(
+            (OutboxMessage.PENDING, OutboxMessage.PROCESSING), 0
+        )
+        outbox.update(
+            OutboxMessage.objects.exclude(status=OutboxMessage.DONE)
+            .values_list("status")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+
+        degraded = any(
+            integration["state"] != CircuitBreaker.CLOSED
+            for integration in integrations.values()
+        )
+        return Response(
+            {
+                "status": "degraded" if degraded else "ok",
+                "integrations": integrations,
+                "outbox": outbox,
+            }
+        )
+
+
+class ProtectedMediaView(View):
+    """
+    Private media behind signed URLs. The signature is checked here and
+    the file itself is sent by the front proxy (X-Accel-Redirect or
+    X-Sendfile), so a download never occupies a worker; without a proxy,
+    the WSGI server sends it through its file wrapper.
+
+    Files are uploaded by the public, so they are always downloaded as
+    attachments, sandboxed, and typed from their content among the types
+    their field accepts, never from their name.
+    """
+
+    storage = PrivateMediaStorage()
+    # Upload directories of the private fields and the types they hold
+    kinds = {
+        "passport_scans/normalized/": SCAN_KINDS,
+        "passport_scans/": IMAGE_UPLOAD.kinds,
+        "vacancy/applications/": CV_UPLOAD.kinds,
+        "corporate/cv/": CV_UPLOAD.kinds,
+    }
+
+    def get(self, request, name):
+        if not self.storage.verify(
+            name,
+            request.GET.get("expires"),
+            request.GET.get("signature", ""),
+        ):
+            raise Http404()
+        try:
+            path = self.storage.path(name)
+        except SuspiciousFileOperation:
+            raise Http404()
+        if not self.storage.exists(name):
+            raise Http404()
+
+        content_type = self.get_content_type(name)
+        server = settings.PROTECTED_MEDIA_SERVER
+        if server == "x-accel-redirect":
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = iri_to_uri(
+                settings.PROTECTED_MEDIA_INTERNAL_URL + name
+            )
+        elif server == "x-sendfile":
+            response = HttpResponse(content_type=content_type)
+            response["X-Sendfile"] = path
+        else:
+            if not settings.DEBUG:
+                logger.warning(
+                    "Streaming a private file from the worker; set "
+                    "PROTECTED_MEDIA_SERVER to leave it to the proxy"
+                )
+            response = FileResponse(
+                open(path, "rb"), content_type=content_type
+            )
+        response["Content-Disposition"] = content_disposition_header(
+            True, posixpath.basename(name)
+        )
+        response["Content-Security-Policy"] = "sandbox; default-src 'none'"
+        response["X-Content-Type-Options"] = "nosniff"
+        response["Cache-Control"] = "private, no-store"
+        return response
+
+    def get_content_type(self, name):
+        """Type sniffed from the first bytes, if the field accepts it"""
+        for prefix, kinds in self.kinds.items():
+            if name.startswith(prefix):
+                break
+        else:
+            kinds = ()
+        with self.storage.open(name) as file:
+            kind = detect_file_kind(file.read(SIGNATURE_LENGTH))
+        if kind not in kinds:
+            return "application/octet-stream"
+        return CONTENT_TYPES[kind]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 16:07
+
+import common.utils.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("corporations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="applycorporaterequest",
+            name="cv",
+            field=models.FileField(
+                storage=common.utils.storage.PrivateMediaStorage(),
+                upload_to="corporate/cv/",
+                verbose_name="Резюме (CV)",
+            ),
+        ),
+    ]
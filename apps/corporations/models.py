@@ -1,4 +1,6 @@
 from common.models import BaseModel
+from common.utils.storage import PrivateMediaStorage
+from common.validators import cv_extensions
 from django.db import models
 
 
@@ -36,7 +38,12 @@ class ApplyCorporateRequest(BaseModel):
     last_name = models.CharField("Фамилия", max_length=100)
     phone_number = models.CharField("Телефон", max_length=20)
     email_address = models.EmailField("Email")
-    cv = models.FileField("Резюме (CV)", upload_to="corporate/cv/")
+    cv = models.FileField(
+        "Резюме (CV)",
+        upload_to="corporate/cv/",
+        storage=PrivateMediaStorage(),
+        validators=[cv_extensions],
+    )
     message = models.TextField("Сообщение", blank=True)
     company = models.ForeignKey(
         "Corporate",
@@ -1,15 +1,18 @@
+from common.serializers import DynamicFieldsMixin
 from rest_framework import serializers
 
 from .models import ApplyCorporateRequest, Corporate, CorporateFeature
 
 
-class CorporateFeatureSerializer(serializers.ModelSerializer):
+class CorporateFeatureSerializer(
+    DynamicFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = CorporateFeature
         fields = ("id", "name")
 
 
-class CorporateListSerializer(serializers.ModelSerializer):
+class CorporateListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     features = CorporateFeatureSerializer(many=True)
 
     class Meta:
@@ -1,7 +1,14 @@
+from common.mixins import (
+    ConditionalGetMixin,
+    IdempotencyMixin,
+    SparseFieldsetMixin,
+    UploadLimitsMixin,
+)
 from common.utils.custom_response_decorator import custom_response
+from common.utils.uploads import CV_UPLOAD
 from rest_framework.generics import CreateAPIView, ListAPIView
 
-from .models import ApplyCorporateRequest, Corporate
+from .models import ApplyCorporateRequest, Corporate, CorporateFeature
 from .serializers import (
     ApplyCorporateRequestSerializer,
     CorporateListSerializer,
@@ -9,12 +16,16 @@ from .serializers import (
 
 
 @custom_response
-class CorporateListView(ListAPIView):
+class CorporateListView(ConditionalGetMixin, SparseFieldsetMixin, ListAPIView):
     queryset = Corporate.objects.prefetch_related("features").all()
+    conditional_models = (Corporate, CorporateFeature)
     serializer_class = CorporateListSerializer
 
 
 @custom_response
-class ApplyCorporateRequestCreateView(CreateAPIView):
+class ApplyCorporateRequestCreateView(
+    UploadLimitsMixin, IdempotencyMixin, CreateAPIView
+):
     queryset = ApplyCorporateRequest.objects.all()
     serializer_class = ApplyCorporateRequestSerializer
+    upload_rules = {"cv": CV_UPLOAD}
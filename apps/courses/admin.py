@@ -131,9 +131,10 @@ class CourseRegistrationAdmin(admin.ModelAdmin):
         "phone",
         "email",
         "course",
+        "bitrix_status",
         "created_time",
     )
-    list_filter = ("course", "created_time")
+    list_filter = ("course", "bitrix_status", "created_time")
     search_fields = (
         "last_name",
         "first_name",
@@ -141,7 +142,14 @@ class CourseRegistrationAdmin(admin.ModelAdmin):
         "phone",
         "email",
     )
-    readonly_fields = ("created_time",)
+    readonly_fields = (
+        "created_time",
+        "bitrix_status",
+        "bitrix_contact_id",
+        "bitrix_deal_id",
+        "bitrix_synced_time",
+        "bitrix_error",
+    )
 
     fieldsets = (
         (
@@ -160,6 +168,17 @@ class CourseRegistrationAdmin(admin.ModelAdmin):
                 )
             },
         ),
+        (
+            "Bitrix24",
+            {
+                "fields": (
+                    "bitrix_status",
+                    ("bitrix_contact_id", "bitrix_deal_id"),
+                    "bitrix_synced_time",
+                    "bitrix_error",
+                ),
+            },
+        ),
         (
             "Информация о создании",
             {
@@ -6,4 +6,4 @@ class CoursesConfig(AppConfig):
     name = "courses"
 
     def ready(self):
-        pass
+        from courses import outbox, signals  # noqa: F401
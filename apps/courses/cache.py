@@ -0,0 +1,99 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+
+
+class CourseResponseCache:
+    """
+    Response cache for CourseViewSet list and retrieve actions.
+
+    Entries are namespaced by generation tokens: one shared by all list
+    entries and one per course slug for detail entries. Invalidation swaps
+    the token, so only the affected namespace is dropped and stale entries
+    simply expire.
+    """
+
+    KEY_PREFIX = "courses:response"
+    QUERY_PARAMS = (
+        "category",
+        "level",
+        "featured",
+        "is_new",
+        "page",
+        "fields",
+        "omit",
+        "expand",
+    )
+    FLAG_PARAMS = ("featured", "is_new")
+
+    @classmethod
+    def _generation_key(cls, action: str, slug: str = "") -> str:
+        return f"{cls.KEY_PREFIX}:generation:{action}:{slug}"
+
+    @classmethod
+    def _generation(cls, action: str, slug: str = "") -> str:
+        key = cls._generation_key(action, slug)
+        generation = cache.get(key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            # Keep a token set concurrently by another worker
+            if not cache.add(key, generation, None):
+                generation = cache.get(key, generation)
+        return generation
+
+    @classmethod
+    def normalize_params(cls, query_params) -> str:
+        """Build a canonical representation of the supported query params"""
+        params = []
+        for name in cls.QUERY_PARAMS:
+            value = (query_params.get(name) or "").strip()
+            if name in cls.FLAG_PARAMS:
+                # The viewset only filters on an explicit "true"
+                value = "true" if value.lower() == "true" else ""
+            if value:
+                params.append(f"{name}={value}")
+        return "&".join(params)
+
+    @classmethod
+    def build_key(cls, request, action: str, slug: str = "") -> str:
+        """Build the cache key for an action, slug, language and params"""
+        # Media fields are serialized as absolute URLs, so the host matters
+        variant = "|".join(
+            (
+                slug,
+                translation.get_language() or settings.LANGUAGE_CODE,
+                request.get_host(),
+                cls.normalize_params(request.query_params),
+            )
+        )
+        digest = hashlib.md5(variant.encode()).hexdigest()
+        generation = cls._generation(action, slug)
+        return f"{cls.KEY_PREFIX}:{action}:{generation}:{digest}"
+
+    @classmethod
+    def get(cls, key: str):
+        return cache.get(key)
+
+    @classmethod
+    def set(cls, key: str, data) -> None:
+        cache.set(key, data, settings.COURSE_CACHE_TIMEOUT)
+
+    @classmethod
+    def invalidate_list(cls) -> None:
+        """Drop every cached course list page"""
+        cache.set(cls._generation_key("list"), uuid.uuid4().hex, None)
+
+    @classmethod
+    def invalidate_details(cls, slugs) -> None:
+        """Drop cached course detail payloads for the given slugs"""
+        cache.set_many(
+            {
+                cls._generation_key("retrieve", slug): uuid.uuid4().hex
+                for slug in set(slugs)
+                if slug
+            },
+            None,
+        )
@@ -0,0 +1,104 @@
+import json
+from typing import Any, Dict, Iterable, Optional
+
+from courses.models import (
+    Course,
+    CourseCompany,
+    CourseDocument,
+    CourseMentor,
+)
+from courses.related import RelatedCourseIndex
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch, QuerySet
+from django.utils import translation
+
+
+class CourseDocumentService:
+    """
+    Store of pre-rendered CourseDetailSerializer payloads,
+    one document per course per language.
+    """
+
+    LANGUAGES = settings.MODELTRANSLATION_LANGUAGES
+
+    @classmethod
+    def detail_queryset(cls) -> QuerySet:
+        """Queryset with everything CourseDetailSerializer reads"""
+        return Course.objects.select_related("category").prefetch_related(
+            "outcomes",
+            Prefetch(
+                "course_mentors",
+                queryset=CourseMentor.objects.select_related("mentor"),
+                to_attr="prefetched_mentors",
+            ),
+            Prefetch(
+                "course_companies",
+                queryset=CourseCompany.objects.select_related("company"),
+                to_attr="prefetched_companies",
+            ),
+            "testimonials__company",
+        )
+
+    @classmethod
+    def get_document(
+        cls, slug: str, language: str
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch a stored document with a single indexed lookup"""
+        content = (
+            CourseDocument.objects.filter(slug=slug, language=language)
+            .values_list("content", flat=True)
+            .first()
+        )
+        if content is None:
+            return None
+        return json.loads(content)
+
+    @classmethod
+    def render(cls, course: Course, language: str) -> str:
+        """
+        Render the detail payload of a course for the given language.
+
+        Documents are rendered without a request, so media URLs are stored
+        relative to MEDIA_URL and made absolute when served.
+        """
+        from courses.serializers import CourseDetailSerializer
+
+        related_courses = RelatedCourseIndex.related_courses(course)
+        with translation.override(language):
+            serializer = CourseDetailSerializer(
+                course,
+                context={"related_courses": {course.id: related_courses}},
+            )
+            return json.dumps(serializer.data, ensure_ascii=False)
+
+    @classmethod
+    def rebuild(cls, course_ids: Iterable[int]) -> int:
+        """Re-render the documents of the given courses in every language"""
+        courses = list(cls.detail_queryset().filter(id__in=set(course_ids)))
+        documents = [
+            CourseDocument(
+                course=course,
+                slug=course.slug,
+                language=language,
+                content=cls.render(course, language),
+            )
+            for course in courses
+            for language in cls.LANGUAGES
+        ]
+
+        with transaction.atomic():
+            CourseDocument.objects.filter(course__in=courses).delete()
+            CourseDocument.objects.bulk_create(documents)
+        return len(documents)
+
+    @classmethod
+    def rebuild_all(cls, batch_size: int = 100) -> int:
+        """Regenerate the whole document store"""
+        course_ids = list(Course.objects.values_list("id", flat=True))
+        CourseDocument.objects.exclude(course_id__in=course_ids).delete()
+
+        total = 0
+        for start in range(0, len(course_ids), batch_size):
+            total += cls.rebuild(course_ids[start : start + batch_size])
+        return total
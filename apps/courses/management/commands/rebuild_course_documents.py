@@ -0,0 +1,29 @@
+from courses.cache import CourseResponseCache
+from courses.documents import CourseDocumentService
+from courses.models import Course
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Regenerate pre-rendered course detail documents"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of courses rendered per batch",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding course documents...")
+
+        total = CourseDocumentService.rebuild_all(options["batch_size"])
+        # Cached detail responses may have been built from stale documents
+        CourseResponseCache.invalidate_details(
+            Course.objects.values_list("slug", flat=True)
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {total} course documents!")
+        )
@@ -0,0 +1,17 @@
+from courses.related import RelatedCourseIndex
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Rebuild the related courses index"
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding related courses index...")
+
+        changed = RelatedCourseIndex.rebuild_all()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Related courses updated for {changed} courses!"
+            )
+        )
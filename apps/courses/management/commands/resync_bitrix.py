@@ -0,0 +1,237 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from common.models import OutboxMessage
+from common.utils.bitrix24 import Bitrix24Integration
+from courses.models import CourseRegistration
+from courses.outbox import REGISTRATION_SYNC_TOPIC
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Send course registrations that never reached Bitrix24 again: "
+        "failed ones, and pending ones the outbox no longer delivers"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of registrations synced concurrently",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=2.0,
+            help="Maximum number of registrations synced per second",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Number of rows fetched from the database at a time",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=60,
+            help="Resend pending registrations older than this many minutes",
+        )
+        parser.add_argument(
+            "--include-unknown",
+            action="store_true",
+            help="Also resend registrations made before sync tracking",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of registrations synced",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the registrations without syncing them",
+        )
+
+    def get_queryset(self, options):
+        statuses = [CourseRegistration.BITRIX_FAILED]
+        if options["include_unknown"]:
+            statuses.append(CourseRegistration.BITRIX_UNKNOWN)
+        stale_before = timezone.now() - timedelta(minutes=options["min_age"])
+        queryset = CourseRegistration.objects.filter(
+            bitrix_status__in=statuses
+        ) | CourseRegistration.objects.filter(
+            bitrix_status=CourseRegistration.BITRIX_PENDING,
+            created_time__lt=stale_before,
+        )
+        queryset = queryset.select_related("course").order_by("pk")
+        if options["limit"]:
+            queryset = queryset[: options["limit"]]
+        return queryset
+
+    def is_queued(self, registration):
+        """Whether the outbox still has a delivery of the registration"""
+        return OutboxMessage.objects.filter(
+            topic=REGISTRATION_SYNC_TOPIC,
+            reference=str(registration.guid),
+            status__in=[OutboxMessage.PENDING, OutboxMessage.PROCESSING],
+        ).exists()
+
+    def lease(self, registration):
+        """
+        Lease the outbox messages of a registration for its sync, as the
+        worker does, so that no worker delivers them meanwhile. Returns
+        their former status by ID, or None while a worker delivers one.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            messages = list(
+                OutboxMessage.objects.select_for_update()
+                .filter(
+                    topic=REGISTRATION_SYNC_TOPIC,
+                    reference=str(registration.guid),
+                    status__in=[
+                        OutboxMessage.PENDING,
+                        OutboxMessage.PROCESSING,
+                        OutboxMessage.FAILED,
+                    ],
+                )
+                .values_list("id", "status", "available_at")
+            )
+            # An expired lease is one whose worker died
+            if any(
+                status == OutboxMessage.PROCESSING and available_at > now
+                for _, status, available_at in messages
+            ):
+                return None
+            statuses = {pk: status for pk, status, _ in messages}
+            OutboxMessage.objects.filter(id__in=statuses).update(
+                status=OutboxMessage.PROCESSING,
+                available_at=now + timedelta(seconds=settings.OUTBOX_LEASE),
+                updated_time=now,
+            )
+        return statuses
+
+    def release(self, statuses, result=None):
+        """
+        Mark leased messages delivered with the result of a successful
+        sync, or give them back to the outbox
+        """
+        now = timezone.now()
+        if result is not None:
+            # The outbox must not create a second deal
+            OutboxMessage.objects.filter(id__in=statuses).update(
+                status=OutboxMessage.DONE,
+                result=result["data"],
+                updated_time=now,
+            )
+            return
+        for pk, status in statuses.items():
+            if status == OutboxMessage.PROCESSING:
+                status = OutboxMessage.PENDING
+            OutboxMessage.objects.filter(id=pk).update(
+                status=status, available_at=now, updated_time=now
+            )
+
+    def wait_turn(self):
+        """Space the syncs of all workers at least 1 / rate seconds apart"""
+        with self.rate_lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def sync(self, registration):
+        try:
+            if (
+                registration.bitrix_status == CourseRegistration.BITRIX_PENDING
+                and self.is_queued(registration)
+            ):
+                return None
+
+            statuses = self.lease(registration)
+            if statuses is None:
+                return None
+
+            result = None
+            try:
+                self.wait_turn()
+                result = Bitrix24Integration.process_registration(
+                    registration, contact_id=registration.bitrix_contact_id
+                )
+                registration.set_bitrix_result(result)
+            finally:
+                delivered = result is not None and result["success"]
+                self.release(statuses, result if delivered else None)
+
+            if not result["success"]:
+                self.stderr.write(
+                    f"Registration {registration.guid}: "
+                    f"{registration.bitrix_error}"
+                )
+            return result["success"]
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        queryset = self.get_queryset(options)
+
+        if options["dry_run"]:
+            count = 0
+            for registration in queryset.iterator(options["chunk_size"]):
+                self.stdout.write(
+                    f"{registration.guid} {registration.bitrix_status} "
+                    f"{registration.bitrix_error}"
+                )
+                count += 1
+            self.stdout.write(
+                self.style.SUCCESS(f"{count} registrations to resync")
+            )
+            return
+
+        self.interval = 1 / options["rate"] if options["rate"] > 0 else 0
+        self.next_start = time.monotonic()
+        self.rate_lock = threading.Lock()
+
+        # Bound the futures in flight, so rows are read as fast as they
+        # are synced rather than all at once
+        slots = threading.BoundedSemaphore(options["workers"] * 2)
+        counts = {True: 0, False: 0, None: 0}
+        counts_lock = threading.Lock()
+
+        def done(future):
+            outcome = future.exception() is None and future.result()
+            if future.exception() is not None:
+                self.stderr.write(f"Sync crashed: {future.exception()}")
+            with counts_lock:
+                counts[outcome] += 1
+            slots.release()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            # Rows are streamed with a server-side cursor where supported
+            for registration in queryset.iterator(options["chunk_size"]):
+                slots.acquire()
+                pool.submit(self.sync, registration).add_done_callback(done)
+        elapsed = time.perf_counter() - started
+
+        processed = counts[True] + counts[False]
+        self.stdout.write(
+            f"Synced {counts[True]}, failed {counts[False]}, "
+            f"skipped {counts[None]} queued in the outbox"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {processed} registrations in {elapsed:.1f}s "
+                f"({processed / elapsed if elapsed else 0:.1f}/s)"
+            )
+        )
@@ -0,0 +1,74 @@
+# Generated by Django 5.2 on 2026-10-18 15:17
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0011_company_link"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "guid",
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        unique=True,
+                    ),
+                ),
+                ("created_time", models.DateTimeField(auto_now_add=True)),
+                ("updated_time", models.DateTimeField(auto_now=True)),
+                (
+                    "slug",
+                    models.SlugField(max_length=255, verbose_name="Slug"),
+                ),
+                (
+                    "language",
+                    models.CharField(
+                        choices=[
+                            ("uz", "Uzbek"),
+                            ("ru", "Russian"),
+                            ("en", "English"),
+                        ],
+                        max_length=10,
+                        verbose_name="Язык",
+                    ),
+                ),
+                ("content", models.TextField(verbose_name="Содержимое")),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="documents",
+                        to="courses.course",
+                        verbose_name="Курс",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Документ курса",
+                "verbose_name_plural": "Документы курсов",
+                "unique_together": {
+                    ("course", "language"),
+                    ("slug", "language"),
+                },
+            },
+        ),
+    ]
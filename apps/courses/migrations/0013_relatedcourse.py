@@ -0,0 +1,65 @@
+# Generated by Django 5.2 on 2026-10-18 15:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0012_coursedocument"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedCourse",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "position",
+                    models.PositiveSmallIntegerField(verbose_name="Позиция"),
+                ),
+                (
+                    "score",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Оценка"
+                    ),
+                ),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_links",
+                        to="courses.course",
+                        verbose_name="Курс",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_for",
+                        to="courses.course",
+                        verbose_name="Связанный курс",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Связанный курс",
+                "verbose_name_plural": "Связанные курсы",
+                "ordering": ["position"],
+                "unique_together": {
+                    ("course", "position"),
+                    ("course", "related"),
+                },
+            },
+        ),
+    ]
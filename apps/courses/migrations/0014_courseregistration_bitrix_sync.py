@@ -0,0 +1,72 @@
+# Generated by Django 5.2 on 2026-10-18 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0013_relatedcourse"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="courseregistration",
+            name="bitrix_contact_id",
+            field=models.PositiveBigIntegerField(
+                blank=True, null=True, verbose_name="ID контакта в Bitrix24"
+            ),
+        ),
+        migrations.AddField(
+            model_name="courseregistration",
+            name="bitrix_deal_id",
+            field=models.PositiveBigIntegerField(
+                blank=True, null=True, verbose_name="ID сделки в Bitrix24"
+            ),
+        ),
+        migrations.AddField(
+            model_name="courseregistration",
+            name="bitrix_error",
+            field=models.TextField(blank=True, verbose_name="Ошибка Bitrix24"),
+        ),
+        # Registrations made so far were sent inline, with no record
+        migrations.AddField(
+            model_name="courseregistration",
+            name="bitrix_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Ожидает отправки"),
+                    ("synced", "Отправлено"),
+                    ("failed", "Ошибка"),
+                    ("unknown", "Неизвестно"),
+                ],
+                db_index=True,
+                default="unknown",
+                max_length=10,
+                verbose_name="Статус в Bitrix24",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="courseregistration",
+            name="bitrix_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Ожидает отправки"),
+                    ("synced", "Отправлено"),
+                    ("failed", "Ошибка"),
+                    ("unknown", "Неизвестно"),
+                ],
+                db_index=True,
+                default="pending",
+                max_length=10,
+                verbose_name="Статус в Bitrix24",
+            ),
+        ),
+        migrations.AddField(
+            model_name="courseregistration",
+            name="bitrix_synced_time",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Отправлено в Bitrix24"
+            ),
+        ),
+    ]
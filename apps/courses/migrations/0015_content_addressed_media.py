@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-18 16:04
+
+import common.utils.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0014_courseregistration_bitrix_sync"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="company",
+            name="logo",
+            field=models.ImageField(
+                storage=common.utils.storage.ContentAddressedStorage(),
+                upload_to="companies/",
+                verbose_name="Логотип",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="companystudent",
+            name="logo",
+            field=models.ImageField(
+                storage=common.utils.storage.ContentAddressedStorage(),
+                upload_to="company_logos/",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="mentor",
+            name="photo",
+            field=models.ImageField(
+                storage=common.utils.storage.ContentAddressedStorage(),
+                upload_to="mentors/",
+                verbose_name="Фото",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="testimonial",
+            name="avatar",
+            field=models.ImageField(
+                storage=common.utils.storage.ContentAddressedStorage(),
+                upload_to="testimonials/",
+                verbose_name="Аватар",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-18 16:07
+
+import common.utils.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0015_content_addressed_media"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="courseregistration",
+            name="passport_image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=common.utils.storage.PrivateMediaStorage(),
+                upload_to="passport_scans/",
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=(
+                            "jpeg",
+                            "jpg",
+                            "png",
+                            "heic",
+                            "heif",
+                        ),
+                        code="WRONG_IMAGE",
+                        message="Wrong format uploaded image. Format must be: jpeg, jpg, png, heic or heif",
+                    )
+                ],
+                verbose_name="Скан паспорта",
+            ),
+        ),
+    ]
@@ -1,19 +1,56 @@
+from django.http import Http404
 from rest_framework.reverse import reverse
 
 
-class SafeExtraActionViewSetMixin:
+class RequestObjectMixin:
+    """
+    Request-scoped identity map for ``get_object``.
+
+    The object is looked up once per request; later calls from actions,
+    the extra action URL map and serializers (through ``context["view"]``)
+    reuse the same instance. ``object_lookups`` counts the database
+    lookups actually made.
+    """
+
+    object_lookups = 0
+
+    def get_object(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        key = self.kwargs.get(lookup_url_kwarg)
+
+        objects = self.__dict__.setdefault("_request_objects", {})
+        if key not in objects:
+            self.object_lookups += 1
+            try:
+                objects[key] = super().get_object()
+            except Http404 as exc:
+                # A missing object is not looked up again either
+                objects[key] = exc
+
+        obj = objects[key]
+        if isinstance(obj, Http404):
+            raise obj
+        return obj
+
+
+class SafeExtraActionViewSetMixin(RequestObjectMixin):
     def get_extra_action_url_map(self):
 
         action_urls = {}
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg not in self.kwargs:
+            return action_urls
+
+        try:
+            lookup_value = getattr(self.get_object(), self.lookup_field)
+        except Exception:
+            return action_urls
+
         for action in self.get_extra_actions():
             try:
                 url = reverse(
                     f"{self.basename}-{action.__name__}",
-                    kwargs={
-                        self.lookup_field: getattr(
-                            self.get_object(), self.lookup_field
-                        )
-                    },
+                    kwargs={self.lookup_field: lookup_value},
                     request=self.request,
                 )
                 action_urls[action.__name__] = url
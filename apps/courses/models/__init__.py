@@ -1,5 +1,6 @@
 from .companies import Company, CompanyStudent, CourseCompany
-from .courses import Course, CourseCategory, CourseOutcome
+from .courses import Course, CourseCategory, CourseOutcome, RelatedCourse
+from .documents import CourseDocument
 from .mentors import CourseMentor, Mentor
 from .registrations import ContactRequest, CourseRegistration
 from .testimonials import Testimonial
@@ -8,6 +9,8 @@ __all__ = [
     "CourseCategory",
     "Course",
     "CourseOutcome",
+    "CourseDocument",
+    "RelatedCourse",
     "Mentor",
     "CourseMentor",
     "Company",
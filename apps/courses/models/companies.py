@@ -1,16 +1,23 @@
 from common.models import BaseModel
+from common.utils.storage import ContentAddressedStorage
 from django.db import models
 from django.utils.translation import gettext_lazy as _
+from django_cleanup import cleanup
 
 from .courses import Course
 
 
+@cleanup.select
 class Company(BaseModel):
     """Model for companies that offer courses to their employees"""
 
     name = models.CharField(_("Название"), max_length=255)
     description = models.TextField(null=True, blank=True)
-    logo = models.ImageField(_("Логотип"), upload_to="companies/")
+    logo = models.ImageField(
+        _("Логотип"),
+        upload_to="companies/",
+        storage=ContentAddressedStorage(),
+    )
     color = models.CharField(
         _("Цвет"), max_length=20, blank=True, help_text="HEX код цвета"
     )
@@ -28,9 +35,12 @@ class Company(BaseModel):
         return self.name
 
 
+@cleanup.select
 class CompanyStudent(BaseModel):
     company_name = models.CharField(max_length=255, unique=True)
-    logo = models.ImageField(upload_to="company_logos/")
+    logo = models.ImageField(
+        upload_to="company_logos/", storage=ContentAddressedStorage()
+    )
 
     class Meta:
         verbose_name = "Компания студента"
@@ -100,3 +100,31 @@ class CourseOutcome(BaseModel):
 
     def __str__(self):
         return f"{self.course.title} - Outcome {self.order}"
+
+
+class RelatedCourse(models.Model):
+    """Precomputed, ranked related courses of a course"""
+
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="related_links",
+        verbose_name=_("Курс"),
+    )
+    related = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="related_for",
+        verbose_name=_("Связанный курс"),
+    )
+    position = models.PositiveSmallIntegerField(_("Позиция"))
+    score = models.PositiveIntegerField(_("Оценка"), default=0)
+
+    class Meta:
+        verbose_name = _("Связанный курс")
+        verbose_name_plural = _("Связанные курсы")
+        ordering = ["position"]
+        unique_together = (("course", "position"), ("course", "related"))
+
+    def __str__(self):
+        return f"{self.course_id} -> {self.related_id} ({self.position})"
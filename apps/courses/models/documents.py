@@ -0,0 +1,31 @@
+from common.models import BaseModel
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .courses import Course
+
+
+class CourseDocument(BaseModel):
+    """Pre-rendered course detail payload for a single language"""
+
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="documents",
+        verbose_name=_("Курс"),
+    )
+    slug = models.SlugField(_("Slug"), max_length=255)
+    language = models.CharField(
+        _("Язык"), max_length=10, choices=settings.LANGUAGES
+    )
+    # Serialized JSON text: jsonb would not keep the serializer key order
+    content = models.TextField(_("Содержимое"))
+
+    class Meta:
+        verbose_name = _("Документ курса")
+        verbose_name_plural = _("Документы курсов")
+        unique_together = (("course", "language"), ("slug", "language"))
+
+    def __str__(self):
+        return f"{self.slug} ({self.language})"
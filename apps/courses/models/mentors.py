@@ -1,17 +1,22 @@
 from common.models import BaseModel
+from common.utils.storage import ContentAddressedStorage
 from django.db import models
 from django.utils.translation import gettext_lazy as _
+from django_cleanup import cleanup
 
 from .courses import Course
 
 
+@cleanup.select
 class Mentor(BaseModel):
     """Model for course mentors"""
 
     name = models.CharField(_("Имя"), max_length=255)
     position = models.CharField(_("Должность"), max_length=255)
     bio = models.TextField(_("Биография"), blank=True)
-    photo = models.ImageField(_("Фото"), upload_to="mentors/")
+    photo = models.ImageField(
+        _("Фото"), upload_to="mentors/", storage=ContentAddressedStorage()
+    )
 
     class Meta:
         verbose_name = _("Ментор")
@@ -1,4 +1,5 @@
 from common.models import BaseModel
+from common.utils.storage import PrivateMediaStorage
 from common.validators import (
     image_common_extensions,
     validate_passport_number,
@@ -8,6 +9,7 @@ from common.validators import (
     validate_telegram_username,
 )
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from .courses import Course
@@ -16,6 +18,18 @@ from .courses import Course
 class CourseRegistration(BaseModel):
     """Model for course registrations"""
 
+    BITRIX_PENDING = "pending"
+    BITRIX_SYNCED = "synced"
+    BITRIX_FAILED = "failed"
+    # Registrations made before the sync was tracked
+    BITRIX_UNKNOWN = "unknown"
+    BITRIX_STATUS_CHOICES = (
+        (BITRIX_PENDING, _("Ожидает отправки")),
+        (BITRIX_SYNCED, _("Отправлено")),
+        (BITRIX_FAILED, _("Ошибка")),
+        (BITRIX_UNKNOWN, _("Неизвестно")),
+    )
+
     course = models.ForeignKey(
         Course,
         on_delete=models.CASCADE,
@@ -44,6 +58,7 @@ class CourseRegistration(BaseModel):
     passport_image = models.ImageField(
         _("Скан паспорта"),
         upload_to="passport_scans/",
+        storage=PrivateMediaStorage(),
         blank=True,
         null=True,
         validators=[image_common_extensions],
@@ -69,6 +84,25 @@ class CourseRegistration(BaseModel):
         validators=[validate_telegram_username],
     )
 
+    # Bitrix24 sync
+    bitrix_status = models.CharField(
+        _("Статус в Bitrix24"),
+        max_length=10,
+        choices=BITRIX_STATUS_CHOICES,
+        default=BITRIX_PENDING,
+        db_index=True,
+    )
+    bitrix_contact_id = models.PositiveBigIntegerField(
+        _("ID контакта в Bitrix24"), null=True, blank=True
+    )
+    bitrix_deal_id = models.PositiveBigIntegerField(
+        _("ID сделки в Bitrix24"), null=True, blank=True
+    )
+    bitrix_synced_time = models.DateTimeField(
+        _("Отправлено в Bitrix24"), null=True, blank=True
+    )
+    bitrix_error = models.TextField(_("Ошибка Bitrix24"), blank=True)
+
     class Meta:
         verbose_name = _("Регистрация на курс")
         verbose_name_plural = _("Регистрации на курсы")
@@ -77,6 +111,36 @@ class CourseRegistration(BaseModel):
     def __str__(self):
         return f"{self.last_name} {self.first_name} - {self.course.title}"
 
+    def set_bitrix_result(self, result, final: bool = True):
+        """
+        Record the outcome of a Bitrix24 sync attempt; a failure is only
+        marked failed when no retry follows
+        """
+        data = result["data"]
+        self.bitrix_contact_id = data.get("contact_id", self.bitrix_contact_id)
+        if result["success"]:
+            self.bitrix_status = self.BITRIX_SYNCED
+            self.bitrix_deal_id = data["deal_id"]
+            self.bitrix_synced_time = timezone.now()
+            self.bitrix_error = ""
+        else:
+            self.bitrix_status = (
+                self.BITRIX_FAILED if final else self.BITRIX_PENDING
+            )
+            self.bitrix_error = "; ".join(
+                error["message"] for error in result["errors"]
+            )
+        self.save(
+            update_fields=[
+                "bitrix_status",
+                "bitrix_contact_id",
+                "bitrix_deal_id",
+                "bitrix_synced_time",
+                "bitrix_error",
+                "updated_time",
+            ]
+        )
+
 
 class ContactRequest(BaseModel):
     """Model for contact requests"""
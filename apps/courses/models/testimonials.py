@@ -1,11 +1,14 @@
 from common.models import BaseModel
+from common.utils.storage import ContentAddressedStorage
 from django.db import models
 from django.utils.translation import gettext_lazy as _
+from django_cleanup import cleanup
 
 from .companies import Company
 from .courses import Course
 
 
+@cleanup.select
 class Testimonial(BaseModel):
     """Model for testimonials"""
 
@@ -17,7 +20,11 @@ class Testimonial(BaseModel):
         related_name="testimonials",
         verbose_name=_("Компания"),
     )
-    avatar = models.ImageField(_("Аватар"), upload_to="testimonials/")
+    avatar = models.ImageField(
+        _("Аватар"),
+        upload_to="testimonials/",
+        storage=ContentAddressedStorage(),
+    )
     text = models.TextField(_("Текст отзыва"))
     course = models.ForeignKey(
         Course,
@@ -47,6 +47,20 @@ error_response_schema = openapi.Schema(
 )
 
 
+# Image variants by format, null until built (see RenditionField)
+srcset_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    nullable=True,
+    additional_properties=openapi.Schema(type=openapi.TYPE_STRING),
+    example={
+        "webp": (
+            "https://example.com/media/renditions/courses.course.icon/"
+            "a.png/64w.webp 64w"
+        )
+    },
+)
+
+
 # Course schemas
 course_list_schema = openapi.Schema(
     type=openapi.TYPE_OBJECT,
@@ -56,6 +70,7 @@ course_list_schema = openapi.Schema(
         "slug": openapi.Schema(type=openapi.TYPE_STRING),
         "description": openapi.Schema(type=openapi.TYPE_STRING),
         "icon": openapi.Schema(type=openapi.TYPE_STRING, nullable=True),
+        "icon_srcset": srcset_schema,
         "icon_type": openapi.Schema(type=openapi.TYPE_STRING),
         "level": openapi.Schema(type=openapi.TYPE_STRING),
         "duration": openapi.Schema(type=openapi.TYPE_STRING),
@@ -106,6 +121,42 @@ course_category_list_response = openapi.Schema(
     },
 )
 
+course_category_detail_response = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "success": openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
+        "errors": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(type=openapi.TYPE_OBJECT),
+            default=[],
+        ),
+        "data": openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                "name": openapi.Schema(type=openapi.TYPE_STRING),
+                "slug": openapi.Schema(type=openapi.TYPE_STRING),
+                "courses": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=course_list_schema,
+                ),
+                "courses_pagination": openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "count": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "next": openapi.Schema(
+                            type=openapi.TYPE_STRING, nullable=True
+                        ),
+                        "previous": openapi.Schema(
+                            type=openapi.TYPE_STRING, nullable=True
+                        ),
+                    },
+                ),
+            },
+        ),
+    },
+)
+
 
 course_outcome_schema = openapi.Schema(
     type=openapi.TYPE_OBJECT,
@@ -124,6 +175,7 @@ mentor_schema = openapi.Schema(
         "position": openapi.Schema(type=openapi.TYPE_STRING),
         "bio": openapi.Schema(type=openapi.TYPE_STRING),
         "photo": openapi.Schema(type=openapi.TYPE_STRING),
+        "photo_srcset": srcset_schema,
     },
 )
 
@@ -133,6 +185,7 @@ company_schema = openapi.Schema(
         "id": openapi.Schema(type=openapi.TYPE_INTEGER),
         "name": openapi.Schema(type=openapi.TYPE_STRING),
         "logo": openapi.Schema(type=openapi.TYPE_STRING),
+        "logo_srcset": srcset_schema,
         "color": openapi.Schema(type=openapi.TYPE_STRING),
     },
 )
@@ -146,8 +199,10 @@ testimonial_schema = openapi.Schema(
         "company": openapi.Schema(type=openapi.TYPE_INTEGER),
         "company_name": openapi.Schema(type=openapi.TYPE_STRING),
         "company_logo": openapi.Schema(type=openapi.TYPE_STRING),
+        "company_logo_srcset": srcset_schema,
         "company_color": openapi.Schema(type=openapi.TYPE_STRING),
         "avatar": openapi.Schema(type=openapi.TYPE_STRING),
+        "avatar_srcset": srcset_schema,
         "text": openapi.Schema(type=openapi.TYPE_STRING),
     },
 )
@@ -160,6 +215,7 @@ course_detail_schema = openapi.Schema(
         "slug": openapi.Schema(type=openapi.TYPE_STRING),
         "description": openapi.Schema(type=openapi.TYPE_STRING),
         "icon": openapi.Schema(type=openapi.TYPE_STRING, nullable=True),
+        "icon_srcset": srcset_schema,
         "icon_type": openapi.Schema(type=openapi.TYPE_STRING),
         "level": openapi.Schema(type=openapi.TYPE_STRING),
         "duration": openapi.Schema(type=openapi.TYPE_STRING),
@@ -389,6 +445,40 @@ course_registration_request = openapi.Schema(
     ],
 )
 
+idempotency_key_param = openapi.Parameter(
+    "Idempotency-Key",
+    openapi.IN_HEADER,
+    description=(
+        "Unique key of the request, e.g. a UUID. A retry with the same key "
+        "and payload returns the original response without creating "
+        "anything again."
+    ),
+    type=openapi.TYPE_STRING,
+    required=False,
+)
+
+registration_sync_status = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    description="Bitrix24 sync state, updated by the outbox worker",
+    properties={
+        "guid": openapi.Schema(
+            type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+        ),
+        "status": openapi.Schema(
+            type=openapi.TYPE_STRING,
+            enum=["pending", "processing", "done", "failed"],
+        ),
+        "attempts": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "contact_id": openapi.Schema(
+            type=openapi.TYPE_INTEGER, x_nullable=True
+        ),
+        "deal_id": openapi.Schema(type=openapi.TYPE_INTEGER, x_nullable=True),
+        "status_url": openapi.Schema(
+            type=openapi.TYPE_STRING, format=openapi.FORMAT_URI
+        ),
+    },
+)
+
 course_registration_response = openapi.Schema(
     type=openapi.TYPE_OBJECT,
     properties={
@@ -401,17 +491,36 @@ course_registration_response = openapi.Schema(
         "data": openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
-                "id": openapi.Schema(type=openapi.TYPE_INTEGER),
-                "course": openapi.Schema(type=openapi.TYPE_INTEGER),
-                "name": openapi.Schema(type=openapi.TYPE_STRING),
-                "phone": openapi.Schema(type=openapi.TYPE_STRING),
-                "email": openapi.Schema(type=openapi.TYPE_STRING),
-                "message": openapi.Schema(type=openapi.TYPE_STRING),
+                "registration": openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "course": openapi.Schema(type=openapi.TYPE_INTEGER),
+                        "name": openapi.Schema(type=openapi.TYPE_STRING),
+                        "phone": openapi.Schema(type=openapi.TYPE_STRING),
+                        "email": openapi.Schema(type=openapi.TYPE_STRING),
+                        "message": openapi.Schema(type=openapi.TYPE_STRING),
+                    },
+                ),
+                "bitrix": registration_sync_status,
             },
         ),
     },
 )
 
+registration_status_response = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "success": openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
+        "errors": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(type=openapi.TYPE_OBJECT),
+            default=[],
+        ),
+        "data": registration_sync_status,
+    },
+)
+
 contact_request_schema = openapi.Schema(
     type=openapi.TYPE_OBJECT,
     properties={
@@ -464,9 +573,46 @@ course_category_list_schema = swagger_auto_schema(
 course_category_retrieve_schema = swagger_auto_schema(
     operation_description="Get details of a specific course category",
     operation_summary="Retrieve course category",
+    manual_parameters=[
+        openapi.Parameter(
+            "level",
+            openapi.IN_QUERY,
+            description="Filter courses by level",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "featured",
+            openapi.IN_QUERY,
+            description="Filter courses by featured status (true/false)",
+            type=openapi.TYPE_BOOLEAN,
+            required=False,
+        ),
+        openapi.Parameter(
+            "is_new",
+            openapi.IN_QUERY,
+            description="Filter courses by new status (true/false)",
+            type=openapi.TYPE_BOOLEAN,
+            required=False,
+        ),
+        openapi.Parameter(
+            "page",
+            openapi.IN_QUERY,
+            description="Page of the nested course list",
+            type=openapi.TYPE_INTEGER,
+            required=False,
+        ),
+        openapi.Parameter(
+            "page_size",
+            openapi.IN_QUERY,
+            description="Number of nested courses per page",
+            type=openapi.TYPE_INTEGER,
+            required=False,
+        ),
+    ],
     responses={
         200: openapi.Response(
-            "Successful response", course_category_list_response
+            "Successful response", course_category_detail_response
         ),
         404: openapi.Response("Category not found", error_response_schema),
         500: openapi.Response("Server error", error_response_schema),
@@ -561,6 +707,83 @@ course_related_schema = swagger_auto_schema(
     tags=["Courses"],
 )
 
+course_page_response = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "success": openapi.Schema(type=openapi.TYPE_BOOLEAN, default=True),
+        "errors": openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(type=openapi.TYPE_OBJECT),
+            default=[],
+        ),
+        "data": openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "course": course_detail_schema,
+                "mentors": openapi.Schema(
+                    type=openapi.TYPE_ARRAY, items=mentor_schema
+                ),
+                "testimonials": openapi.Schema(
+                    type=openapi.TYPE_ARRAY, items=testimonial_schema
+                ),
+                "related": openapi.Schema(
+                    type=openapi.TYPE_ARRAY, items=course_list_schema
+                ),
+            },
+        ),
+    },
+)
+
+course_page_schema = swagger_auto_schema(
+    operation_description=(
+        "Get a course page in a single request: the course and any of "
+        "its mentors, testimonials and related courses"
+    ),
+    operation_summary="Course page",
+    manual_parameters=[
+        openapi.Parameter(
+            "include",
+            openapi.IN_QUERY,
+            description=(
+                "Comma separated sections: mentors, testimonials, related"
+            ),
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "fields",
+            openapi.IN_QUERY,
+            description=(
+                "Comma separated course fields. Use fields[mentors], "
+                "fields[testimonials] and fields[related] for the sections"
+            ),
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "omit",
+            openapi.IN_QUERY,
+            description="Comma separated course fields to leave out",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+        openapi.Parameter(
+            "expand",
+            openapi.IN_QUERY,
+            description="Comma separated course relations to expand: category",
+            type=openapi.TYPE_STRING,
+            required=False,
+        ),
+    ],
+    responses={
+        200: openapi.Response("Successful response", course_page_response),
+        400: openapi.Response("Bad request", error_response_schema),
+        404: openapi.Response("Course not found", error_response_schema),
+        500: openapi.Response("Server error", error_response_schema),
+    },
+    tags=["Courses"],
+)
+
 mentor_list_schema = swagger_auto_schema(
     operation_description="Get a list of all mentors",
     operation_summary="List mentors",
@@ -644,25 +867,55 @@ course_registration_schema = swagger_auto_schema(
     operation_description="Register for a course",
     operation_summary="Course registration",
     request_body=course_registration_request,
+    manual_parameters=[idempotency_key_param],
     responses={
         201: openapi.Response(
             "Registration successful", course_registration_response
         ),
         400: openapi.Response("Invalid data", error_response_schema),
+        409: openapi.Response(
+            "Request with this key in progress", error_response_schema
+        ),
+        413: openapi.Response(
+            "Passport scan too large", error_response_schema
+        ),
+        422: openapi.Response(
+            "Key used with a different request", error_response_schema
+        ),
         500: openapi.Response("Server error", error_response_schema),
     },
     tags=["Registration"],
 )
 
+registration_status_schema = swagger_auto_schema(
+    operation_description=(
+        "Bitrix24 sync status of a registration. The registration is "
+        "sent to Bitrix24 in the background and retried on failure."
+    ),
+    operation_summary="Registration sync status",
+    responses={
+        200: openapi.Response("Sync status", registration_status_response),
+        404: openapi.Response("Registration not found", error_response_schema),
+    },
+    tags=["Registration"],
+)
+
 contact_request_schema_decorator = swagger_auto_schema(
     operation_description="Submit a contact request",
     operation_summary="Contact request",
     request_body=contact_request_schema,
+    manual_parameters=[idempotency_key_param],
     responses={
         201: openapi.Response(
             "Contact request submitted", contact_response_schema
         ),
         400: openapi.Response("Invalid data", error_response_schema),
+        409: openapi.Response(
+            "Request with this key in progress", error_response_schema
+        ),
+        422: openapi.Response(
+            "Key used with a different request", error_response_schema
+        ),
         500: openapi.Response("Server error", error_response_schema),
     },
     tags=["Contact"],
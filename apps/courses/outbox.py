@@ -0,0 +1,61 @@
+from common.utils.bitrix24 import Bitrix24Integration
+from common.utils.http import bitrix24_client
+from common.utils.outbox import Outbox
+from courses.models import CourseRegistration
+from django.conf import settings
+
+REGISTRATION_SYNC_TOPIC = "bitrix24.registration"
+
+
+class RegistrationSyncError(Exception):
+    pass
+
+
+@Outbox.handler(
+    REGISTRATION_SYNC_TOPIC, batch_size=50, circuit=bitrix24_client.circuit
+)
+def sync_registrations(messages):
+    """Create the Bitrix24 contacts and deals of course registrations"""
+    registrations = CourseRegistration.objects.select_related(
+        "course"
+    ).in_bulk([message.payload["registration_id"] for message in messages])
+    contact_ids = {
+        pk: registration.bitrix_contact_id
+        for pk, registration in registrations.items()
+    }
+    for message in messages:
+        if message.result.get("contact_id"):
+            pk = message.payload["registration_id"]
+            contact_ids[pk] = message.result["contact_id"]
+    results = Bitrix24Integration.process_registrations(
+        registrations.values(), contact_ids
+    )
+
+    errors = []
+    for message in messages:
+        pk = message.payload["registration_id"]
+        if pk not in results:
+            errors.append(RegistrationSyncError("Registration not found"))
+            continue
+
+        result = results[pk]
+        registration = registrations[pk]
+        registration.set_bitrix_result(
+            result, final=message.attempts >= settings.OUTBOX_MAX_ATTEMPTS
+        )
+
+        # A contact created before the deal failed is kept, so the retry
+        # only creates the deal
+        for key in ("contact_id", "deal_id"):
+            if key in result["data"]:
+                message.result[key] = result["data"][key]
+
+        if result["success"]:
+            errors.append(None)
+        else:
+            errors.append(
+                RegistrationSyncError(
+                    "; ".join(error["message"] for error in result["errors"])
+                )
+            )
+    return errors
@@ -0,0 +1,131 @@
+from collections import defaultdict
+from typing import Iterable, List, Set
+
+from courses.models import Course, CourseCompany, CourseMentor, RelatedCourse
+from django.conf import settings
+from django.db import transaction
+from django.utils import translation
+
+
+class RelatedCourseIndex:
+    """
+    Maintained index of related courses.
+
+    Candidates share the course category and are ranked by matching level,
+    then by the number of shared mentors and companies, newest first on
+    ties. The index is rebuilt per category on course writes and read with
+    a single join.
+    """
+
+    LIMIT = 3
+    LEVEL_WEIGHT = 4
+    MENTOR_WEIGHT = 2
+    COMPANY_WEIGHT = 1
+
+    @classmethod
+    def related_courses(cls, course) -> List[Course]:
+        """Return the indexed related courses of a course"""
+        return list(
+            Course.objects.filter(related_for__course=course)
+            .select_related("category")
+            .order_by("related_for__position")
+        )
+
+    @classmethod
+    def _rank(cls, courses, mentors, companies):
+        entries = {}
+        for course in courses:
+            candidates = []
+            for other in courses:
+                if other["id"] == course["id"]:
+                    continue
+                score = (
+                    cls.LEVEL_WEIGHT * (other["level"] == course["level"])
+                    + cls.MENTOR_WEIGHT
+                    * len(mentors[course["id"]] & mentors[other["id"]])
+                    + cls.COMPANY_WEIGHT
+                    * len(companies[course["id"]] & companies[other["id"]])
+                )
+                candidates.append((score, other["created_time"], other["id"]))
+            candidates.sort(reverse=True)
+            entries[course["id"]] = [
+                (related_id, score)
+                for score, _, related_id in candidates[: cls.LIMIT]
+            ]
+        return entries
+
+    @classmethod
+    def rebuild(cls, category_ids: Iterable[int]) -> Set[int]:
+        """
+        Rebuild the index of the given categories.
+
+        Returns the ids of the courses whose related list changed.
+        """
+        category_ids = set(category_ids) - {None}
+        if not category_ids:
+            return set()
+
+        # Compare levels in a single language, regardless of the request
+        with translation.override(settings.MODELTRANSLATION_DEFAULT_LANGUAGE):
+            courses = list(
+                Course.objects.filter(category_id__in=category_ids).values(
+                    "id", "category_id", "level", "created_time"
+                )
+            )
+        course_ids = [course["id"] for course in courses]
+
+        mentors = defaultdict(set)
+        for course_id, mentor_id in CourseMentor.objects.filter(
+            course_id__in=course_ids
+        ).values_list("course_id", "mentor_id"):
+            mentors[course_id].add(mentor_id)
+
+        companies = defaultdict(set)
+        for course_id, company_id in CourseCompany.objects.filter(
+            course_id__in=course_ids
+        ).values_list("course_id", "company_id"):
+            companies[course_id].add(company_id)
+
+        by_category = defaultdict(list)
+        for course in courses:
+            by_category[course["category_id"]].append(course)
+
+        entries = {}
+        for category_courses in by_category.values():
+            entries.update(cls._rank(category_courses, mentors, companies))
+
+        current = defaultdict(list)
+        for course_id, related_id in RelatedCourse.objects.filter(
+            course_id__in=course_ids
+        ).values_list("course_id", "related_id"):
+            current[course_id].append(related_id)
+
+        changed = {
+            course_id
+            for course_id, related in entries.items()
+            if [related_id for related_id, _ in related] != current[course_id]
+        }
+
+        with transaction.atomic():
+            RelatedCourse.objects.filter(course_id__in=changed).delete()
+            RelatedCourse.objects.bulk_create(
+                RelatedCourse(
+                    course_id=course_id,
+                    related_id=related_id,
+                    position=position,
+                    score=score,
+                )
+                for course_id in changed
+                for position, (related_id, score) in enumerate(
+                    entries[course_id]
+                )
+            )
+        return changed
+
+    @classmethod
+    def rebuild_all(cls) -> int:
+        """Rebuild the index of every category"""
+        category_ids = set(
+            Course.objects.values_list("category_id", flat=True)
+        )
+        return len(cls.rebuild(category_ids))
@@ -4,24 +4,29 @@ from .courses import (
     CourseCategorySerializer,
     CourseDetailSerializer,
     CourseListSerializer,
+    CourseListValuesSerializer,
     CourseOutcomeSerializer,
+    CoursePageSerializer,
 )
 from .mentors import MentorSerializer
 from .registrations import (
     ContactRequestSerializer,
     CourseRegistrationSerializer,
 )
-from .testimonials import TestimonialSerializer
+from .testimonials import TestimonialSerializer, TestimonialValuesSerializer
 
 __all__ = [
     "CourseCategorySerializer",
     "CourseListSerializer",
+    "CourseListValuesSerializer",
     "CourseDetailSerializer",
+    "CoursePageSerializer",
     "CourseOutcomeSerializer",
     "MentorSerializer",
     "CompanySerializer",
     "CompanyStudentSerializer",
     "TestimonialSerializer",
+    "TestimonialValuesSerializer",
     "CourseRegistrationSerializer",
     "ContactRequestSerializer",
     "CourseCategoryDetailSerializer",
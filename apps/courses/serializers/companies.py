@@ -1,14 +1,35 @@
+from common.serializers import (
+    DynamicFieldsMixin,
+    RenditionField,
+    RenditionListSerializer,
+)
 from courses.models import Company, CompanyStudent
 from rest_framework import serializers
 
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    logo_srcset = RenditionField(source="logo")
+
     class Meta:
         model = Company
-        fields = ["id", "name", "description", "logo", "color", "link"]
+        list_serializer_class = RenditionListSerializer
+        fields = [
+            "id",
+            "name",
+            "description",
+            "logo",
+            "logo_srcset",
+            "color",
+            "link",
+        ]
+
 
+class CompanyStudentSerializer(
+    DynamicFieldsMixin, serializers.ModelSerializer
+):
+    logo_srcset = RenditionField(source="logo")
 
-class CompanyStudentSerializer(serializers.ModelSerializer):
     class Meta:
         model = CompanyStudent
-        fields = ["id", "company_name", "logo"]
+        list_serializer_class = RenditionListSerializer
+        fields = ["id", "company_name", "logo", "logo_srcset"]
@@ -1,32 +1,44 @@
+from common.pagination import CoursePagination
+from common.serializers import (
+    DynamicFieldsMixin,
+    RenditionField,
+    RenditionListSerializer,
+)
+from common.values_serializers import ValuesSerializer
 from courses.models import Course, CourseCategory, CourseOutcome
 from rest_framework import serializers
 
 
-class CourseCategorySerializer(serializers.ModelSerializer):
+class CourseCategorySerializer(
+    DynamicFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = CourseCategory
         fields = ["id", "name", "slug"]
 
 
-class CourseOutcomeSerializer(serializers.ModelSerializer):
+class CourseOutcomeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CourseOutcome
         fields = ["id", "text", "order"]
 
 
-class CourseListSerializer(serializers.ModelSerializer):
+class CourseListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(
         source="category.name", read_only=True
     )
+    icon_srcset = RenditionField(source="icon")
 
     class Meta:
         model = Course
+        list_serializer_class = RenditionListSerializer
         fields = [
             "id",
             "title",
             "slug",
             "description",
             "icon",
+            "icon_srcset",
             "icon_type",
             "level",
             "duration",
@@ -35,23 +47,43 @@ class CourseListSerializer(serializers.ModelSerializer):
             "category",
             "category_name",
         ]
+        expandable_fields = {"category": CourseCategorySerializer}
         extra_kwargs = {
             "url": {"view_name": "course-detail", "lookup_field": "slug"}
         }
 
 
-class CourseCategoryDetailSerializer(serializers.ModelSerializer):
-    courses = CourseListSerializer(many=True, read_only=True)
+class CourseListValuesSerializer(ValuesSerializer):
+    serializer_class = CourseListSerializer
+
+
+class CourseCategoryDetailSerializer(
+    DynamicFieldsMixin, serializers.ModelSerializer
+):
+    courses = serializers.SerializerMethodField()
 
     class Meta:
         model = CourseCategory
         fields = ["id", "name", "slug", "courses"]
+        source_fields = {"courses": []}
+
+    def get_courses(self, obj):
+        # The view passes the paginated page; never serialize the whole set
+        courses = self.context.get("courses")
+        if courses is None:
+            courses = obj.courses.select_related("category")[
+                : CoursePagination.page_size
+            ]
+        return CourseListSerializer(
+            courses, many=True, context=self.context
+        ).data
 
 
-class CourseDetailSerializer(serializers.ModelSerializer):
+class CourseDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(
         source="category.name", read_only=True
     )
+    icon_srcset = RenditionField(source="icon")
     outcomes = CourseOutcomeSerializer(many=True, read_only=True)
 
     # Optimized fields for related objects
@@ -62,12 +94,14 @@ class CourseDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Course
+        list_serializer_class = RenditionListSerializer
         fields = [
             "id",
             "title",
             "slug",
             "description",
             "icon",
+            "icon_srcset",
             "icon_type",
             "level",
             "duration",
@@ -86,6 +120,14 @@ class CourseDetailSerializer(serializers.ModelSerializer):
             "testimonials",
             "related_courses",
         ]
+        expandable_fields = {"category": CourseCategorySerializer}
+        # Related rows are looked up by primary key only
+        source_fields = {
+            "mentors": [],
+            "companies": [],
+            "testimonials": [],
+            "related_courses": [],
+        }
 
     def get_mentors(self, obj):
         from courses.serializers.mentors import MentorSerializer
@@ -117,7 +159,21 @@ class CourseDetailSerializer(serializers.ModelSerializer):
             return CourseListSerializer(related_courses, many=True).data
 
         # Fallback if related courses were not prefetched
-        related = Course.objects.filter(category=obj.category).exclude(
-            id=obj.id
-        )[:3]
+        from courses.related import RelatedCourseIndex
+
+        related = RelatedCourseIndex.related_courses(obj)
         return CourseListSerializer(related, many=True).data
+
+
+class CoursePageSerializer(CourseDetailSerializer):
+    """
+    Course section of the composite course page. Mentors, testimonials
+    and related courses are separate sections of the page.
+    """
+
+    class Meta(CourseDetailSerializer.Meta):
+        fields = [
+            field
+            for field in CourseDetailSerializer.Meta.fields
+            if field not in ("mentors", "testimonials", "related_courses")
+        ]
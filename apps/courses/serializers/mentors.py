@@ -1,8 +1,16 @@
+from common.serializers import (
+    DynamicFieldsMixin,
+    RenditionField,
+    RenditionListSerializer,
+)
 from courses.models import Mentor
 from rest_framework import serializers
 
 
-class MentorSerializer(serializers.ModelSerializer):
+class MentorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    photo_srcset = RenditionField(source="photo")
+
     class Meta:
         model = Mentor
-        fields = ["id", "name", "position", "bio", "photo"]
+        list_serializer_class = RenditionListSerializer
+        fields = ["id", "name", "position", "bio", "photo", "photo_srcset"]
@@ -1,18 +1,28 @@
+from common.serializers import (
+    DynamicFieldsMixin,
+    RenditionField,
+    RenditionListSerializer,
+)
+from common.values_serializers import ValuesSerializer
 from courses.models import Testimonial
+from courses.serializers.companies import CompanySerializer
 from rest_framework import serializers
 
 
-class TestimonialSerializer(serializers.ModelSerializer):
+class TestimonialSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    avatar_srcset = RenditionField(source="avatar")
     company_name = serializers.CharField(source="company.name", read_only=True)
     company_logo = serializers.ImageField(
         source="company.logo", read_only=True
     )
+    company_logo_srcset = RenditionField(source="company.logo")
     company_color = serializers.CharField(
         source="company.color", read_only=True
     )
 
     class Meta:
         model = Testimonial
+        list_serializer_class = RenditionListSerializer
         fields = [
             "id",
             "name",
@@ -20,7 +30,14 @@ class TestimonialSerializer(serializers.ModelSerializer):
             "company",
             "company_name",
             "company_logo",
+            "company_logo_srcset",
             "company_color",
             "avatar",
+            "avatar_srcset",
             "text",
         ]
+        expandable_fields = {"company": CompanySerializer}
+
+
+class TestimonialValuesSerializer(ValuesSerializer):
+    serializer_class = TestimonialSerializer
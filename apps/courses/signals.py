@@ -0,0 +1,179 @@
+import operator
+from functools import reduce
+
+from common.utils.content_version import ContentVersion
+from courses.cache import CourseResponseCache
+from courses.documents import CourseDocumentService
+from courses.models import (
+    Company,
+    Course,
+    CourseCategory,
+    CourseCompany,
+    CourseDocument,
+    CourseMentor,
+    CourseOutcome,
+    Mentor,
+    RelatedCourse,
+    Testimonial,
+)
+from courses.related import RelatedCourseIndex
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+
+def refresh_courses(
+    slugs=(),
+    course_filter=None,
+    invalidate_list=False,
+    reindex_categories=(),
+    reindex_courses=(),
+):
+    """
+    Rebuild the related course index and course documents, then invalidate
+    cached course responses once the transaction commits.
+
+    ``course_filter`` is a Q object resolved at commit time to the courses
+    whose detail payload embeds the changed row. ``reindex_categories`` and
+    the categories of ``reindex_courses`` get their related course index
+    rebuilt, and courses whose related list changed are refreshed as
+    well. Calls made within one
+    transaction (e.g. an admin save with inlines) are merged into a single
+    refresh.
+    """
+    connection = transaction.get_connection()
+    pending = getattr(connection, "pending_course_refresh", None)
+    scheduled = pending is not None and any(
+        func is pending["flush"] for _, func, _ in connection.run_on_commit
+    )
+    if not scheduled:
+        pending = {
+            "slugs": set(),
+            "filters": [],
+            "list": False,
+            "categories": set(),
+            "courses": set(),
+        }
+
+        def flush():
+            connection.pending_course_refresh = None
+            _refresh(pending)
+
+        pending["flush"] = flush
+        connection.pending_course_refresh = pending
+
+    pending["slugs"].update(slug for slug in slugs if slug)
+    if course_filter is not None:
+        pending["filters"].append(course_filter)
+    pending["list"] = pending["list"] or invalidate_list
+    pending["categories"].update(reindex_categories)
+    pending["courses"].update(reindex_courses)
+
+    if not scheduled:
+        transaction.on_commit(pending["flush"])
+
+
+def _refresh(pending):
+    categories = set(pending["categories"])
+    if pending["courses"]:
+        categories.update(
+            Course.objects.filter(id__in=pending["courses"]).values_list(
+                "category_id", flat=True
+            )
+        )
+    filters = list(pending["filters"])
+    reindexed = RelatedCourseIndex.rebuild(categories)
+    if reindexed:
+        filters.append(Q(id__in=reindexed))
+
+    affected = {}
+    if filters:
+        course_filter = reduce(operator.or_, filters)
+        affected = dict(
+            Course.objects.filter(course_filter)
+            .distinct()
+            .values_list("id", "slug")
+        )
+
+    CourseDocumentService.rebuild(affected)
+    # Derived tables are written in bulk, without model signals
+    ContentVersion.touch(CourseDocument, RelatedCourse)
+    if pending["list"]:
+        CourseResponseCache.invalidate_list()
+    CourseResponseCache.invalidate_details(
+        pending["slugs"] | set(affected.values())
+    )
+
+
+@receiver(pre_save, sender=Course)
+@receiver(pre_save, sender=Testimonial)
+def remember_previous_state(sender, instance, **kwargs):
+    """Keep the values that decide which cache entries a write touches"""
+    fields = ("slug", "category_id") if sender is Course else ("course_id",)
+    previous = None
+    if instance.pk:
+        previous = (
+            sender.objects.filter(pk=instance.pk).values(*fields).first()
+        )
+    instance._previous_state = previous or {}
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def course_changed(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_state", {})
+    # Related course sections of the same category embed this course too
+    category_ids = {instance.category_id, previous.get("category_id")}
+    refresh_courses(
+        slugs={instance.slug, previous.get("slug")},
+        course_filter=Q(id=instance.id)
+        | Q(category_id__in=category_ids - {None}),
+        invalidate_list=True,
+        reindex_categories=category_ids,
+    )
+
+
+@receiver(post_save, sender=CourseOutcome)
+@receiver(post_delete, sender=CourseOutcome)
+def course_outcome_changed(sender, instance, **kwargs):
+    refresh_courses(course_filter=Q(id=instance.course_id))
+
+
+@receiver(post_save, sender=CourseMentor)
+@receiver(post_delete, sender=CourseMentor)
+@receiver(post_save, sender=CourseCompany)
+@receiver(post_delete, sender=CourseCompany)
+def course_link_changed(sender, instance, **kwargs):
+    # Shared mentors and companies rank related courses
+    refresh_courses(
+        course_filter=Q(id=instance.course_id),
+        reindex_courses={instance.course_id},
+    )
+
+
+@receiver(post_save, sender=Testimonial)
+@receiver(post_delete, sender=Testimonial)
+def testimonial_changed(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_state", {})
+    course_ids = {instance.course_id, previous.get("course_id")} - {None}
+    if course_ids:
+        refresh_courses(course_filter=Q(id__in=course_ids))
+
+
+@receiver(post_save, sender=CourseCategory)
+def category_changed(sender, instance, **kwargs):
+    refresh_courses(course_filter=Q(category=instance), invalidate_list=True)
+
+
+@receiver(post_save, sender=Mentor)
+def mentor_changed(sender, instance, **kwargs):
+    refresh_courses(course_filter=Q(course_mentors__mentor=instance))
+
+
+@receiver(post_save, sender=Company)
+def company_changed(sender, instance, **kwargs):
+    refresh_courses(
+        course_filter=Q(course_companies__company=instance)
+        | Q(testimonials__company=instance)
+    )
@@ -1 +1,150 @@
-# Create your tests here.
+import datetime
+import threading
+from io import StringIO
+
+from common.models import OutboxMessage
+from common.utils.fake_integrations import FakeIntegrationServer
+from common.utils.outbox import Outbox
+from courses.models import Course, CourseCategory, CourseRegistration
+from courses.outbox import REGISTRATION_SYNC_TOPIC
+from courses.serializers.courses import CourseDetailSerializer
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+
+class DeferredFieldsTests(SimpleTestCase):
+    def test_method_fields_read_declared_sources(self):
+        deferred = CourseDetailSerializer(
+            fields=["id", "title", "mentors"]
+        ).get_deferred_fields()
+
+        self.assertIn("description", deferred)
+        self.assertNotIn("title", deferred)
+
+    def test_undeclared_method_field_defers_nothing(self):
+        serializer = CourseDetailSerializer(fields=["id", "mentors"])
+        serializer.Meta = type(
+            "Meta", (CourseDetailSerializer.Meta,), {"source_fields": {}}
+        )
+
+        self.assertEqual(serializer.get_deferred_fields(), [])
+
+
+class CoursePageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        category = CourseCategory.objects.create(
+            name="Backend", slug="backend"
+        )
+        cls.course = Course.objects.create(
+            title="Python", slug="python", description="", category=category
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_course_is_looked_up_once(self):
+        url = reverse("course-page", kwargs={"slug": self.course.slug})
+        # The browsable API also builds the extra action URL map
+        for accept in ("application/json", "text/html"):
+            with self.subTest(accept=accept):
+                response = APIClient().get(
+                    url,
+                    {"include": "mentors,testimonials,related"},
+                    HTTP_ACCEPT=accept,
+                )
+
+                self.assertEqual(response.status_code, 200)
+                view = response.renderer_context["view"]
+                self.assertEqual(view.action, "page")
+                self.assertEqual(view.object_lookups, 1)
+
+
+class ResyncBitrixTests(TransactionTestCase):
+    """Syncs run in the threads of the command, so rows are committed"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeIntegrationServer(("127.0.0.1", 0))
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.server.requests.clear()
+        settings = override_settings(**self.server.get_settings())
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        category = CourseCategory.objects.create(
+            name="Backend", slug="backend"
+        )
+        course = Course.objects.create(
+            title="Python", slug="python", description="", category=category
+        )
+        self.registration = CourseRegistration.objects.create(
+            course=course,
+            first_name="Ali",
+            last_name="Valiyev",
+            birth_date=datetime.date(2000, 1, 1),
+            passport_series="AA",
+            passport_number="1234567",
+            pinfl="12345678901234",
+            phone="998901234567",
+            email="ali@example.com",
+            bitrix_status=CourseRegistration.BITRIX_FAILED,
+        )
+        self.message = Outbox.enqueue(
+            REGISTRATION_SYNC_TOPIC,
+            {"registration_id": self.registration.pk},
+            reference=str(self.registration.guid),
+        )
+
+    def resync(self):
+        call_command("resync_bitrix", "--rate", "0", stdout=StringIO())
+        self.message.refresh_from_db()
+        self.registration.refresh_from_db()
+
+    def test_message_being_delivered_is_skipped(self):
+        OutboxMessage.objects.filter(pk=self.message.pk).update(
+            status=OutboxMessage.PROCESSING,
+            available_at=timezone.now() + datetime.timedelta(minutes=5),
+        )
+
+        self.resync()
+
+        self.assertEqual(self.server.get_requests(), [])
+        self.assertEqual(self.message.status, OutboxMessage.PROCESSING)
+
+    def test_queued_message_is_delivered_once(self):
+        self.resync()
+
+        self.assertEqual(
+            self.registration.bitrix_status, CourseRegistration.BITRIX_SYNCED
+        )
+        self.assertEqual(self.message.status, OutboxMessage.DONE)
+        self.assertEqual(Outbox.claim(10, [REGISTRATION_SYNC_TOPIC]), [])
+
+    def test_failed_sync_gives_the_message_back(self):
+        self.server.failing_commands.add(f"contact_{self.registration.pk}")
+        self.addCleanup(self.server.failing_commands.clear)
+
+        self.resync()
+
+        self.assertEqual(self.message.status, OutboxMessage.PENDING)
+        self.assertLessEqual(self.message.available_at, timezone.now())
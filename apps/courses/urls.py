@@ -18,7 +18,17 @@ urlpatterns = [
         views.CourseRegistrationBitrixView.as_view(),
         name="course-registration",
     ),
+    path(
+        "register/<uuid:guid>/status/",
+        views.CourseRegistrationStatusView.as_view(),
+        name="course-registration-status",
+    ),
     path("request-otp/", views.RequestOTPView.as_view(), name="request-otp"),
+    path(
+        "request-otp/<uuid:guid>/status/",
+        views.SMSStatusView.as_view(),
+        name="sms-status",
+    ),
     path("verify-otp/", views.VerifyOTPView.as_view(), name="verify-otp"),
     path(
         "contact/",
@@ -4,7 +4,9 @@ from .mentors import MentorViewSet
 from .registrations import (
     ContactRequestCreateView,
     CourseRegistrationBitrixView,
+    CourseRegistrationStatusView,
     RequestOTPView,
+    SMSStatusView,
     VerifyOTPView,
 )
 from .testimonials import TestimonialViewSet
@@ -15,7 +17,9 @@ __all__ = [
     "MentorViewSet",
     "TestimonialViewSet",
     "CourseRegistrationBitrixView",
+    "CourseRegistrationStatusView",
     "RequestOTPView",
+    "SMSStatusView",
     "VerifyOTPView",
     "ContactRequestCreateView",
     "CompanyListView",
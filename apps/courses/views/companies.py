@@ -1,3 +1,4 @@
+from common.mixins import ConditionalGetMixin, SparseFieldsetMixin
 from common.utils.custom_response_decorator import custom_response
 from courses.models import Company
 from courses.serializers import CompanySerializer
@@ -5,6 +6,8 @@ from rest_framework import generics
 
 
 @custom_response
-class CompanyListView(generics.ListAPIView):
+class CompanyListView(
+    ConditionalGetMixin, SparseFieldsetMixin, generics.ListAPIView
+):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
@@ -1,36 +1,84 @@
+from common.mixins import (
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+)
 from common.pagination import CoursePagination
 from common.utils.custom_response_decorator import custom_response
+from common.utils.renditions import ImageRenditions
+from courses.cache import CourseResponseCache
+from courses.documents import CourseDocumentService
 from courses.mixins import SafeExtraActionViewSetMixin
-from courses.models import Course, CourseCategory, CourseCompany, CourseMentor
+from courses.models import (
+    Company,
+    Course,
+    CourseCategory,
+    CourseCompany,
+    CourseDocument,
+    CourseMentor,
+    CourseOutcome,
+    Mentor,
+    RelatedCourse,
+    Testimonial,
+)
 from courses.openapi_schema import (
     course_category_list_schema,
     course_category_retrieve_schema,
     course_list_schema_decorator,
     course_mentors_schema,
+    course_page_schema,
     course_related_schema,
     course_retrieve_schema,
     course_testimonials_schema,
 )
+from courses.related import RelatedCourseIndex
 from courses.serializers import (
     CourseCategoryDetailSerializer,
     CourseCategorySerializer,
     CourseDetailSerializer,
     CourseListSerializer,
+    CourseListValuesSerializer,
+    CoursePageSerializer,
     MentorSerializer,
     TestimonialSerializer,
 )
 from django.db.models import Prefetch
-from rest_framework import viewsets
+from django.utils import translation
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 
+def filter_courses(queryset, query_params):
+    """Apply the level, featured and is_new course filters"""
+    level = query_params.get("level", None)
+    if level:
+        queryset = queryset.filter(level=level)
+
+    featured = query_params.get("featured", None)
+    if featured and featured.lower() == "true":
+        queryset = queryset.filter(featured=True)
+
+    is_new = query_params.get("is_new", None)
+    if is_new and is_new.lower() == "true":
+        queryset = queryset.filter(is_new=True)
+
+    return queryset
+
+
 @custom_response
-class CourseCategoryViewSet(viewsets.ReadOnlyModelViewSet, APIView):
+class CourseCategoryViewSet(
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    viewsets.ReadOnlyModelViewSet,
+    APIView,
+):
     """API endpoint for course categories"""
 
     queryset = CourseCategory.objects.all()
+    conditional_models = (CourseCategory, Course)
     pagination_class = CoursePagination
     lookup_field = "slug"
 
@@ -40,7 +88,31 @@ class CourseCategoryViewSet(viewsets.ReadOnlyModelViewSet, APIView):
 
     @course_category_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        """
+        Category detail with its courses filtered and paginated in SQL,
+        fetched with a single query
+        """
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        if "courses" not in serializer.fields:
+            return Response(serializer.data)
+
+        courses = filter_courses(
+            instance.courses.select_related("category").order_by(
+                "-created_time", "-id"
+            ),
+            request.query_params,
+        )
+        serializer.context["courses"] = self.paginate_queryset(courses)
+        data = serializer.data
+        data["courses_pagination"] = {
+            key: value
+            for key, value in self.paginator.get_paginated_response(
+                None
+            ).data.items()
+            if key != "results"
+        }
+        return Response(data)
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -50,15 +122,37 @@ class CourseCategoryViewSet(viewsets.ReadOnlyModelViewSet, APIView):
 
 @custom_response
 class CourseViewSet(
-    SafeExtraActionViewSetMixin, viewsets.ReadOnlyModelViewSet
+    SafeExtraActionViewSetMixin,
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+    viewsets.ReadOnlyModelViewSet,
 ):
     """API endpoint for courses"""
 
     lookup_field = "slug"
+    conditional_models = (
+        Course,
+        CourseCategory,
+        CourseOutcome,
+        CourseMentor,
+        Mentor,
+        CourseCompany,
+        Company,
+        Testimonial,
+        CourseDocument,
+        RelatedCourse,
+    )
+    values_serializer_class = CourseListValuesSerializer
+
+    page_sections = ("mentors", "testimonials", "related")
+    page_params = ((), {})
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return CourseDetailSerializer
+        if self.action == "page":
+            return CoursePageSerializer
         return CourseListSerializer
 
     def get_queryset(self):
@@ -70,57 +164,69 @@ class CourseViewSet(
 
         # For detailed view, load more related objects
         if self.action == "retrieve":
-            queryset = queryset.prefetch_related(
-                "outcomes",
-                Prefetch(
-                    "course_mentors",
-                    queryset=CourseMentor.objects.select_related("mentor"),
-                    to_attr="prefetched_mentors",
-                ),
-                Prefetch(
-                    "course_companies",
-                    queryset=CourseCompany.objects.select_related("company"),
-                    to_attr="prefetched_companies",
-                ),
-                "testimonials__company",
-            )
+            queryset = CourseDocumentService.detail_queryset()
+        elif self.action == "page":
+            queryset = self.get_page_queryset()
 
         # Filtering
         category_slug = self.request.query_params.get("category", None)
         if category_slug:
             queryset = queryset.filter(category__slug=category_slug)
 
-        level = self.request.query_params.get("level", None)
-        if level:
-            queryset = queryset.filter(level=level)
-
-        featured = self.request.query_params.get("featured", None)
-        if featured and featured.lower() == "true":
-            queryset = queryset.filter(featured=True)
+        return filter_courses(queryset, self.request.query_params)
 
-        is_new = self.request.query_params.get("is_new", None)
-        if is_new and is_new.lower() == "true":
-            queryset = queryset.filter(is_new=True)
+    def cached_response(self, handler, request, *args, **kwargs):
+        """
+        Serve the action payload from CourseResponseCache,
+        falling back to the handler on a miss
+        """
+        key = CourseResponseCache.build_key(
+            request, self.action, kwargs.get(self.lookup_field, "")
+        )
+        data = CourseResponseCache.get(key)
+        if data is not None:
+            return Response(data)
 
-        return queryset
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            CourseResponseCache.set(key, response.data)
+        return response
 
     @course_list_schema_decorator
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return self.cached_response(super().list, request, *args, **kwargs)
 
     @course_retrieve_schema
     def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            self.retrieve_uncached, request, *args, **kwargs
+        )
+
+    def retrieve_uncached(self, request, *args, **kwargs):
         """
-        Override retrieve method to prefetch related courses
+        Serve the pre-rendered course document, falling back to
+        serializing the course with prefetched related courses
         """
+        document = None
+        # Documents hold the full payload; sparse fieldsets are serialized
+        if not self.get_sparse_fieldset():
+            document = CourseDocumentService.get_document(
+                kwargs[self.lookup_field], translation.get_language()
+            )
+        if document is not None:
+            if document["icon"]:
+                document["icon"] = request.build_absolute_uri(document["icon"])
+            if document.get("icon_srcset"):
+                document["icon_srcset"] = (
+                    ImageRenditions.build_absolute_srcset(
+                        request, document["icon_srcset"]
+                    )
+                )
+            return Response(document)
+
         instance = self.get_object()
 
-        # Prefetch related courses
-        related_courses = (
-            Course.objects.filter(category=instance.category)
-            .exclude(id=instance.id)
-            .select_related("category")[:3]
-        )
+        related_courses = RelatedCourseIndex.related_courses(instance)
 
         # Create context with prefetched related courses
         context = self.get_serializer_context()
@@ -161,11 +267,117 @@ class CourseViewSet(
         Get related courses with optimized queries
         """
         course = self.get_object()
-        related = (
-            Course.objects.filter(category=course.category)
-            .exclude(id=course.id)
-            .select_related("category")[:3]
-        )
+        related = RelatedCourseIndex.related_courses(course)
 
         serializer = CourseListSerializer(related, many=True)
         return Response(serializer.data)
+
+    def get_page_params(self):
+        """
+        Parse the sections of ``?include=`` and their sparse fieldsets,
+        given as ``?fields[<section>]=``. The course itself takes the
+        regular ``fields``, ``omit`` and ``expand`` params.
+        """
+        params = self.request.query_params
+        include = [
+            section
+            for section in params.get("include", "").split(",")
+            if section
+        ]
+        unknown = set(include) - set(self.page_sections)
+        if unknown:
+            raise ValidationError(
+                {
+                    "include": [
+                        f"Unknown sections: {', '.join(sorted(unknown))}"
+                    ]
+                }
+            )
+
+        fields = {}
+        for section in include:
+            value = params.get(f"fields[{section}]")
+            if value:
+                fields[section] = [name for name in value.split(",") if name]
+        return include, fields
+
+    def get_page_queryset(self):
+        """Course queryset prefetching only what the requested page reads"""
+        include, _ = self.page_params
+        course_fields = CoursePageSerializer(
+            **self.get_sparse_fieldset()
+        ).fields
+
+        prefetches = []
+        if "outcomes" in course_fields:
+            prefetches.append("outcomes")
+        if "companies" in course_fields:
+            prefetches.append(
+                Prefetch(
+                    "course_companies",
+                    queryset=CourseCompany.objects.select_related("company"),
+                    to_attr="prefetched_companies",
+                )
+            )
+        if "mentors" in include:
+            prefetches.append(
+                Prefetch(
+                    "course_mentors",
+                    queryset=CourseMentor.objects.select_related("mentor"),
+                    to_attr="prefetched_mentors",
+                )
+            )
+        if "testimonials" in include:
+            prefetches.append(
+                Prefetch(
+                    "testimonials",
+                    queryset=Testimonial.objects.select_related("company"),
+                )
+            )
+        if "related" in include:
+            prefetches.append(
+                Prefetch(
+                    "related_links",
+                    queryset=RelatedCourse.objects.select_related(
+                        "related__category"
+                    ),
+                    to_attr="prefetched_related",
+                )
+            )
+        return Course.objects.select_related("category").prefetch_related(
+            *prefetches
+        )
+
+    @course_page_schema
+    @action(detail=True, methods=["get"])
+    def page(self, request, *args, **kwargs):
+        """
+        Course page in a single round trip: the course and any of its
+        mentors, testimonials and related courses, with sparse fieldsets
+        """
+        self.page_params = include, fields = self.get_page_params()
+        course = self.get_object()
+
+        data = {"course": self.get_serializer(course).data}
+        if "mentors" in include:
+            data["mentors"] = MentorSerializer(
+                [
+                    course_mentor.mentor
+                    for course_mentor in course.prefetched_mentors
+                ],
+                many=True,
+                fields=fields.get("mentors"),
+            ).data
+        if "testimonials" in include:
+            data["testimonials"] = TestimonialSerializer(
+                course.testimonials.all(),
+                many=True,
+                fields=fields.get("testimonials"),
+            ).data
+        if "related" in include:
+            data["related"] = CourseListSerializer(
+                [link.related for link in course.prefetched_related],
+                many=True,
+                fields=fields.get("related"),
+            ).data
+        return Response(data)
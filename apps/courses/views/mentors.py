@@ -1,3 +1,4 @@
+from common.mixins import ConditionalGetMixin, SparseFieldsetMixin
 from common.pagination import MentorPagination
 from common.utils.custom_response_decorator import custom_response
 from courses.models import Mentor
@@ -8,7 +9,12 @@ from rest_framework.views import APIView
 
 
 @custom_response
-class MentorViewSet(viewsets.ReadOnlyModelViewSet, APIView):
+class MentorViewSet(
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    viewsets.ReadOnlyModelViewSet,
+    APIView,
+):
     """API endpoint for mentors"""
 
     queryset = Mentor.objects.all()
@@ -1,12 +1,18 @@
-from common.utils.bitrix24 import Bitrix24Integration
+from common.exceptions import ServiceUnavailable
+from common.mixins import IdempotencyMixin, UploadLimitsMixin
+from common.models import OutboxMessage
 from common.utils.custom_response_decorator import custom_response
 from common.utils.otp import OTPService
+from common.utils.outbox import Outbox
 from common.utils.sms import SMSService
+from common.utils.uploads import IMAGE_UPLOAD
 from courses.models import ContactRequest
 from courses.openapi_schema import (
     contact_request_schema_decorator,
     course_registration_schema,
+    registration_status_schema,
 )
+from courses.outbox import REGISTRATION_SYNC_TOPIC
 from courses.serializers import (
     ContactRequestSerializer,
     CourseRegistrationSerializer,
@@ -15,42 +21,74 @@ from courses.serializers.registrations import (
     OTPVerificationSerializer,
     PhoneNumberSerializer,
 )
+from django.db import transaction
 from rest_framework import generics, status
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, Throttled, ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
 
+def get_sync_status(request, guid, message):
+    """Bitrix24 sync state of a registration, as returned by the API"""
+    return {
+        "guid": str(guid),
+        "status": message.status,
+        "attempts": message.attempts,
+        "contact_id": message.result.get("contact_id"),
+        "deal_id": message.result.get("deal_id"),
+        "status_url": reverse(
+            "course-registration-status",
+            kwargs={"guid": guid},
+            request=request,
+        ),
+    }
+
+
+def get_sms_status(request, sms):
+    """Delivery state of a queued SMS, as returned by the API"""
+    status = sms.status
+    if status == OutboxMessage.DONE:
+        status = sms.result.get("status", status)
+    return {
+        "guid": str(sms.guid),
+        "status": status,
+        "sent_at": sms.result.get("sent_at"),
+        "status_url": reverse(
+            "sms-status", kwargs={"guid": sms.guid}, request=request
+        ),
+    }
+
+
 @custom_response
-class CourseRegistrationBitrixView(APIView):
+class CourseRegistrationBitrixView(
+    UploadLimitsMixin, IdempotencyMixin, APIView
+):
     """API endpoint for course registrations with Bitrix24 integration"""
 
     permission_classes = [AllowAny]
+    upload_rules = {"passport_image": IMAGE_UPLOAD}
 
     @course_registration_schema
     def post(self, request, *args, **kwargs):
         serializer = CourseRegistrationSerializer(data=request.data)
 
         if serializer.is_valid():
-            registration = serializer.save()
-
-            bitrix_result = Bitrix24Integration.process_registration(
-                registration
-            )
+            # The registration and its Bitrix24 sync are committed together;
+            # the outbox worker talks to Bitrix24 outside the request
+            with transaction.atomic():
+                registration = serializer.save()
+                message = Outbox.enqueue(
+                    REGISTRATION_SYNC_TOPIC,
+                    {"registration_id": registration.pk},
+                    reference=str(registration.guid),
+                )
 
             response_data = {
                 "registration": serializer.data,
-                "bitrix": bitrix_result["data"],
+                "bitrix": get_sync_status(request, registration.guid, message),
             }
-
-            if not bitrix_result["success"]:
-                return Response(
-                    {"errors": bitrix_result["errors"]},
-                    status=status.HTTP_207_MULTI_STATUS,
-                    exception=True,
-                )
-
             return Response(response_data, status=status.HTTP_201_CREATED)
 
         errors = []
@@ -65,6 +103,21 @@ class CourseRegistrationBitrixView(APIView):
         )
 
 
+@custom_response
+class CourseRegistrationStatusView(APIView):
+    """API endpoint for the Bitrix24 sync status of a registration"""
+
+    permission_classes = [AllowAny]
+
+    @registration_status_schema
+    def get(self, request, *args, **kwargs):
+        guid = self.kwargs["guid"]
+        message = Outbox.get_status(REGISTRATION_SYNC_TOPIC, str(guid))
+        if message is None:
+            raise NotFound("Registration not found")
+        return Response(get_sync_status(request, guid, message))
+
+
 @custom_response
 class RequestOTPView(APIView):
     """API endpoint for requesting an OTP code"""
@@ -73,22 +126,42 @@ class RequestOTPView(APIView):
         serializer = PhoneNumberSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        phone_number = serializer.validated_data["phone"]
-        otp_code = OTPService.generate_otp(phone_number)
+        # Fail fast while the SMS gateway is down
+        if not SMSService.is_available():
+            raise ServiceUnavailable()
 
-        message = f"Your verification code is {otp_code}. Valid for 4 minutes."
-        sms_sent = SMSService.send_sms(phone_number, message)
+        phone_number = serializer.validated_data["phone"]
+        otp = OTPService.issue_otp(phone_number)
+        if otp.code is None:
+            raise Throttled(otp.retry_after)
 
-        if not sms_sent:
-            raise ValidationError(
-                {"errors": [{"field": "sms", "message": "Failed to send SMS"}]}
-            )
+        # The code is sent by the outbox worker
+        sms = SMSService.enqueue_otp(
+            phone_number, expires_in=OTPService.OTP_CACHE_TIMEOUT
+        )
 
         return Response(
-            {"message": "OTP code sent successfully", "phone": phone_number}
+            {
+                "message": "OTP code sent successfully",
+                "phone": phone_number,
+                "sms": get_sms_status(request, sms),
+            }
         )
 
 
+@custom_response
+class SMSStatusView(APIView):
+    """API endpoint for the delivery status of an OTP SMS"""
+
+    def get(self, request, *args, **kwargs):
+        sms = OutboxMessage.objects.filter(
+            topic=SMSService.TOPIC, guid=self.kwargs["guid"]
+        ).first()
+        if sms is None:
+            raise NotFound("SMS not found")
+        return Response(get_sms_status(request, sms))
+
+
 @custom_response
 class VerifyOTPView(APIView):
     """API endpoint for verifying an OTP code"""
@@ -100,15 +173,19 @@ class VerifyOTPView(APIView):
         phone_number = serializer.validated_data["phone"]
         otp_code = serializer.validated_data["otp_code"]
 
-        is_valid = OTPService.verify_otp(phone_number, otp_code)
+        verification = OTPService.verify_otp(phone_number, otp_code)
+
+        if verification.locked_for:
+            raise Throttled(verification.locked_for)
 
-        if not is_valid:
+        if not verification.valid:
             raise ValidationError(
                 {
                     "errors": [
                         {
                             "field": "otp_code",
                             "message": "Invalid or expired OTP code",
+                            "attempts_left": verification.attempts_left,
                         }
                     ]
                 }
@@ -124,7 +201,9 @@ class VerifyOTPView(APIView):
 
 
 @custom_response
-class ContactRequestCreateView(generics.CreateAPIView, APIView):
+class ContactRequestCreateView(
+    IdempotencyMixin, generics.CreateAPIView, APIView
+):
     """API endpoint for contact requests"""
 
     queryset = ContactRequest.objects.all()
@@ -1,20 +1,37 @@
+from common.mixins import (
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+)
 from common.pagination import TestimonialsPagination
 from common.utils.custom_response_decorator import custom_response
-from courses.models import Testimonial
+from courses.models import Company, Course, Testimonial
 from courses.openapi_schema import (
     testimonial_list_schema,
     testimonial_retrieve_schema,
 )
-from courses.serializers import TestimonialSerializer
+from courses.serializers import (
+    TestimonialSerializer,
+    TestimonialValuesSerializer,
+)
 from rest_framework import viewsets
 from rest_framework.views import APIView
 
 
 @custom_response
-class TestimonialViewSet(viewsets.ReadOnlyModelViewSet, APIView):
+class TestimonialViewSet(
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+    viewsets.ReadOnlyModelViewSet,
+    APIView,
+):
     """API endpoint for testimonials"""
 
+    conditional_models = (Testimonial, Company, Course)
+
     serializer_class = TestimonialSerializer
+    values_serializer_class = TestimonialValuesSerializer
     pagination_class = TestimonialsPagination
 
     def get_queryset(self):
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "common",
+            "0003_setting_latitude_setting_location_description_and_more",
+        ),
+        ("news", "0003_news_badge"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="news",
+            index=models.Index(
+                fields=["-created_time", "-id"], name="news_created_id_idx"
+            ),
+        ),
+    ]
@@ -39,6 +39,13 @@ class News(BaseModel):
     class Meta:
         verbose_name = "Новость"
         verbose_name_plural = "Новости"
+        indexes = [
+            # Keyset pagination seeks by (created_time, id)
+            models.Index(
+                fields=["-created_time", "-id"],
+                name="news_created_id_idx",
+            )
+        ]
 
     def __str__(self):
         return self.title
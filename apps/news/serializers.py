@@ -1,21 +1,29 @@
-from common.serializers import BadgeSerializer
+from common.serializers import (
+    BadgeSerializer,
+    DynamicFieldsMixin,
+    RenditionField,
+    RenditionListSerializer,
+)
+from common.values_serializers import ValuesSerializer
 from rest_framework import serializers
 
 from .models import News, NewsCategory
 
 
-class NewsCategorySerializer(serializers.ModelSerializer):
+class NewsCategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = NewsCategory
         fields = ("id", "name")
 
 
-class NewsListSerializer(serializers.ModelSerializer):
+class NewsListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category = NewsCategorySerializer()
+    image_srcset = RenditionField(source="image")
     badge = BadgeSerializer()
 
     class Meta:
         model = News
+        list_serializer_class = RenditionListSerializer
         fields = (
             "id",
             "title",
@@ -23,20 +31,28 @@ class NewsListSerializer(serializers.ModelSerializer):
             "category",
             "badge",
             "image",
+            "image_srcset",
             "created_time",
         )
 
 
-class NewsDetailSerializer(serializers.ModelSerializer):
+class NewsListValuesSerializer(ValuesSerializer):
+    serializer_class = NewsListSerializer
+
+
+class NewsDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     category = NewsCategorySerializer()
+    image_srcset = RenditionField(source="image")
 
     class Meta:
         model = News
+        list_serializer_class = RenditionListSerializer
         fields = (
             "id",
             "title",
             "content",
             "category",
             "image",
+            "image_srcset",
             "created_time",
         )
@@ -1,3 +1,9 @@
+from common.mixins import (
+    ConditionalGetMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+)
+from common.models import Badge
 from common.pagination import NewsPagination
 from common.utils.custom_response_decorator import custom_response
 from django_filters.rest_framework import DjangoFilterBackend
@@ -8,25 +14,35 @@ from .serializers import (
     NewsCategorySerializer,
     NewsDetailSerializer,
     NewsListSerializer,
+    NewsListValuesSerializer,
 )
 
 
 @custom_response
-class NewsListView(ListAPIView):
+class NewsListView(
+    ConditionalGetMixin, SparseFieldsetMixin, ValuesListMixin, ListAPIView
+):
     queryset = News.objects.all().select_related("category")
+    conditional_models = (News, NewsCategory, Badge)
     serializer_class = NewsListSerializer
+    values_serializer_class = NewsListValuesSerializer
     pagination_class = NewsPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["category"]
 
 
 @custom_response
-class NewsDetailView(RetrieveAPIView):
+class NewsDetailView(
+    ConditionalGetMixin, SparseFieldsetMixin, RetrieveAPIView
+):
     queryset = News.objects.all().select_related("category")
+    conditional_models = (News, NewsCategory)
     serializer_class = NewsDetailSerializer
     lookup_field = "slug"
 
 
-class NewsCategoryListView(ListAPIView):
+class NewsCategoryListView(
+    ConditionalGetMixin, SparseFieldsetMixin, ListAPIView
+):
     queryset = NewsCategory.objects.all()
     serializer_class = NewsCategorySerializer
@@ -101,6 +101,9 @@ CACHES = {
         },
     }
 }
+COURSE_CACHE_TIMEOUT = int(
+    os.environ.get("COURSE_CACHE_TIMEOUT", 60 * 60 * 24)
+)
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -153,6 +156,26 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static")
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Shared blobs of uploaded media (see common.utils.storage)
+# Seconds a blob handed to an upload is kept whatever its references,
+# covering the transaction saving the row
+BLOB_LEASE_TIMEOUT = int(os.environ.get("BLOB_LEASE_TIMEOUT", 10 * 60))
+BLOB_DELETE_LOCK_TIMEOUT = int(os.environ.get("BLOB_DELETE_LOCK_TIMEOUT", 30))
+
+# Passport scans and CVs (see common.utils.storage and common.views)
+PRIVATE_MEDIA_ROOT = os.environ.get(
+    "PRIVATE_MEDIA_ROOT", os.path.join(BASE_DIR, "private_media")
+)
+PROTECTED_MEDIA_URL = "/protected-media/"
+PROTECTED_MEDIA_URL_TTL = int(os.environ.get("PROTECTED_MEDIA_URL_TTL", 900))
+# "x-accel-redirect" behind nginx, "x-sendfile" behind Apache or lighttpd;
+# empty to send files from the WSGI server itself
+PROTECTED_MEDIA_SERVER = os.environ.get("PROTECTED_MEDIA_SERVER", "")
+# Internal nginx location aliasing PRIVATE_MEDIA_ROOT
+PROTECTED_MEDIA_INTERNAL_URL = os.environ.get(
+    "PROTECTED_MEDIA_INTERNAL_URL", "/_private_media/"
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
@@ -169,8 +192,66 @@ REST_FRAMEWORK = {
 
 CONTACT_API_URL = os.environ.get("CONTACT_API_URL")
 DEAL_API_URL = os.environ.get("DEAL_API_URL")
+# Bitrix24 batch method; registrations share batch calls when set
+BATCH_API_URL = os.environ.get("BATCH_API_URL")
+BITRIX_CONTACT_CACHE_TIMEOUT = int(
+    os.environ.get("BITRIX_CONTACT_CACHE_TIMEOUT", 60 * 60 * 24)
+)
 
 SMS_API_URL = os.environ.get("SMS_API_URL")
 SMS_LOGIN = os.environ.get("SMS_LOGIN")
 SMS_PASSWORD = os.environ.get("SMS_PASSWORD")
 SMS_SENDER_ID = os.environ.get("SMS_SENDER_ID")
+# Messages sent per second, by all outbox workers together
+SMS_RATE_LIMIT = int(os.environ.get("SMS_RATE_LIMIT", 5))
+
+# Multipart uploads of public forms (see common.utils.uploads)
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", 64 * 2**10))
+UPLOAD_MAX_CV_SIZE = int(os.environ.get("UPLOAD_MAX_CV_SIZE", 10 * 2**20))
+UPLOAD_MAX_IMAGE_SIZE = int(
+    os.environ.get("UPLOAD_MAX_IMAGE_SIZE", 10 * 2**20)
+)
+
+# Resized variants of uploaded images (see common.utils.renditions)
+IMAGE_RENDITION_FORMATS = os.environ.get(
+    "IMAGE_RENDITION_FORMATS", "avif,webp"
+).split(",")
+IMAGE_RENDITION_QUALITY = int(os.environ.get("IMAGE_RENDITION_QUALITY", 75))
+
+# Normalization of uploaded scans (see common.utils.scans)
+SCAN_MAX_SIDE = int(os.environ.get("SCAN_MAX_SIDE", 2000))
+SCAN_FORMAT = os.environ.get("SCAN_FORMAT", "jpeg")
+SCAN_QUALITY = int(os.environ.get("SCAN_QUALITY", 85))
+SCAN_WORKERS = int(os.environ.get("SCAN_WORKERS", 2))
+
+# Idempotency-Key support of POST endpoints (see common.mixins)
+IDEMPOTENCY_KEY_TTL = int(os.environ.get("IDEMPOTENCY_KEY_TTL", 60 * 60 * 24))
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.environ.get("IDEMPOTENCY_LOCK_TIMEOUT", 60))
+
+# OTP codes (see common.utils.otp)
+OTP_RESEND_INTERVAL = int(os.environ.get("OTP_RESEND_INTERVAL", 60))
+OTP_MAX_ATTEMPTS = int(os.environ.get("OTP_MAX_ATTEMPTS", 5))
+OTP_LOCKOUT = int(os.environ.get("OTP_LOCKOUT", 15 * 60))
+
+# Outbound HTTP client (see common.utils.http)
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", 3.05))
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", 10))
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", 2))
+HTTP_RETRY_BACKOFF = float(os.environ.get("HTTP_RETRY_BACKOFF", 0.5))
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 10))
+
+# Circuit breakers of outbound integrations (see common.utils.circuit_breaker)
+CIRCUIT_WINDOW = int(os.environ.get("CIRCUIT_WINDOW", 60))
+CIRCUIT_MIN_CALLS = int(os.environ.get("CIRCUIT_MIN_CALLS", 10))
+CIRCUIT_FAILURE_RATE = float(os.environ.get("CIRCUIT_FAILURE_RATE", 0.5))
+CIRCUIT_SLOW_CALL = float(os.environ.get("CIRCUIT_SLOW_CALL", 5))
+CIRCUIT_SLOW_CALL_RATE = float(os.environ.get("CIRCUIT_SLOW_CALL_RATE", 0.5))
+CIRCUIT_OPEN_SECONDS = int(os.environ.get("CIRCUIT_OPEN_SECONDS", 30))
+
+# Transactional outbox (see common.utils.outbox)
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", 10))
+OUTBOX_RETRY_DELAY = int(os.environ.get("OUTBOX_RETRY_DELAY", 30))
+OUTBOX_RETRY_MAX_DELAY = int(os.environ.get("OUTBOX_RETRY_MAX_DELAY", 3600))
+OUTBOX_LEASE = int(os.environ.get("OUTBOX_LEASE", 300))
+# Days delivered messages are kept; 0 keeps them forever
+OUTBOX_RETENTION_DAYS = int(os.environ.get("OUTBOX_RETENTION_DAYS", 7))
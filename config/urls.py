@@ -1,3 +1,4 @@
+from common.views import ProtectedMediaView
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path, re_path
@@ -42,6 +43,11 @@ urlpatterns = [
 ]
 
 urlpatterns += [
+    path(
+        "protected-media/<path:name>",
+        ProtectedMediaView.as_view(),
+        name="protected-media",
+    ),
     path("api/", include("courses.urls")),
     path("api/common/", include("common.urls")),
     path("api/news/", include("news.urls")),